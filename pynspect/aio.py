@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for filtering streams of data structures within
+`asyncio <https://docs.python.org/3/library/asyncio.html>`__ applications. It
+requires Python 3.7 or newer; on older interpreters (including Python 2)
+the module can not even be imported because of the asynchronous generator
+syntax.
+
+There are following main tools in this package:
+
+* :py:func:`afilter`
+
+  Asynchronous generator consuming asynchronous iterator of data structures and
+  yielding those matching given filtering rule. Data structures are evaluated
+  in batches, optionally in an executor, so that the event loop is not stalled.
+
+Following example demonstrates afilter usage::
+
+    >>> async for msg in afilter('Category in ["Recon.Scanning"]', source):
+    ...     await handle(msg)
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import asyncio
+
+from pynspect.rules import Rule
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+
+
+#: Internal marker of exhausted source in the queue.
+_DONE = object()
+
+
+class _Failure(object):
+    """
+    Internal wrapper of exception raised by the source, that is passed through
+    the queue to the consumer.
+    """
+    def __init__(self, exception):
+        self.exception = exception
+
+
+async def _pump(source, queue):
+    """
+    Move all data structures from given source into given bounded queue, waiting
+    whenever the queue is full.
+    """
+    try:
+        if hasattr(source, '__aiter__'):
+            async for data in source:
+                await queue.put(data)
+        else:
+            for data in source:
+                await queue.put(data)
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # pylint: disable=locally-disabled,broad-except
+        await queue.put(_Failure(exc))
+    else:
+        await queue.put(_DONE)
+
+def _evaluate_batch(evaluate, batch):
+    """
+    Evaluate given compiled rule against all data structures in given batch.
+    """
+    return [evaluate(data) for data in batch]
+
+
+async def afilter(rule, source, flt = None, batch_size = 100, queue_size = None, offload = False, executor = None):
+    """
+    Asynchronously filter data structures from given source and yield those
+    matching given rule.
+
+    The source is read by separate task into bounded queue, so it is never
+    consumed faster than the matching data structures are consumed from this
+    generator. Each batch consists of the data structures already waiting in
+    the queue (up to ``batch_size``), so there is no additional latency when
+    the stream is slow and the per-batch overhead is amortized under bursty load.
+
+    The rule is prepared by :py:func:`pynspect.filters.DataObjectFilter.prepare`
+    and compiled only once by :py:func:`pynspect.filters.DataObjectFilter.compile_rule`
+    of given filter, so the results agree with the results of its ``filter``. Batches
+    are evaluated inline with the event loop getting control after each batch,
+    or with ``offload`` flag in given executor (default executor of the event loop
+    when not given), which should be used for slow or blocking evaluation.
+
+    :param rule: Filtering rule string or rule tree.
+    :param source: Asynchronous (or ordinary) iterable of data structures.
+    :param pynspect.filters.DataObjectFilter flt: Filter providing rule preparation and filtering functions.
+    :param int batch_size: Maximal number of data structures evaluated at once.
+    :param int queue_size: Maximal number of data structures read ahead, defaults to twice the ``batch_size``.
+    :param bool offload: Evaluate batches in executor instead of the event loop.
+    :param concurrent.futures.Executor executor: Executor for offloaded evaluation.
+    :return: Asynchronous generator of matching data structures.
+    """
+    if flt is None:
+        flt = DataObjectFilter(None if isinstance(rule, Rule) else PynspectFilterParser)
+    if not isinstance(rule, Rule):
+        rule = flt.prepare(rule)
+    evaluate = flt.compile_rule(rule, snapshot = False)
+
+    loop  = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize = queue_size or 2 * batch_size)
+    pump  = loop.create_task(_pump(source, queue))
+    try:
+        failure = None
+        while failure is None:
+            batch = []
+            item  = await queue.get()
+            while True:
+                if item is _DONE or isinstance(item, _Failure):
+                    failure = item
+                    break
+                batch.append(item)
+                if len(batch) >= batch_size or queue.empty():
+                    break
+                item = queue.get_nowait()
+
+            if batch:
+                if offload:
+                    results = await loop.run_in_executor(executor, _evaluate_batch, evaluate, batch)
+                else:
+                    results = _evaluate_batch(evaluate, batch)
+                    await asyncio.sleep(0)
+                for data, result in zip(batch, results):
+                    if result:
+                        yield data
+
+        if isinstance(failure, _Failure):
+            raise failure.exception
+    finally:
+        pump.cancel()
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    async def demo():
+        """
+        Filter simple stream of data structures.
+        """
+        source = [{"Test": idx, "Attr": "ABC"} for idx in range(20)]
+        return [data async for data in afilter('Test > 10 and Test % 2 == 0', source, batch_size = 5)]
+
+    pprint.pprint(asyncio.new_event_loop().run_until_complete(demo()))
@@ -0,0 +1,725 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for columnar evaluation of filtering rules against
+large batches of data structures, like archived `IDEA <https://idea.cesnet.cz/en/index>`__
+messages. It requires the optional `NumPy <http://www.numpy.org/>`__ library,
+which can be installed together with the package as ``pynspect[columnar]`` extra.
+
+There are following main tools in this package:
+
+* :py:class:`ColumnarFilter`
+
+  Tool capable of filtering whole batches of data structures at once. Values of
+  each referenced JPath are extracted across the batch into single array and rule
+  tree nodes are evaluated as vectorized array operations, resulting in boolean
+  mask of matching data structures.
+
+Following example demonstrates ColumnarFilter usage in conjuction with PynspectFilterParser::
+
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> cflt = ColumnarFilter()
+    >>> mask = cflt.filter(psr.parse('ConnCount > 10 and Category in ["Recon.Scanning"]'), messages)
+    >>> matching = cflt.filter_many(psr.parse('ConnCount > 10'), messages, matches = True)
+"""
+
+
+from __future__ import print_function
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import operator
+import datetime
+import itertools
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from pynspect.rules import FilteringRuleException, LogicalBinOpRule, UnaryOperationRule
+from pynspect.traversers import ListIP, BaseFilteringTreeTraverser
+from pynspect.jpath import jpath_values, jpath_parse_c
+from pynspect.compilers import FilterOptimizer, compile_operand
+from pynspect.filters import DataObjectFilter
+
+
+try:
+    _INTEGER_TYPES = (int, long)  # pylint: disable=locally-disabled,undefined-variable
+except NameError:
+    _INTEGER_TYPES = (int,)
+
+#: Types of values, that are certainly not expanded by JPath evaluation.
+_SIMPLE_TYPES = set(_INTEGER_TYPES + (str, float, bool, dict, type(None), datetime.datetime, datetime.timedelta))
+
+#: Internal limit for integers stored in numeric arrays, all of them must be exactly representable as floats.
+_INTEGER_LIMIT = 2 ** 53
+
+#: Reference points for conversion of datetime and timedelta values into integer arrays.
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds = 1)
+
+#: Kind of column with single constant value for the whole batch.
+_CONSTANT = 'constant'
+#: Kind of column with values of JPath variable, that have at most one item for each data structure.
+_LIST = 'list'
+#: Kind of column with single scalar value (or None) for each data structure.
+_SCALAR = 'scalar'
+#: Kind of column with boolean value (or None) for each data structure.
+_BOOL = 'bool'
+#: Kind of column with arbitrary Python value for each data structure.
+_OBJECT = 'object'
+
+#: Vectorized comparison operations.
+_VECTOR_COMPARISONS = {
+    'OP_EQ': operator.eq,
+    'OP_NE': operator.ne,
+    'OP_GT': operator.gt,
+    'OP_GE': operator.ge,
+    'OP_LT': operator.lt,
+    'OP_LE': operator.le,
+}
+
+#: Comparison operations with swapped operands.
+_SWAPPED_COMPARISONS = {
+    'OP_EQ': 'OP_EQ',
+    'OP_NE': 'OP_NE',
+    'OP_GT': 'OP_LT',
+    'OP_GE': 'OP_LE',
+    'OP_LT': 'OP_GT',
+    'OP_LE': 'OP_GE',
+}
+
+#: Vectorized math operations.
+_VECTOR_MATH = {
+    'OP_PLUS':   operator.add,
+    'OP_MINUS':  operator.sub,
+    'OP_TIMES':  operator.mul,
+    'OP_DIVIDE': operator.truediv,
+    'OP_MODULO': operator.mod,
+}
+
+#: Combinations of array kinds, for which the math operations give the same results as in Python.
+_VECTOR_MATH_KINDS = {
+    ('i', 'i'): ('OP_PLUS', 'OP_MINUS', 'OP_TIMES', 'OP_DIVIDE', 'OP_MODULO'),
+    ('i', 'f'): ('OP_PLUS', 'OP_MINUS', 'OP_TIMES', 'OP_DIVIDE', 'OP_MODULO'),
+    ('f', 'i'): ('OP_PLUS', 'OP_MINUS', 'OP_TIMES', 'OP_DIVIDE', 'OP_MODULO'),
+    ('f', 'f'): ('OP_PLUS', 'OP_MINUS', 'OP_TIMES', 'OP_DIVIDE', 'OP_MODULO'),
+    ('M', 'm'): ('OP_PLUS', 'OP_MINUS'),
+    ('m', 'M'): ('OP_PLUS',),
+    ('M', 'M'): ('OP_MINUS',),
+    ('m', 'm'): ('OP_PLUS', 'OP_MINUS'),
+}
+
+
+#-------------------------------------------------------------------------------
+
+
+class _NotVectorizable(Exception):
+    """
+    Internal exception signalling, that the operation must be evaluated separately
+    for each data structure.
+    """
+    pass
+
+
+class _Column(object):
+    """
+    Internal representation of values of single rule tree node across the whole
+    batch. Depending on the ``kind`` the ``data`` is either single Python value,
+    array of values accompanied with ``valid`` mask of present values, or list
+    of arbitrary Python values. Columns of JPath values with multiple values for
+    some data structures additionally keep the flattened values of all data
+    structures as single column in ``flat`` together with array of indices of
+    their data structures in ``rows``.
+    """
+    def __init__(self, kind, data, valid = None, flat = None, rows = None):
+        self.kind  = kind
+        self.data  = data
+        self.valid = valid
+        self.flat  = flat
+        self.rows  = rows
+
+    @property
+    def vectorized(self):
+        """
+        Check, whether the column holds at most one value for each data structure in array.
+        """
+        return self.kind in (_LIST, _SCALAR, _BOOL)
+
+    def objects(self, size):
+        """
+        Return list of Python values of the column, as they would be seen during
+        evaluation of each data structure separately.
+        """
+        if self.kind == _CONSTANT:
+            return [self.data] * size
+        if self.kind == _LIST:
+            return [[value] if valid else [] for value, valid in zip(self.data.tolist(), self.valid.tolist())]
+        if self.kind == _OBJECT:
+            return self.data
+        return [value if valid else None for value, valid in zip(self.data.tolist(), self.valid.tolist())]
+
+    def truth(self, size):
+        """
+        Return boolean array of truth values of the column.
+        """
+        if self.kind == _CONSTANT:
+            return numpy.full(size, bool(self.data), dtype = bool)
+        if self.kind == _LIST:
+            return self.valid
+        if self.kind == _BOOL:
+            return self.valid & self.data
+        if self.kind == _SCALAR:
+            if self.data.dtype.kind in 'ifm':
+                return self.valid & (self.data != self.data.dtype.type(0))
+            if self.data.dtype.kind != 'O':
+                return self.valid
+        return numpy.fromiter((bool(value) for value in self.objects(size)), dtype = bool, count = size)
+
+
+def _bool_column(data, valid):
+    """
+    Create column of boolean values with given mask of valid values.
+    """
+    return _Column(_BOOL, data & valid, valid)
+
+def _object_column(values):
+    """
+    Create column from given list of Python values. Lists consisting only of
+    booleans and None values are turned into boolean columns.
+    """
+    if all(value is None or value is True or value is False for value in values):
+        valid = numpy.fromiter((value is not None for value in values), dtype = bool, count = len(values))
+        data  = numpy.fromiter((value is True for value in values), dtype = bool, count = len(values))
+        return _Column(_BOOL, data, valid)
+    return _Column(_OBJECT, values)
+
+def _typed_column(items, valid):
+    """
+    Create column of JPath values from given list of single values (or None for
+    missing values) and mask of present values. Values of the same simple type
+    are stored in typed array.
+    """
+    present = [item for item, ok in zip(items, valid.tolist()) if ok]
+    if any(item is None for item in present):
+        return None
+
+    types = set(type(item) for item in present)
+    if types and all(itype in _INTEGER_TYPES for itype in types) and all(-_INTEGER_LIMIT < item < _INTEGER_LIMIT for item in present):
+        dtype, fill = numpy.int64, 0
+    elif types == set([float]):
+        dtype, fill = numpy.float64, 0.0
+    elif types == set([datetime.datetime]) and all(item.tzinfo is None for item in present):
+        data = numpy.fromiter(((item - _EPOCH) // _MICROSECOND if ok else 0 for item, ok in zip(items, valid.tolist())), dtype = numpy.int64, count = len(items))
+        return _Column(_LIST, data.view('datetime64[us]'), valid)
+    elif types == set([datetime.timedelta]):
+        data = numpy.fromiter((item // _MICROSECOND if ok else 0 for item, ok in zip(items, valid.tolist())), dtype = numpy.int64, count = len(items))
+        return _Column(_LIST, data.view('timedelta64[us]'), valid)
+    else:
+        dtype, fill = object, None
+    data = numpy.array([item if ok else fill for item, ok in zip(items, valid.tolist())], dtype = dtype)
+    return _Column(_LIST, data, valid)
+
+def _variable_column(lists):
+    """
+    Create column from given lists of JPath values. When each data structure
+    contains at most one value, the values are stored in typed array. Otherwise
+    all values are additionally flattened into single typed column.
+    """
+    size    = len(lists)
+    lengths = numpy.fromiter((len(values) for values in lists), dtype = numpy.int64, count = size)
+    if numpy.all(lengths <= 1):
+        column = _typed_column([values[0] if values else None for values in lists], lengths == 1)
+        if column is not None:
+            return column
+        return _Column(_OBJECT, lists)
+
+    items = [item for values in lists for item in values]
+    flat  = _typed_column(items, numpy.ones(len(items), dtype = bool))
+    rows  = numpy.repeat(numpy.arange(size), lengths)
+    return _Column(_OBJECT, lists, lengths > 0, flat, rows)
+
+def _jpath_lists(batch, jpath):
+    """
+    Return lists of all values at given JPath within all data structures in given
+    batch. Simple JPaths within dictionaries are evaluated directly, everything
+    else is handed over to :py:func:`pynspect.jpath.jpath_values`.
+    """
+    chunks = jpath_parse_c(jpath)
+    if len(chunks) != 1 or 'i' in chunks[0]:
+        return [jpath_values(obj, jpath) for obj in batch]
+    key    = chunks[0]['n']
+    result = []
+    for obj in batch:
+        if obj.__class__ is dict:
+            if not key in obj:
+                result.append([])
+                continue
+            value = obj[key]
+            if value.__class__ is list:
+                result.append(list(value))
+                continue
+            if value.__class__ in _SIMPLE_TYPES:
+                result.append([value])
+                continue
+        result.append(jpath_values(obj, jpath))
+    return result
+
+def _vector_value(value):
+    """
+    Convert given constant into value suitable for vectorized operations with
+    typed arrays and return it together with its array kind.
+    """
+    if type(value) in _INTEGER_TYPES and -_INTEGER_LIMIT < value < _INTEGER_LIMIT:
+        return value, 'i'
+    if type(value) is float:
+        return value, 'f'
+    if isinstance(value, datetime.datetime) and value.tzinfo is None:
+        return numpy.datetime64(value, 'us'), 'M'
+    if isinstance(value, datetime.timedelta):
+        return numpy.timedelta64(value, 'us'), 'm'
+    raise _NotVectorizable()
+
+def _vector_operand(column):
+    """
+    Return array or constant of given column suitable for vectorized operations
+    together with its array kind.
+    """
+    if column.kind == _CONSTANT:
+        return _vector_value(column.data)
+    if column.kind in (_LIST, _SCALAR) and column.data.dtype.kind in 'ifMm':
+        return column.data, column.data.dtype.kind
+    raise _NotVectorizable()
+
+def _map_values(func, column):
+    """
+    Apply given function to all valid values of given column and return boolean
+    array of results. Results for repeated hashable values are calculated only once.
+    """
+    cache  = {}
+    result = []
+    for value, valid in zip(column.data.tolist(), column.valid.tolist()):
+        if not valid:
+            result.append(False)
+            continue
+        try:
+            res = cache[value]
+        except KeyError:
+            res = cache[value] = bool(func(value))
+        except TypeError:
+            res = bool(func(value))
+        result.append(res)
+    return numpy.array(result, dtype = bool)
+
+def _truth_nodes(rule, nodes):
+    """
+    Collect identifiers of all logical operation nodes of given rule tree, whose
+    result is used only as a truth value.
+    """
+    if isinstance(rule, LogicalBinOpRule):
+        nodes.add(id(rule))
+        _truth_nodes(rule.left, nodes)
+        _truth_nodes(rule.right, nodes)
+    elif isinstance(rule, UnaryOperationRule) and rule.operation == 'OP_EXISTS':
+        _truth_nodes(rule.right, nodes)
+    return nodes
+
+
+class ColumnarFilter(BaseFilteringTreeTraverser):
+    """
+    Rule tree traverser evaluating filtering rules against whole batches of data
+    structures at once.
+
+    Values of each JPath referenced in the rule are extracted across the batch
+    into single array. Whenever each data structure contains at most one value
+    of simple type (integer, float, naive datetime, timedelta, string), the
+    comparison, math, logical and unary operations are evaluated as vectorized
+    NumPy array operations. All other cases fall back to evaluation of the affected
+    operation separately for each data structure with the same semantics as
+    :py:class:`pynspect.filters.DataObjectFilter`, so the resulting mask is always
+    equal to truth values of :py:func:`pynspect.filters.DataObjectFilter.filter`.
+
+    Unlike :py:class:`pynspect.filters.DataObjectFilter`, all operands of logical
+    operations are always evaluated for the whole batch and filtering functions
+    without arguments are called only once for each batch.
+    """
+
+    def __init__(self, functions = None, chunk_size = 65536):
+        """
+        Initialize the filter with optional dictionary of filtering functions.
+        Functions of :py:class:`pynspect.filters.DataObjectFilter` are used by default.
+
+        :param dict functions: Filtering rule functions, that will be registered with :py:func:`register_function`.
+        :param int chunk_size: Number of data structures evaluated together by :py:func:`ifilter_many`.
+        """
+        if numpy is None:
+            raise ImportError("ColumnarFilter requires NumPy library, install 'pynspect[columnar]'")
+        super(ColumnarFilter, self).__init__()
+
+        if functions is None:
+            functions = DataObjectFilter().functions
+        for name, callback in functions.items():
+            self.register_function(name, callback)
+        self.chunk_size = chunk_size
+
+    def filter(self, rule, messages):
+        """
+        Apply given filtering rule to given batch of data structures.
+
+        :param pynspect.rules.Rule rule: filtering rule to be checked
+        :param list messages: data structures to check against rule, ussually dicts
+        :return: Boolean array with one item for each data structure
+        :rtype: numpy.ndarray
+        """
+        messages = list(messages)
+        rule = FilterOptimizer().compile(rule, boolean = True)
+        column = rule.traverse(
+            self,
+            batch   = messages,
+            size    = len(messages),
+            columns = {},
+            truth   = _truth_nodes(rule, set())
+        )
+        return column.truth(len(messages))
+
+    def filter_many(self, rule, messages, matches = False):
+        """
+        Apply given filtering rule to all data structures in given iterable, which
+        is processed in chunks of ``chunk_size`` data structures.
+
+        :param pynspect.rules.Rule rule: filtering rule to be checked
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: return list of matching messages instead of list of booleans
+        :return: List of booleans (one for each message) or list of matching messages
+        :rtype: list
+        """
+        return list(self.ifilter_many(rule, messages, matches))
+
+    def ifilter_many(self, rule, messages, matches = False):
+        """
+        Generator variant of :py:func:`filter_many` method.
+
+        :param pynspect.rules.Rule rule: filtering rule to be checked
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: yield only matching messages instead of booleans
+        :return: Generator of booleans (one for each message) or of matching messages
+        :rtype: generator
+        """
+        messages = iter(messages)
+        while True:
+            chunk = list(itertools.islice(messages, self.chunk_size))
+            if not chunk:
+                return
+            mask = self.filter(rule, chunk)
+            if matches:
+                for idx in numpy.flatnonzero(mask):
+                    yield chunk[idx]
+            else:
+                for result in mask.tolist():
+                    yield result
+
+    #---------------------------------------------------------------------------
+
+    def _compare_constant(self, operation, column, value):
+        """
+        Evaluate given comparison operation of vectorized column with constant value.
+        """
+        size  = len(column.valid)
+        items = value if isinstance(value, (list, ListIP)) else [value]
+        if value is None or not items:
+            return _bool_column(numpy.zeros(size, dtype = bool), numpy.zeros(size, dtype = bool))
+        if column.kind == _OBJECT:
+            if column.flat is None or operation == 'OP_IS':
+                raise _NotVectorizable()
+            result = self._compare_constant(operation, column.flat, value)
+            data = numpy.zeros(size, dtype = bool)
+            data[column.rows[result.data]] = True
+            return _bool_column(data, column.valid)
+
+        opfn = self.binops_comparison[operation]
+        if operation == 'OP_IS':
+            result = _map_values(lambda val: opfn([val], items), column)
+        elif operation == 'OP_IN':
+            if column.data.dtype.kind in 'if' and all(type(item) in _INTEGER_TYPES + (float,) for item in items):
+                result = numpy.isin(column.data, list(items))
+            else:
+                result = _map_values(lambda val: opfn(val, items), column)
+        elif operation in _VECTOR_COMPARISONS and column.data.dtype.kind != 'O':
+            result = numpy.zeros(size, dtype = bool)
+            for item in items:
+                if item is None:
+                    continue
+                item, kind = _vector_value(item)
+                if (column.data.dtype.kind in 'if') != (kind in 'if') or (kind in 'Mm' and kind != column.data.dtype.kind):
+                    raise _NotVectorizable()
+                result |= _VECTOR_COMPARISONS[operation](column.data, item)
+        else:
+            result = _map_values(lambda val: any(opfn(val, item) for item in items if item is not None), column)
+        return _bool_column(numpy.asarray(result, dtype = bool), column.valid)
+
+    def _compare_columns(self, operation, left, right):
+        """
+        Evaluate given comparison operation of two vectorized columns.
+        """
+        if not operation in _VECTOR_COMPARISONS:
+            raise _NotVectorizable()
+        valid = left.valid & right.valid
+        kinds = (left.data.dtype.kind, right.data.dtype.kind)
+        if 'O' in kinds:
+            opfn = self.binops_comparison[operation]
+            result = numpy.array([
+                bool(opfn(lval, rval)) if ok else False
+                for lval, rval, ok in zip(left.data.tolist(), right.data.tolist(), valid.tolist())
+            ], dtype = bool)
+        elif (kinds[0] in 'if' and kinds[1] in 'if') or kinds[0] == kinds[1]:
+            result = _VECTOR_COMPARISONS[operation](left.data, right.data)
+        else:
+            raise _NotVectorizable()
+        return _bool_column(numpy.asarray(result, dtype = bool), valid)
+
+    def _calculate_math(self, operation, left, right, size):
+        """
+        Evaluate given math operation as vectorized array operation.
+        """
+        ldata, lkind = _vector_operand(left)
+        rdata, rkind = _vector_operand(right)
+        if not operation in _VECTOR_MATH_KINDS.get((lkind, rkind), ()):
+            raise _NotVectorizable()
+
+        valid = numpy.ones(size, dtype = bool)
+        for column in (left, right):
+            if column.kind != _CONSTANT:
+                valid = valid & column.valid
+        if operation in ('OP_DIVIDE', 'OP_MODULO'):
+            valid = valid & (numpy.asarray(rdata) != 0)
+
+        with numpy.errstate(all = 'ignore'):
+            data = numpy.asarray(_VECTOR_MATH[operation](ldata, rdata))
+            if data.dtype.kind == 'i':
+                shadow = _VECTOR_MATH[operation](numpy.asarray(ldata, dtype = float), numpy.asarray(rdata, dtype = float))
+                if numpy.any(numpy.abs(shadow[valid]) >= _INTEGER_LIMIT):
+                    raise _NotVectorizable()
+        data = numpy.broadcast_to(data, (size,))
+        return _Column(_SCALAR, data, valid)
+
+    @staticmethod
+    def _as_bool(column, size, truth):
+        """
+        Return given column as boolean column. Columns used only as a truth value
+        are replaced with their truth values.
+        """
+        if column.kind == _BOOL:
+            return column
+        if column.kind == _CONSTANT and isinstance(column.data, bool):
+            return _Column(_BOOL, numpy.full(size, column.data, dtype = bool), numpy.ones(size, dtype = bool))
+        if truth:
+            return _Column(_BOOL, column.truth(size), numpy.ones(size, dtype = bool))
+        return None
+
+    #---------------------------------------------------------------------------
+
+    def ipv4(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def ipv6(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def datetime(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def timedelta(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def integer(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def float(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def constant(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
+        """
+        return _Column(_CONSTANT, rule.value)
+
+    def variable(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
+        """
+        columns = kwargs['columns']
+        if not rule.value in columns:
+            columns[rule.value] = _variable_column(_jpath_lists(kwargs['batch'], rule.value))
+        return columns[rule.value]
+
+    def list(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
+        """
+        return _Column(_CONSTANT, rule.values())
+
+    def binary_operation_logical(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
+        """
+        if not rule.operation in self.binops_logical:
+            raise ValueError("Invalid logical binary operation '{}'".format(rule.operation))
+        size  = kwargs['size']
+        truth = id(rule) in kwargs['truth']
+        if left.kind == _CONSTANT and right.kind == _CONSTANT:
+            return _Column(_CONSTANT, self.evaluate_binop_logical(rule.operation, left.data, right.data))
+
+        bleft  = self._as_bool(left, size, truth)
+        bright = self._as_bool(right, size, truth)
+        if bleft is None or bright is None:
+            return _object_column([
+                self.evaluate_binop_logical(rule.operation, lval, rval)
+                for lval, rval in zip(left.objects(size), right.objects(size))
+            ])
+
+        ltruth = bleft.valid & bleft.data
+        if rule.operation in ('OP_AND', 'OP_AND_P'):
+            return _Column(_BOOL, numpy.where(ltruth, bright.data, bleft.data), numpy.where(ltruth, bright.valid, bleft.valid))
+        if rule.operation in ('OP_OR', 'OP_OR_P'):
+            return _Column(_BOOL, numpy.where(ltruth, bleft.data, bright.data), numpy.where(ltruth, bleft.valid, bright.valid))
+        rtruth = bright.valid & bright.data
+        return _Column(_BOOL, numpy.where(ltruth, ~rtruth, bright.data), ltruth | bright.valid)
+
+    def binary_operation_comparison(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
+        """
+        if not rule.operation in self.binops_comparison:
+            raise ValueError("Invalid comparison binary operation '{}'".format(rule.operation))
+        size = kwargs['size']
+        operand = compile_operand(rule.operation, rule.right)
+        if operand is not rule.right:
+            right = operand.traverse(self, **kwargs)
+        if left.kind == _CONSTANT and right.kind == _CONSTANT:
+            return _Column(_CONSTANT, self.evaluate_binop_comparison(rule.operation, left.data, right.data))
+
+        try:
+            if (left.vectorized or left.flat is not None) and right.kind == _CONSTANT:
+                return self._compare_constant(rule.operation, left, right.data)
+            if left.kind == _CONSTANT and (right.vectorized or right.flat is not None) and rule.operation in _SWAPPED_COMPARISONS:
+                return self._compare_constant(_SWAPPED_COMPARISONS[rule.operation], right, left.data)
+            if left.vectorized and right.vectorized:
+                return self._compare_columns(rule.operation, left, right)
+        except (_NotVectorizable, TypeError, ValueError):
+            pass
+        return _object_column([
+            self.evaluate_binop_comparison(rule.operation, lval, rval)
+            for lval, rval in zip(left.objects(size), right.objects(size))
+        ])
+
+    def binary_operation_math(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
+        """
+        if not rule.operation in self.binops_math:
+            raise ValueError("Invalid math binary operation '{}'".format(rule.operation))
+        size = kwargs['size']
+        if left.kind == _CONSTANT and right.kind == _CONSTANT:
+            return _Column(_CONSTANT, self.evaluate_binop_math(rule.operation, left.data, right.data))
+
+        try:
+            return self._calculate_math(rule.operation, left, right, size)
+        except (_NotVectorizable, TypeError, ValueError):
+            pass
+        return _Column(_OBJECT, [
+            self.evaluate_binop_math(rule.operation, lval, rval)
+            for lval, rval in zip(left.objects(size), right.objects(size))
+        ])
+
+    def unary_operation(self, rule, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
+        """
+        if not rule.operation in self.unops:
+            raise ValueError("Invalid unary operation '{}'".format(rule.operation))
+        size = kwargs['size']
+        if rule.operation == 'OP_EXISTS' or right.kind == _CONSTANT:
+            if right.kind == _CONSTANT:
+                return _Column(_CONSTANT, self.evaluate_unop(rule.operation, right.data))
+            return right
+
+        if right.kind == _LIST:
+            return _Column(_BOOL, ~right.valid, numpy.ones(size, dtype = bool))
+        if right.kind == _BOOL:
+            return _bool_column(~right.data, right.valid)
+        if right.kind == _SCALAR and right.data.dtype.kind != 'O':
+            return _bool_column(~right.truth(size), right.valid)
+        return _object_column([self.evaluate_unop(rule.operation, value) for value in right.objects(size)])
+
+    def function(self, rule, args, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
+        """
+        fname = rule.function
+        try:
+            callback = self.functions[fname]
+        except KeyError:
+            raise FilteringRuleException("Invalid function name '{}'".format(fname))
+        if all(arg.kind == _CONSTANT for arg in args):
+            return _Column(_CONSTANT, callback([arg.data for arg in args]))
+        size = kwargs['size']
+        return _Column(_OBJECT, [callback(list(values)) for values in zip(*[arg.objects(size) for arg in args])])
+
+    def conversion(self, rule, result, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.BaseRuleTreeTraverser.conversion` interface.
+        """
+        if result.kind == _CONSTANT:
+            return _Column(_CONSTANT, rule.conversion(result.data))
+        return _Column(_OBJECT, [rule.conversion(value) for value in result.objects(kwargs['size'])])
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    from pynspect.rules import IntegerRule, VariableRule, ComparisonBinOpRule
+
+    DEMO_DATA = [{"Test": 15, "Attr": "ABC"}, {"Test": 5}, {"Attr": "DEF"}]
+    DEMO_RULE = ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10))
+    DEMO_FILTER = ColumnarFilter()
+    pprint.pprint(DEMO_FILTER.filter(DEMO_RULE, DEMO_DATA))
+    pprint.pprint(DEMO_FILTER.filter_many(DEMO_RULE, DEMO_DATA, matches = True))
@@ -20,6 +20,29 @@ There are following main tools in this package:
 
   Filter compiler, that ensures appropriate data types for correct variable
   comparison evaluation in `IDEA <https://idea.cesnet.cz/en/index>`__ messages.
+  Optionally the string values of typed variables in plain messages are lazily
+  coerced into appropriate objects during evaluation.
+
+* :py:class:`ClosureFilterCompiler`
+
+  Filter compiler, that turns rule tree into tree of nested Python closures,
+  which can then be repeatedly called to evaluate data structures without the
+  rule tree traversal overhead.
+
+* :py:class:`AdaptiveFilterCompiler`
+
+  Filter compiler, that builds closures like :py:class:`ClosureFilterCompiler`,
+  but reorders operands of logical chains according to runtime statistics.
+
+* :py:class:`SourceFilterCompiler`
+
+  Filter compiler, that generates Python source code of single function for
+  given rule tree and compiles it. Compiled functions are cached process-wide.
+
+* :py:class:`FilterOptimizer`
+
+  Filter compiler, that simplifies rule tree by constant folding and removal
+  of redundant operations.
 
 """
 
@@ -32,22 +55,52 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
 import re
+import time
 import datetime
+import threading
+import collections
+try:
+    from collections.abc import Mapping, MutableSequence
+except ImportError:
+    from collections import Mapping, MutableSequence
 
 
 import ipranges
-from pynspect.rules import Rule, IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule,\
-    IntegerRule, FloatRule, NumberRule, VariableRule, LogicalBinOpRule,\
-    UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, ConstantRule,\
-    ListRule, FunctionRule
-from pynspect.traversers import ListIP, BaseFilteringTreeTraverser
+from pynspect.rules import FilteringRuleException, Rule, IPV4Rule, IPV6Rule,\
+    DatetimeRule, TimedeltaRule, IntegerRule, FloatRule, NumberRule, VariableRule,\
+    LogicalBinOpRule, UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule,\
+    ConstantRule, ListRule, FunctionRule
+from pynspect.traversers import ListIP, ListSet, BaseFilteringTreeTraverser
+from pynspect.jpath import JPathException, jpath_values, jpath_parse_c
 
 
-TIMESTAMP_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})[Tt]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]+))?([Zz]|(?:[+-][0-9]{2}:[0-9]{2}))$")
+TIMESTAMP_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})[Tt ]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]+))?([Zz]|(?:[+-][0-9]{2}:[0-9]{2}))$")
 
 DURATION_RE = re.compile(r"^((?P<days>[0-9]+)[D|d])?(?P<hrs>[0-9]{2}):(?P<mins>[0-9]{2}):(?P<secs>[0-9]{2})$")
 
 
+def parse_timestamp(value):
+    """
+    Parse given RFC3339 timestamp string into naive datetime object in UTC timezone.
+    As permitted by RFC3339 (section 5.6), the date and time may be separated
+    by space instead of the ``T`` character.
+
+    :param str value: Timestamp string.
+    :return: Datetime object or ``None``, when the string is not valid timestamp.
+    :rtype: datetime.datetime
+    """
+    res = TIMESTAMP_RE.match(value)
+    if res is None:
+        return None
+    year, month, day, hour, minute, second = (int(n or 0) for n in res.group(*range(1, 7)))
+    us_str = (res.group(7) or "0")[:6].ljust(6, "0")
+    us_int = int(us_str)
+    zonestr = res.group(8)
+    zonespl = (0, 0) if zonestr in ['z', 'Z'] else [int(i) for i in zonestr.split(":")]
+    zonediff = datetime.timedelta(minutes = zonespl[0]*60+zonespl[1])
+    return datetime.datetime(year, month, day, hour, minute, second, us_int) - zonediff
+
+
 def compile_ip_v4(rule):
     """
     Compiler helper method: attempt to compile constant into object representing
@@ -82,15 +135,9 @@ def compile_datetime(rule):
     except (TypeError, ValueError):
         pass
     # Try RFC3339 timestamp string
-    res = TIMESTAMP_RE.match(str(rule.value))
+    res = parse_timestamp(str(rule.value))
     if res is not None:
-        year, month, day, hour, minute, second = (int(n or 0) for n in res.group(*range(1, 7)))
-        us_str = (res.group(7) or "0")[:6].ljust(6, "0")
-        us_int = int(us_str)
-        zonestr = res.group(8)
-        zonespl = (0, 0) if zonestr in ['z', 'Z'] else [int(i) for i in zonestr.split(":")]
-        zonediff = datetime.timedelta(minutes = zonespl[0]*60+zonespl[1])
-        return DatetimeRule(datetime.datetime(year, month, day, hour, minute, second, us_int) - zonediff)
+        return DatetimeRule(res)
     raise ValueError("Wrong datetime format '{}'".format(rule.value))
 
 def compile_timedelta(rule):
@@ -135,6 +182,144 @@ def compile_timeoper(rule):
     raise ValueError("Wrong time operation constant '{}'".format(rule))
 
 
+def compile_regex(rule):
+    """
+    Compiler helper method: attempt to compile string constant into precompiled
+    regular expression pattern to be used in ``like`` comparison operations.
+    Invalid patterns are reported immediatelly instead of during each evaluation.
+    """
+    if isinstance(rule, RegexRule):
+        return rule
+    try:
+        return RegexRule(re.compile(rule.value))
+    except (re.error, TypeError) as exc:
+        raise ValueError("Invalid regular expression '{}': {}".format(rule.value, exc))
+
+def compile_like(rule):
+    """
+    Compiler helper method: attempt to compile given right operand of ``like``
+    comparison operation. String constants and lists of string constants are
+    compiled into precompiled regular expression patterns, anything else is
+    returned untouched.
+    """
+    if isinstance(rule, RegexRule) or rule.__class__ is ConstantRule:
+        return compile_regex(rule)
+    if rule.__class__ is ListRule and all(isinstance(i, RegexRule) or i.__class__ is ConstantRule for i in rule.value):
+        return ListRule([compile_regex(i) for i in rule.value])
+    return rule
+
+def compile_in(rule):
+    """
+    Compiler helper method: attempt to compile given right operand of ``in``
+    comparison operation. Lists of simple string and numeric constants are
+    compiled into lists with hash based membership tests, anything else is
+    returned untouched.
+    """
+    if rule.__class__ is ListRule and all(i.__class__ in (ConstantRule, IntegerRule, FloatRule) for i in rule.value):
+        return SetListRule(rule.value)
+    return rule
+
+#: Compilation callbacks for right operands of comparison operations.
+COMPILATIONS_OPERAND = {
+    'OP_LIKE': compile_like,
+    'OP_IN':   compile_in,
+}
+
+def compile_operand(operation, rule):
+    """
+    Compiler helper method: attempt to compile given right operand of given
+    comparison operation with appropriate callback from :py:data:`COMPILATIONS_OPERAND`.
+    """
+    if operation in COMPILATIONS_OPERAND:
+        return COMPILATIONS_OPERAND[operation](rule)
+    return rule
+
+
+#: Maximal number of entries in each cache of coerced message values.
+COERCION_CACHE_LIMIT = 65536
+
+#: Types of message values, that are subject to coercion.
+_COERCION_TYPES = (str, type(u''))
+
+#: Internal caches of coerced message values, one for each coercion function.
+_COERCION_CACHE = {
+    'coerce_datetime': {},
+    'coerce_ip_v4':    {},
+    'coerce_ip_v6':    {},
+}
+
+
+def coercion_cache_size():
+    """
+    Return the total size of internal caches of coerced message values.
+
+    :return: Cache size
+    :rtype: int
+    """
+    return sum([len(cache) for cache in _COERCION_CACHE.values()])
+
+
+def coercion_cache_clear():
+    """
+    Clear internal caches of coerced message values.
+    """
+    for cache in _COERCION_CACHE.values():
+        cache.clear()
+
+
+def _coerce_value(cache, convert, value):
+    """
+    Coerce single string message value with given conversion. The results of
+    conversion (including failed conversions, in which case the value is kept
+    untouched) are stored in given cache, which is cleared whenever it grows over
+    :py:data:`COERCION_CACHE_LIMIT` entries. Values of any other type are
+    returned untouched.
+    """
+    if not isinstance(value, _COERCION_TYPES):
+        return value
+    try:
+        return cache[value]
+    except KeyError:
+        pass
+    try:
+        result = convert(value)
+    except ValueError:
+        result = None
+    if result is None:
+        result = value
+    if len(cache) >= COERCION_CACHE_LIMIT:
+        cache.clear()
+    cache[value] = result
+    return result
+
+def _coerce(cache, convert, values):
+    """
+    Coerce given message value or list of message values with given conversion
+    and cache, see :py:func:`_coerce_value`.
+    """
+    if isinstance(values, list):
+        return [_coerce_value(cache, convert, value) for value in values]
+    return _coerce_value(cache, convert, values)
+
+def coerce_datetime(values):
+    """
+    Coercion of message values containing RFC3339 timestamps into datetime objects.
+    """
+    return _coerce(_COERCION_CACHE['coerce_datetime'], parse_timestamp, values)
+
+def coerce_ip_v4(values):
+    """
+    Coercion of message values containing IPv4 addresses/ranges/networks into objects.
+    """
+    return _coerce(_COERCION_CACHE['coerce_ip_v4'], ipranges.from_str_v4, values)
+
+def coerce_ip_v6(values):
+    """
+    Coercion of message values containing IPv6 addresses/ranges/networks into objects.
+    """
+    return _coerce(_COERCION_CACHE['coerce_ip_v6'], ipranges.from_str_v6, values)
+
+
 CVRE = re.compile(r'\[\d+\]')
 def clean_variable(var):
     """
@@ -150,22 +335,65 @@ def clean_variable(var):
 class IPListRule(ListRule):
     """
     Custom rule for lists of IP addresses/ranges/networks, that need special
-    handling in comparison operations.
+    handling in comparison operations. The list of values is created only once,
+    so that the interval index of :py:class:`pynspect.traversers.ListIP` can be
+    reused for all evaluations.
     """
+    __slots__ = ('cache',)
 
     def __init__(self, rules):
         """
         Initialize the constant with given value.
         """
         self.value = rules
+        self.cache = None
 
     def values(self):
-        return ListIP([i.value for i in self.value])
+        if self.cache is None:
+            self.cache = ListIP([i.value for i in self.value])
+        return self.cache
 
     def __repr__(self):
         return "IPLIST({})".format(', '.join([repr(v) for v in self.value]))
 
 
+class SetListRule(ListRule):
+    """
+    Custom rule for lists of simple constants, that enable hash based membership
+    tests in ``in`` comparison operations.
+    """
+    __slots__ = ('cache',)
+
+    def __init__(self, rules):
+        """
+        Initialize the constant with given value.
+        """
+        self.value = rules
+        self.cache = None
+
+    def values(self):
+        if self.cache is None:
+            self.cache = ListSet([i.value for i in self.value])
+        return self.cache
+
+    def __repr__(self):
+        return "SETLIST({})".format(', '.join([repr(v) for v in self.value]))
+
+
+class RegexRule(ConstantRule):
+    """
+    Custom rule for constants containing precompiled regular expression patterns
+    for ``like`` comparison operations.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return '"{}"'.format(self.value.pattern)
+
+    def __repr__(self):
+        return "REGEX({})".format(repr(self.value.pattern))
+
+
 class ConversionRule(Rule):
     """
     Custom rule for delayed rule conversions. Can be used by the compiler to
@@ -173,10 +401,15 @@ class ConversionRule(Rule):
     manipulation with the result of traversal of that rule tree before returning
     the result.
     """
+    __slots__ = ('conversion', 'rule')
+
     def __init__(self, conversion, rule):
         self.conversion = conversion
         self.rule = rule
 
+    def _key(self):
+        return (self.conversion, self.rule)
+
     def __str__(self):
         return '{{{}}}:{}'.format(str(self.rule), self.conversion.__name__)
 
@@ -187,15 +420,26 @@ class ConversionRule(Rule):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the ``traverse`` method of child rule tree and
-        then perform arbitrary conversion of the result before returning it back.
-        The optional ``kwargs`` are passed down to traverser callback as additional
-        arguments and can be used to provide additional data or context.
+        then hand the result over to :py:func:`pynspect.traversers.BaseRuleTreeTraverser.conversion`
+        callback, which by default performs the arbitrary conversion of the result
+        before returning it back. The optional ``kwargs`` are passed down to
+        traverser callback as additional arguments and can be used to provide
+        additional data or context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
         :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
         """
         result = self.rule.traverse(traverser, **kwargs)
-        return self.conversion(result)
+        return traverser.conversion(self, result, **kwargs)
+
+
+def _uncoerced(rule):
+    """
+    Return variable wrapped in coercion of message values, or given rule itself.
+    """
+    if isinstance(rule, ConversionRule) and isinstance(rule.rule, VariableRule):
+        return rule.rule
+    return rule
 
 
 class IDEAFilterCompiler(BaseFilteringTreeTraverser):
@@ -213,24 +457,41 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
     >>> rule = psr.parse('ID like "e214d2d9"')
     >>> rule = cpl.compile(rule)
     >>> result = flt.filter(rule, test_msg)
+
+    Messages do not have to be converted into ``lite.Idea`` objects, when the
+    ``coercion`` flag is set. Variables with registered coercion are then wrapped
+    into :py:class:`ConversionRule`, which converts only the referenced string
+    values (timestamps and IP addresses) during evaluation, wherever the variable
+    is used. Results of these
+    conversions are cached, see :py:func:`coercion_cache_clear`::
+
+    >>> cpl = IDEAFilterCompiler(coercion = True)
+    >>> rule = cpl.compile(psr.parse('Source.IP4 in [192.168.0.0/16] and DetectTime > 2016-06-21T11:00:00Z'))
+    >>> result = flt.filter(rule, test_msg)
     """
 
-    def __init__(self):
+    def __init__(self, coercion = False):
+        """
+        Initialize the compiler.
+
+        :param bool coercion: Coerce string values of typed variables in evaluated messages.
+        """
         super(IDEAFilterCompiler, self).__init__()
 
+        self.coercion = coercion
         self.compilations_variable = {}
         self.compilations_function = {}
 
-        self.register_variable_compilation('CreateTime',   compile_timeoper, ListRule)
-        self.register_variable_compilation('DetectTime',   compile_timeoper, ListRule)
-        self.register_variable_compilation('EventTime',    compile_timeoper, ListRule)
-        self.register_variable_compilation('CeaseTime',    compile_timeoper, ListRule)
-        self.register_variable_compilation('WinStartTime', compile_timeoper, ListRule)
-        self.register_variable_compilation('WinEndTime',   compile_timeoper, ListRule)
-        self.register_variable_compilation('Source.IP4',   compile_ip_v4,    IPListRule)
-        self.register_variable_compilation('Target.IP4',   compile_ip_v4,    IPListRule)
-        self.register_variable_compilation('Source.IP6',   compile_ip_v6,    IPListRule)
-        self.register_variable_compilation('Target.IP6',   compile_ip_v6,    IPListRule)
+        self.register_variable_compilation('CreateTime',   compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('DetectTime',   compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('EventTime',    compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('CeaseTime',    compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('WinStartTime', compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('WinEndTime',   compile_timeoper, ListRule,   coerce_datetime)
+        self.register_variable_compilation('Source.IP4',   compile_ip_v4,    IPListRule, coerce_ip_v4)
+        self.register_variable_compilation('Target.IP4',   compile_ip_v4,    IPListRule, coerce_ip_v4)
+        self.register_variable_compilation('Source.IP6',   compile_ip_v6,    IPListRule, coerce_ip_v6)
+        self.register_variable_compilation('Target.IP6',   compile_ip_v6,    IPListRule, coerce_ip_v6)
 
         self.register_function_compilation('utcnow', compile_timeoper, ListRule)
 
@@ -245,17 +506,19 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         """
         return rule.traverse(self)
 
-    def register_variable_compilation(self, path, compilation_cbk, listclass):
+    def register_variable_compilation(self, path, compilation_cbk, listclass, coercion_cbk = None):
         """
         Register given compilation method for variable on given path.
 
         :param str path: JPath for given variable.
         :param callable compilation_cbk: Compilation callback to be called.
         :param class listclass: List class to use for lists.
+        :param callable coercion_cbk: Optional coercion of message values of the variable.
         """
         self.compilations_variable[path] = {
             'callback':  compilation_cbk,
-            'listclass': listclass
+            'listclass': listclass,
+            'coercion':  coercion_cbk
         }
 
     def register_function_compilation(self, func, compilation_cbk, listclass):
@@ -298,22 +561,22 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
 
         # Make sure variables always have constant with correct datatype on the
         # opposite side of operation.
-        if isinstance(left, VariableRule) and isinstance(right, (ConstantRule, ListRule)):
+        if isinstance(_uncoerced(left), VariableRule) and isinstance(right, (ConstantRule, ListRule)):
             return self._cor_compile(
                 rule,
                 left,
                 right,
                 result_class,
-                clean_variable(left.value),
+                clean_variable(_uncoerced(left).value),
                 self.compilations_variable
             )
-        if isinstance(right, VariableRule) and isinstance(left, (ConstantRule, ListRule)):
+        if isinstance(_uncoerced(right), VariableRule) and isinstance(left, (ConstantRule, ListRule)):
             return self._cor_compile(
                 rule,
                 right,
                 left,
                 result_class,
-                clean_variable(right.value),
+                clean_variable(_uncoerced(right).value),
                 self.compilations_variable
             )
 
@@ -400,14 +663,16 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
         """
-        rule.value = int(rule.value)
+        if not isinstance(rule.value, int):
+            return IntegerRule(int(rule.value))
         return rule
 
     def float(self, rule, **kwargs):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
         """
-        rule.value = float(rule.value)
+        if not isinstance(rule.value, float):
+            return FloatRule(float(rule.value))
         return rule
 
     def constant(self, rule, **kwargs):
@@ -420,6 +685,10 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
         """
+        if self.coercion:
+            compilation = self.compilations_variable.get(clean_variable(rule.value), None)
+            if compilation and compilation.get('coercion'):
+                return ConversionRule(compilation['coercion'], rule)
         return rule
 
     def list(self, rule, **kwargs):
@@ -438,12 +707,16 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
         """
-        return self._compile_operation_rule(
+        if rule.operation == 'OP_LIKE':
+            return ComparisonBinOpRule(rule.operation, left, compile_like(right))
+        result = self._compile_operation_rule(
             rule,
             left,
             right,
             ComparisonBinOpRule
         )
+        result.right = compile_operand(result.operation, result.right)
+        return result
 
     def binary_operation_math(self, rule, left, right, **kwargs):
         """
@@ -471,17 +744,1336 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         return rule
 
 
-#-------------------------------------------------------------------------------
+def _logical_function(decisive, operands):
+    """
+    Create closure evaluating chain of operands joined by short-circuiting logical
+    operation. Operands are evaluated from left to right, until one of them
+    evaluates to the ``decisive`` truth value, which is then the result of the
+    whole chain. Otherwise the value of the last operand is the result.
+    The chain is exposed in ``chain`` attribute of the closure, so that nested
+    chains of the same operation may be flattened.
+    """
+    operands = tuple(operands)
+    if len(operands) == 2:
+        left, right = operands
+        if decisive:
+            def logical(obj, memo):
+                return left(obj, memo) or right(obj, memo)
+        else:
+            def logical(obj, memo):
+                return left(obj, memo) and right(obj, memo)
+    else:
+        def logical(obj, memo):
+            for operand in operands:
+                result = operand(obj, memo)
+                if bool(result) is decisive:
+                    break
+            return result
+    logical.chain = (decisive, operands)
+    return logical
+
+def _jpath_memo(obj, memo, jpath):
+    """
+    Helper function for retrieving values at given JPath within given data structure
+    with memoization of the result in given ``memo`` dictionary for the duration
+    of single evaluation.
+    """
+    values = memo.get(jpath)
+    if values is None:
+        values = memo[jpath] = jpath_values(obj, jpath)
+    return values
 
+def _listify(value):
+    """
+    Helper function for normalizing comparison operands into lists.
+    """
+    if value is None or isinstance(value, (list, ListIP)):
+        return value
+    return [value]
 
-#
-# Perform the demonstration.
-#
-if __name__ == "__main__":
+def _comparison_function(operation, opfn):
+    """
+    Helper function for building function evaluating given comparison operation.
+    The list handling logic mirrors the :py:func:`pynspect.traversers.BaseFilteringTreeTraverser.evaluate_binop_comparison`
+    method.
+    """
+    if operation in ['OP_IS']:
+        def compare(left, right):
+            left  = _listify(left)
+            right = _listify(right)
+            if not left or not right:
+                return None
+            if opfn(left, right):
+                return True
+            return False
+    elif operation in ['OP_IN']:
+        def compare(left, right):
+            left  = _listify(left)
+            right = _listify(right)
+            if not left or not right:
+                return None
+            for iteml in left:
+                if opfn(iteml, right):
+                    return True
+            return False
+    else:
+        def compare(left, right):
+            left  = _listify(left)
+            right = _listify(right)
+            if not left or not right:
+                return None
+            for iteml in left:
+                if iteml is None:
+                    continue
+                for itemr in right:
+                    if itemr is None:
+                        continue
+                    if opfn(iteml, itemr):
+                        return True
+            return False
+    return compare
+
+def _unary_function(opfn):
+    """
+    Helper function for building function evaluating given unary operation.
+    """
+    def unary(right):
+        if right is None:
+            return None
+        return opfn(right)
+    return unary
 
-    import pprint
 
-    DEMO_DATA     = {"Test": 15, "Attr": "ABC"}
-    DEMO_RULE     = ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10))
-    DEMO_COMPILER = IDEAFilterCompiler()
-    pprint.pprint(DEMO_COMPILER.compile(DEMO_RULE))
+class ClosureFilterCompiler(BaseFilteringTreeTraverser):
+    """
+    Rule tree traverser implementing compilation of filtering rule tree into tree
+    of nested Python closures.
+
+    The rule tree is traversed only once during the compilation and the result
+    is a callable object, that takes data structure as single argument and returns
+    the same result as :py:func:`pynspect.filters.DataObjectFilter.filter` would
+    for the same rule and data. All operation and function lookups are resolved
+    at compilation time, so the evaluation does not involve any per-node method
+    lookups or keyword argument passing.
+
+    Values of variables are retrieved only once per evaluation, even if the same
+    JPath is referenced multiple times within the rule. Internally all closures
+    take the evaluated data structure and the dictionary of already retrieved
+    values as arguments, :py:func:`compile_memo` may be used to obtain such closure
+    directly and to share the memo dictionary among multiple compiled rules.
+
+    Following example demonstrates ClosureFilterCompiler usage in conjuction with
+    PynspectFilterParser and DataObjectFilter, from which the set of available
+    filtering functions is taken::
+
+    >>> flt = DataObjectFilter()
+    >>> cfc = ClosureFilterCompiler(flt.functions)
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> rule = psr.parse('ID like "e214d2d9"')
+    >>> evaluate = cfc.compile(rule)
+    >>> result = evaluate(test_msg)
+    """
+
+    def __init__(self, functions = None):
+        """
+        Initialize the compiler with optional dictionary of filtering functions.
+
+        :param dict functions: Filtering rule functions, that will be registered with :py:func:`register_function`.
+        """
+        super(ClosureFilterCompiler, self).__init__()
+
+        if functions:
+            for name, callback in functions.items():
+                self.register_function(name, callback)
+
+    def compile(self, rule):
+        """
+        Compile given filtering rule into callable closure.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :return: compiled filtering rule taking data structure as single argument
+        :rtype: callable
+        """
+        closure = self.compile_memo(rule)
+        def evaluate(obj):
+            return closure(obj, {})
+        return evaluate
+
+    def compile_memo(self, rule):
+        """
+        Compile given filtering rule into callable closure taking data structure
+        and memo dictionary for storing retrieved values during single evaluation
+        as arguments. The memo dictionary must be empty for each new data structure.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :return: compiled filtering rule taking data structure and memo dictionary as arguments
+        :rtype: callable
+        """
+        return rule.traverse(self)
+
+    #---------------------------------------------------------------------------
+
+    @staticmethod
+    def _compile_constant(value):
+        """
+        Compile given constant value into closure.
+        """
+        def closure(obj, memo):  # pylint: disable=locally-disabled,unused-argument
+            return value
+        return closure
+
+    def _compile_comparison(self, operation, left, right):
+        """
+        Compile given comparison operation into closure.
+        """
+        if not operation in self.binops_comparison:
+            raise ValueError("Invalid comparison binary operation '{}'".format(operation))
+        compare = _comparison_function(operation, self.binops_comparison[operation])
+        def closure(obj, memo):
+            return compare(left(obj, memo), right(obj, memo))
+        return closure
+
+    #---------------------------------------------------------------------------
+
+    def ipv4(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def ipv6(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def datetime(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def timedelta(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def integer(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def float(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def constant(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
+        """
+        return self._compile_constant(rule.value)
+
+    def variable(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
+        """
+        jpath = rule.value
+        def closure(obj, memo):
+            values = memo.get(jpath)
+            if values is None:
+                values = memo[jpath] = jpath_values(obj, jpath)
+            return values
+        return closure
+
+    def list(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
+        """
+        return self._compile_constant(rule.values())
+
+    def binary_operation_logical(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
+        """
+        if not rule.operation in self.binops_logical:
+            raise ValueError("Invalid logical binary operation '{}'".format(rule.operation))
+        if rule.operation in self.binops_logical_decisive:
+            decisive = self.binops_logical_decisive[rule.operation]
+            operands = []
+            for operand in (left, right):
+                chain = getattr(operand, 'chain', None)
+                if chain and chain[0] is decisive:
+                    operands.extend(chain[1])
+                else:
+                    operands.append(operand)
+            return _logical_function(decisive, operands)
+        opfn = self.binops_logical[rule.operation]
+        def closure(obj, memo):
+            return opfn(left(obj, memo), right(obj, memo))
+        return closure
+
+    def binary_operation_comparison(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
+        """
+        operand = compile_operand(rule.operation, rule.right)
+        if operand is not rule.right:
+            right = operand.traverse(self)
+        return self._compile_comparison(rule.operation, left, right)
+
+    def binary_operation_math(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
+        """
+        if not rule.operation in self.binops_math:
+            raise ValueError("Invalid math binary operation '{}'".format(rule.operation))
+        operation = rule.operation
+        evaluate  = self.evaluate_binop_math
+        def closure(obj, memo):
+            return evaluate(operation, left(obj, memo), right(obj, memo))
+        return closure
+
+    def unary_operation(self, rule, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
+        """
+        if not rule.operation in self.unops:
+            raise ValueError("Invalid unary operation '{}'".format(rule.operation))
+        unary = _unary_function(self.unops[rule.operation])
+        def closure(obj, memo):
+            return unary(right(obj, memo))
+        return closure
+
+    def function(self, rule, args, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
+        """
+        fname = rule.function
+        try:
+            callback = self.functions[fname]
+        except KeyError:
+            raise FilteringRuleException("Invalid function name '{}'".format(fname))
+        def closure(obj, memo):
+            return callback([arg(obj, memo) for arg in args])
+        return closure
+
+    def conversion(self, rule, result, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.BaseRuleTreeTraverser.conversion` interface.
+        """
+        convert = rule.conversion
+        def closure(obj, memo):
+            return convert(result(obj, memo))
+        return closure
+
+
+#: High resolution clock used for measuring evaluation time of operands and rules.
+CLOCK = getattr(time, 'perf_counter', time.time)
+
+
+class _AdaptiveChain(object):
+    """
+    Internal callable evaluating chain of operands joined by short-circuiting
+    logical operation in adaptive order. Every ``sample``-th evaluation the truth
+    values and evaluation times of operands are recorded and after each ``interval``
+    recorded evaluations the operands are reordered, so that cheap operands most
+    likely deciding the result of the chain are evaluated first. Recorded
+    statistics are halved after each reordering, so that the order follows the
+    changes in evaluated data.
+    """
+    def __init__(self, decisive, operands, labels, interval, sample):
+        self.decisive  = decisive
+        self.operands  = tuple(operands)
+        self.labels    = tuple(labels)
+        self.interval  = interval
+        self.sample    = sample
+        self.evaluated = [0.0] * len(self.operands)
+        self.true      = [0.0] * len(self.operands)
+        self.elapsed   = [0.0] * len(self.operands)
+        self.calls     = 0
+        self.samples   = 0
+        self.order     = tuple(range(len(self.operands)))
+        self.ordered   = self.operands
+
+    def __call__(self, obj, memo):
+        self.calls += 1
+        if self.calls % self.sample:
+            decisive = self.decisive
+            for operand in self.ordered:
+                result = operand(obj, memo)
+                if bool(result) is decisive:
+                    break
+            return result
+        return self._evaluate_sampled(obj, memo)
+
+    def _evaluate_sampled(self, obj, memo):
+        """
+        Evaluate the chain and record statistics of all evaluated operands.
+        """
+        for idx in self.order:
+            start  = CLOCK()
+            result = self.operands[idx](obj, memo)
+            self.elapsed[idx]   += CLOCK() - start
+            self.evaluated[idx] += 1
+            if result:
+                self.true[idx] += 1
+            if bool(result) is self.decisive:
+                break
+        self.samples += 1
+        if self.samples >= self.interval:
+            self.reorder()
+        return result
+
+    def _rank(self, idx):
+        """
+        Calculate rank of operand with given index, operands with lower rank are
+        evaluated first. Operands without statistics are ranked first to get
+        measured as soon as possible.
+        """
+        evaluated = self.evaluated[idx]
+        if not evaluated:
+            return 0.0
+        decided = self.true[idx] if self.decisive else evaluated - self.true[idx]
+        return (self.elapsed[idx] / evaluated) * (evaluated + 2) / (decided + 1)
+
+    def reorder(self):
+        """
+        Reorder the operands according to recorded statistics and decay them.
+        """
+        self.order   = tuple(sorted(range(len(self.operands)), key = self._rank))
+        self.ordered = tuple(self.operands[idx] for idx in self.order)
+        self.samples = 0
+        for idx in range(len(self.operands)):
+            self.evaluated[idx] /= 2.0
+            self.true[idx]      /= 2.0
+            self.elapsed[idx]   /= 2.0
+
+    def statistics(self):
+        """
+        Return recorded statistics of operands in current evaluation order.
+        """
+        return [
+            {
+                'operand':   self.labels[idx],
+                'evaluated': self.evaluated[idx],
+                'true':      self.true[idx],
+                'elapsed':   self.elapsed[idx],
+            }
+            for idx in self.order
+        ]
+
+
+class AdaptiveFilterCompiler(ClosureFilterCompiler):
+    """
+    Filter compiler, that turns rule tree into tree of nested Python closures
+    like :py:class:`ClosureFilterCompiler`, but evaluates commutative ``and``/``or``
+    chains in adaptive order. Each chain records how often its operands are true
+    and how long they take to evaluate and periodically reorders them, so that
+    cheap and highly selective operands are evaluated first.
+
+    Because reordering of operands changes which of them becomes the result of
+    the chain, only chains whose result is used as a truth value are reordered
+    and compiled functions return boolean values. For the same reason any
+    exceptions raised by operands may occur in different order.
+
+    Following example demonstrates AdaptiveFilterCompiler usage::
+
+    >>> flt = DataObjectFilter()
+    >>> afc = AdaptiveFilterCompiler(flt.functions, interval = 100)
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> evaluate = afc.compile(psr.parse('Source.IP4 == 10.0.0.1 or Category in ["Spam"]'))
+    >>> results = [evaluate(msg) for msg in messages]
+    >>> stats = evaluate.statistics()
+    """
+
+    def __init__(self, functions = None, interval = 1000, sample = 10):
+        """
+        Initialize the compiler with optional dictionary of filtering functions
+        and adaptation parameters.
+
+        :param dict functions: Filtering rule functions, that will be registered with :py:func:`register_function`.
+        :param int interval: Number of recorded evaluations of chain between reorderings.
+        :param int sample: Record statistics for every n-th evaluation of chain.
+        """
+        super(AdaptiveFilterCompiler, self).__init__(functions)
+        self.interval = interval
+        self.sample   = sample
+        self._truth   = set()
+        self._chains  = []
+
+    def compile(self, rule):
+        """
+        Compile given filtering rule into callable closure returning boolean result.
+        The closure provides ``statistics`` method returning list of recorded
+        statistics of all adaptive chains and ``chains`` attribute with the chains
+        themselves.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :return: compiled filtering rule taking data structure as single argument
+        :rtype: callable
+        """
+        self._truth  = set()
+        self._chains = []
+        self._mark_truth(rule)
+        closure = self.compile_memo(rule)
+        chains  = self._chains
+        def evaluate(obj):
+            return bool(closure(obj, {}))
+        evaluate.chains = chains
+        evaluate.statistics = lambda: [chain.statistics() for chain in chains]
+        return evaluate
+
+    def _mark_truth(self, rule):
+        """
+        Mark all logical operation nodes of given rule tree, whose result is used
+        only as a truth value.
+        """
+        if isinstance(rule, LogicalBinOpRule):
+            self._truth.add(id(rule))
+            self._mark_truth(rule.left)
+            self._mark_truth(rule.right)
+        elif isinstance(rule, UnaryOperationRule) and rule.operation == 'OP_EXISTS':
+            self._mark_truth(rule.right)
+
+    #---------------------------------------------------------------------------
+
+    def binary_operation_logical(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
+        """
+        if not id(rule) in self._truth or not rule.operation in self.binops_logical_decisive:
+            return super(AdaptiveFilterCompiler, self).binary_operation_logical(rule, left, right, **kwargs)
+        decisive = self.binops_logical_decisive[rule.operation]
+        operands = []
+        labels   = []
+        for operand, subrule in ((left, rule.left), (right, rule.right)):
+            if isinstance(operand, _AdaptiveChain) and operand.decisive is decisive:
+                self._chains.remove(operand)
+                operands.extend(operand.operands)
+                labels.extend(operand.labels)
+            else:
+                operands.append(operand)
+                labels.append(str(subrule))
+        chain = _AdaptiveChain(decisive, operands, labels, self.interval, self.sample)
+        self._chains.append(chain)
+        return chain
+
+
+#: Maximal number of entries in process-wide cache of compiled filtering functions.
+SOURCE_CACHE_LIMIT = 1024
+
+#: Internal process-wide LRU cache for filtering functions compiled from generated source code.
+_SOURCE_CACHE = collections.OrderedDict()
+
+#: Internal lock guarding the access to :py:data:`_SOURCE_CACHE`.
+_SOURCE_CACHE_LOCK = threading.Lock()
+
+#: Python operators, that are inlined into generated source code for default comparison operations.
+_SOURCE_OPERATORS = {
+    'OP_IN': 'in',
+    'OP_EQ': '==',
+    'OP_NE': '!=',
+    'OP_GT': '>',
+    'OP_GE': '>=',
+    'OP_LT': '<',
+    'OP_LE': '<=',
+}
+
+#: Operation tables of the compiler, that the generated source code depends on.
+_SOURCE_TABLES = ('binops_logical', 'binops_logical_decisive', 'binops_comparison', 'binops_math', 'unops')
+
+#: Values bound to every generated filtering function.
+_SOURCE_BINDINGS = {
+    '_jpath': jpath_values,
+    '_MAP':   (dict, Mapping),
+    '_SEQ':   (list, MutableSequence),
+    '_LST':   (list, ListIP),
+}
+
+
+def source_cache_size():
+    """
+    Return the size of internal cache of compiled filtering functions.
+
+    :return: Cache size
+    :rtype: int
+    """
+    with _SOURCE_CACHE_LOCK:
+        return len(_SOURCE_CACHE)
+
+
+def source_cache_clear():
+    """
+    Clear internal cache of compiled filtering functions.
+    """
+    with _SOURCE_CACHE_LOCK:
+        _SOURCE_CACHE.clear()
+
+
+def _indent(lines):
+    """
+    Indent given lines of generated source code by single level.
+    """
+    return ['    ' + line for line in lines]
+
+
+class SourceFilterCompiler(BaseFilteringTreeTraverser):
+    """
+    Rule tree traverser implementing compilation of filtering rule tree into
+    Python source code of single function, which is then compiled by built-in
+    :py:func:`compile` function.
+
+    The generated function evaluates the whole rule as a sequence of plain Python
+    statements working only with local variables: JPath variables without indices
+    are looked up by inlined dictionary access, logical operations are turned
+    into nested ``if`` statements and default comparison operations against
+    constant operands are inlined as Python operators. Everything else (constants,
+    indexed JPaths, math operations, functions and conversions) is bound to the
+    generated function as default argument values. Variables referenced multiple
+    times within the rule are retrieved only once per evaluation.
+
+    Compiled functions are stored in process-wide LRU cache of at most
+    :py:data:`SOURCE_CACHE_LIMIT` entries keyed by the structure of the rule,
+    by the class of the compiler, by its operation tables and by the set of
+    registered filtering functions, so compiling the same rule again is cheap. The generated source code is available in ``source`` attribute
+    of the resulting function for debugging purposes, or can be generated directly
+    with :py:func:`SourceFilterCompiler.source` method.
+
+    Following example demonstrates SourceFilterCompiler usage in conjuction with
+    PynspectFilterParser and DataObjectFilter, from which the set of available
+    filtering functions is taken::
+
+    >>> flt = DataObjectFilter()
+    >>> sfc = SourceFilterCompiler(flt.functions)
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> rule = psr.parse('ID like "e214d2d9"')
+    >>> evaluate = sfc.compile(rule)
+    >>> print(evaluate.source)
+    >>> result = evaluate(test_msg)
+
+    .. note::
+
+        Very deeply nested rules may hit the limits of Python parser. In that
+        case the rule is compiled with :py:class:`ClosureFilterCompiler` instead
+        and the ``source`` attribute of the result is ``None``.
+    """
+
+    def __init__(self, functions = None):
+        """
+        Initialize the compiler with optional dictionary of filtering functions.
+
+        :param dict functions: Filtering rule functions, that will be registered with :py:func:`register_function`.
+        """
+        super(SourceFilterCompiler, self).__init__()
+
+        if functions:
+            for name, callback in functions.items():
+                self.register_function(name, callback)
+
+    def compile(self, rule):
+        """
+        Compile given filtering rule into Python function, or fetch the function
+        from internal cache, when the same rule was already compiled.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :return: compiled filtering rule taking data structure as single argument
+        :rtype: callable
+        """
+        key = (self.__class__, rule, tuple(sorted(self.functions.items(), key = lambda x: x[0])))
+        key += tuple([tuple(sorted(getattr(self, name).items(), key = lambda x: x[0])) for name in _SOURCE_TABLES])
+        try:
+            hash(key)
+        except TypeError:
+            return self._build(rule)
+        with _SOURCE_CACHE_LOCK:
+            function = _SOURCE_CACHE.pop(key, None)
+            if function is not None:
+                _SOURCE_CACHE[key] = function
+                return function
+        function = self._build(rule)
+        with _SOURCE_CACHE_LOCK:
+            _SOURCE_CACHE[key] = function
+            while len(_SOURCE_CACHE) > SOURCE_CACHE_LIMIT:
+                _SOURCE_CACHE.popitem(last = False)
+        return function
+
+    def source(self, rule):
+        """
+        Generate Python source code for given filtering rule.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :return: Python source code of the filtering function
+        :rtype: str
+        """
+        return self._generate(rule)[0]
+
+    #---------------------------------------------------------------------------
+
+    def _generate(self, rule):
+        """
+        Generate Python source code and dictionary of bound values for given rule.
+        """
+        counts = {}
+        rule.traverse(self, bindings = dict(_SOURCE_BINDINGS), counts = counts, repeated = {}, temps = [0])
+        repeated = {}
+        for path in sorted(counts.keys()):
+            if counts[path] > 1:
+                repeated[path] = '_p{}'.format(len(repeated))
+        bindings = dict(_SOURCE_BINDINGS)
+        body, expression = rule.traverse(self, bindings = bindings, counts = {}, repeated = repeated, temps = [0])
+        # Drop values bound for operands, that were replaced during compilation.
+        used = set(re.findall(r'\b_\w+', '\n'.join(body + [expression])))
+        bindings = dict([(name, value) for name, value in bindings.items() if name in used])
+        names = sorted(bindings.keys())
+        lines = ['# {}'.format(repr(rule))]
+        for name in names:
+            value = bindings[name]
+            lines.append('#   {} = {}'.format(name, value.__name__ if callable(value) and hasattr(value, '__name__') else repr(value)))
+        lines.append('def pynspect_filter(obj, {}):'.format(', '.join(['{0}={0}'.format(n) for n in names])))
+        for path in sorted(repeated.keys()):
+            lines.append('    {} = None'.format(repeated[path]))
+        lines.extend(_indent(body))
+        lines.append('    return {}'.format(expression))
+        return '\n'.join(lines) + '\n', bindings
+
+    def _build(self, rule):
+        """
+        Generate and compile Python function for given rule.
+        """
+        try:
+            source, bindings = self._generate(rule)
+            code = compile(source, '<pynspect>', 'exec')
+        except (SyntaxError, RuntimeError, MemoryError):
+            function = ClosureFilterCompiler(self.functions).compile(rule)
+            function.source = None
+            return function
+        namespace = dict(bindings)
+        exec(code, namespace)  # pylint: disable=locally-disabled,exec-used
+        function = namespace['pynspect_filter']
+        function.source = source
+        return function
+
+    @staticmethod
+    def _bind(value, prefix, bindings):
+        """
+        Bind given value into generated function and return its name.
+        """
+        name = '_{}{}'.format(prefix, len(bindings))
+        bindings[name] = value
+        return name
+
+    @staticmethod
+    def _temp(temps):
+        """
+        Return the name of new temporary local variable of generated function.
+        """
+        temps[0] += 1
+        return '_t{}'.format(temps[0])
+
+    def _local(self, lines, expression, temps):
+        """
+        Make sure given expression is local variable, literals are stored into
+        new temporary variable first.
+        """
+        if expression.startswith('_'):
+            return expression
+        name = self._temp(temps)
+        lines.append('{} = {}'.format(name, expression))
+        return name
+
+    def _compile_constant(self, value, **kwargs):
+        """
+        Compile given constant value into source code expression.
+        """
+        if value is None or isinstance(value, (bool, int)):
+            return [], repr(value)
+        return [], self._bind(value, 'c', kwargs['bindings'])
+
+    def _compile_jpath(self, path, target, **kwargs):
+        """
+        Compile retrieval of values at given JPath into given local variable.
+        JPaths without indices are inlined, the rest is handed over to
+        :py:func:`pynspect.jpath.jpath_values`.
+        """
+        try:
+            chunks = jpath_parse_c(path)
+        except JPathException:
+            chunks = None
+        if not chunks or [chunk for chunk in chunks if 'i' in chunk]:
+            return ['{} = _jpath(obj, {})'.format(target, repr(path))]
+
+        lines  = ['{} = []'.format(target)]
+        node   = 'obj'
+        indent = ''
+        for idx, chunk in enumerate(chunks):
+            value = self._temp(kwargs['temps'])
+            lines.append('{}if isinstance({}, _MAP) and {} in {}:'.format(indent, node, repr(chunk['n']), node))
+            lines.append('{}    {} = {}[{}]'.format(indent, value, node, repr(chunk['n'])))
+            if idx == len(chunks) - 1:
+                lines.append('{}    if isinstance({}, _SEQ):'.format(indent, value))
+                lines.append('{}        {}.extend({})'.format(indent, target, value))
+                lines.append('{}    else:'.format(indent))
+                lines.append('{}        {}.append({})'.format(indent, target, value))
+            else:
+                node = self._temp(kwargs['temps'])
+                lines.append('{0}    for {1} in ({2} if isinstance({2}, _SEQ) else ({2},)):'.format(indent, node, value))
+                indent += '        '
+        return lines
+
+    def _compile_operator(self, operation, left, right, value, **kwargs):
+        """
+        Compile single comparison of two items into source code expression.
+        Default comparison operations are inlined as Python operators, ``like``
+        against precompiled pattern is inlined as call of its ``search`` method.
+        """
+        opfn = self.binops_comparison[operation]
+        if opfn is BaseFilteringTreeTraverser.binops_comparison.get(operation):
+            if operation in _SOURCE_OPERATORS:
+                return '{} {} {}'.format(left, _SOURCE_OPERATORS[operation], right)
+            if operation == 'OP_LIKE' and hasattr(value, 'search'):
+                return '{}({})'.format(self._bind(value.search, 's', kwargs['bindings']), left)
+        return '{}({}, {})'.format(self._bind(opfn, 'o', kwargs['bindings']), left, right)
+
+    #---------------------------------------------------------------------------
+
+    def ipv4(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def ipv6(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def datetime(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def timedelta(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def integer(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def float(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def constant(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
+        """
+        return self._compile_constant(rule.value, **kwargs)
+
+    def variable(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
+        """
+        path = str(rule.value)
+        kwargs['counts'][path] = kwargs['counts'].get(path, 0) + 1
+        if path in kwargs['repeated']:
+            name = kwargs['repeated'][path]
+            return ['if {} is None:'.format(name)] + _indent(self._compile_jpath(path, name, **kwargs)), name
+        name = self._temp(kwargs['temps'])
+        return self._compile_jpath(path, name, **kwargs), name
+
+    def list(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
+        """
+        return [], self._bind(rule.values(), 'c', kwargs['bindings'])
+
+    def binary_operation_logical(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
+        """
+        if not rule.operation in self.binops_logical:
+            raise ValueError("Invalid logical binary operation '{}'".format(rule.operation))
+        (llines, lexpr), (rlines, rexpr) = left, right
+        result = self._temp(kwargs['temps'])
+        if rule.operation in self.binops_logical_decisive:
+            test = 'if not {}:' if self.binops_logical_decisive[rule.operation] else 'if {}:'
+            lines = llines + ['{} = {}'.format(result, lexpr), test.format(result)]
+            lines.extend(_indent(rlines + ['{} = {}'.format(result, rexpr)]))
+            return lines, result
+        name = self._bind(self.binops_logical[rule.operation], 'l', kwargs['bindings'])
+        return llines + rlines + ['{} = {}({}, {})'.format(result, name, lexpr, rexpr)], result
+
+    def binary_operation_comparison(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
+        """
+        if not rule.operation in self.binops_comparison:
+            raise ValueError("Invalid comparison binary operation '{}'".format(rule.operation))
+        operand = compile_operand(rule.operation, rule.right)
+        if operand is not rule.right:
+            right = operand.traverse(self, **kwargs)
+        (llines, lexpr), (rlines, rexpr) = left, right
+        result = self._temp(kwargs['temps'])
+
+        # Comparisons with non-constant operands are handed over to helper function.
+        if rule.operation in ['OP_IS'] or not _is_constant(operand):
+            name = self._bind(
+                _comparison_function(rule.operation, self.binops_comparison[rule.operation]),
+                'cmp',
+                kwargs['bindings']
+            )
+            return llines + rlines + ['{} = {}({}, {})'.format(result, name, lexpr, rexpr)], result
+
+        lines = list(llines)
+        values = _listify(_constant_value(operand))
+        if not values:
+            lines.append('{} = None'.format(result))
+            return lines, result
+        if not isinstance(rule.left, VariableRule):
+            lexpr = self._local(lines, lexpr, kwargs['temps'])
+            lines.append('{0} = {0} if {0} is None or isinstance({0}, _LST) else [{0}]'.format(lexpr))
+        if rule.operation not in ['OP_IN']:
+            values = [value for value in values if value is not None]
+            if not values:
+                lines.append('{} = False if {} else None'.format(result, lexpr))
+                return lines, result
+
+        item = self._temp(kwargs['temps'])
+        if rule.operation in ['OP_IN']:
+            name = self._bind(values, 'c', kwargs['bindings'])
+            loop = ['if {}:'.format(self._compile_operator(rule.operation, item, name, None, **kwargs))]
+        elif len(values) == 1:
+            name = self._compile_constant(values[0], **kwargs)[1]
+            loop = ['if {} is not None and {}:'.format(item, self._compile_operator(rule.operation, item, name, values[0], **kwargs))]
+        else:
+            name = self._bind(values, 'c', kwargs['bindings'])
+            itemr = self._temp(kwargs['temps'])
+            loop = [
+                'if {} is not None:'.format(item),
+                '    for {} in {}:'.format(itemr, name),
+                '        if {}:'.format(self._compile_operator(rule.operation, item, itemr, None, **kwargs)),
+                '            {} = True'.format(result),
+                '            break',
+                '    if {}:'.format(result),
+                '        break',
+            ]
+            loop = [
+                '{} = None'.format(result),
+                'if {}:'.format(lexpr),
+                '    {} = False'.format(result),
+                '    for {} in {}:'.format(item, lexpr),
+            ] + _indent(_indent(loop))
+            return lines + loop, result
+
+        lines.extend([
+            '{} = None'.format(result),
+            'if {}:'.format(lexpr),
+            '    {} = False'.format(result),
+            '    for {} in {}:'.format(item, lexpr),
+        ])
+        lines.extend(_indent(_indent(loop + ['    {} = True'.format(result), '    break'])))
+        return lines, result
+
+    def binary_operation_math(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
+        """
+        if not rule.operation in self.binops_math:
+            raise ValueError("Invalid math binary operation '{}'".format(rule.operation))
+        (llines, lexpr), (rlines, rexpr) = left, right
+        result = self._temp(kwargs['temps'])
+        name = self._bind(self.evaluate_binop_math, 'm', kwargs['bindings'])
+        return llines + rlines + ['{} = {}({}, {}, {})'.format(result, name, repr(rule.operation), lexpr, rexpr)], result
+
+    def unary_operation(self, rule, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
+        """
+        if not rule.operation in self.unops:
+            raise ValueError("Invalid unary operation '{}'".format(rule.operation))
+        lines, rexpr = right
+        opfn = self.unops[rule.operation]
+        if opfn is BaseFilteringTreeTraverser.unops.get(rule.operation):
+            if rule.operation in ['OP_EXISTS']:
+                return lines, rexpr
+            expression = 'not {}'
+        else:
+            expression = self._bind(opfn, 'u', kwargs['bindings']) + '({})'
+        lines = list(lines)
+        rexpr = self._local(lines, rexpr, kwargs['temps'])
+        result = self._temp(kwargs['temps'])
+        lines.append('{} = None if {} is None else {}'.format(result, rexpr, expression.format(rexpr)))
+        return lines, result
+
+    def function(self, rule, args, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
+        """
+        fname = rule.function
+        try:
+            callback = self.functions[fname]
+        except KeyError:
+            raise FilteringRuleException("Invalid function name '{}'".format(fname))
+        lines = []
+        for alines, _ in args:
+            lines.extend(alines)
+        result = self._temp(kwargs['temps'])
+        name = self._bind(callback, 'f', kwargs['bindings'])
+        lines.append('{} = {}([{}])'.format(result, name, ', '.join([aexpr for _, aexpr in args])))
+        return lines, result
+
+    def conversion(self, rule, result, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.BaseRuleTreeTraverser.conversion` interface.
+        """
+        lines, expression = result
+        result = self._temp(kwargs['temps'])
+        name = self._bind(rule.conversion, 'v', kwargs['bindings'])
+        return lines + ['{} = {}({})'.format(result, name, expression)], result
+
+
+def _is_constant(rule):
+    """
+    Check, whether given rule is constant or list of constants.
+    """
+    if isinstance(rule, ConstantRule):
+        return True
+    if isinstance(rule, ListRule):
+        return all(isinstance(i, ConstantRule) for i in rule.value)
+    return False
+
+def _constant_value(rule):
+    """
+    Return the value of given constant rule as it would be seen during evaluation.
+    """
+    if isinstance(rule, ListRule):
+        return rule.values()
+    return rule.value
+
+
+def _constant_rule(value):
+    """
+    Create constant rule for given value, or return ``None`` for values, that
+    can not be represented by constant rule.
+    """
+    if isinstance(value, bool):
+        return BooleanRule(value)
+    if isinstance(value, datetime.datetime):
+        return DatetimeRule(value)
+    if isinstance(value, datetime.timedelta):
+        return TimedeltaRule(value)
+    if isinstance(value, int):
+        return IntegerRule(value)
+    if isinstance(value, float):
+        return FloatRule(value)
+    return None
+
+
+class BooleanRule(ConstantRule):
+    """
+    Custom rule for boolean constants resulting from constant folding.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        return '{}'.format(self.value)
+
+    def __repr__(self):
+        return "BOOLEAN({})".format(repr(self.value))
+
+
+class FilterOptimizer(BaseFilteringTreeTraverser):
+    """
+    Rule tree traverser implementing optimization of filtering rule trees by
+    constant folding and algebraic simplification.
+
+    By default only transformations preserving the exact result of the evaluation
+    are performed:
+
+    * comparison and math operations with constant operands are calculated
+    * ``exists X`` is replaced with ``X``
+    * ``not C`` with constant operand is calculated
+    * calls of functions without arguments, whose values are given to the optimizer
+      as ``constants`` (like the current time for the duration of the batch),
+      are replaced with these values
+    * constant operands, that do not decide the result of ``and``/``or`` chains,
+      are removed, constant operands deciding the result cut the chain short
+    * repeated operands of ``and``/``or`` chains are removed (except the last one)
+
+    When the result of the rule is going to be used only as a truth value (which is
+    the case of :py:func:`pynspect.filters.DataObjectFilter.filter_many` or
+    :py:class:`pynspect.rulesets.RuleSet`), the ``boolean`` flag of :py:func:`compile`
+    additionally enables:
+
+    * ``not not X`` is replaced with ``X``
+    * any constant operands of ``and``/``or`` chains are removed, duplicate
+      operands are removed entirely, chains reduced to nothing become constants
+
+    Following example demonstrates FilterOptimizer usage in conjuction with
+    PynspectFilterParser and DataObjectFilter::
+
+    >>> flt = DataObjectFilter()
+    >>> opt = FilterOptimizer()
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> rule = psr.parse('1 and ID like "e214d2d9" and ID like "e214d2d9"')
+    >>> rule = opt.compile(rule)
+    >>> result = flt.filter(rule, test_msg)
+    """
+
+    def __init__(self, constants = None):
+        """
+        Initialize the optimizer with optional dictionary of constant function values.
+
+        :param dict constants: Values of functions without arguments, that may be treated as constants.
+        """
+        super(FilterOptimizer, self).__init__()
+        self.constants = constants or {}
+
+    def compile(self, rule, boolean = False):
+        """
+        Optimize given filtering rule. The original rule tree is not modified.
+
+        :param pynspect.rules.Rule rule: filtering rule to be optimized
+        :param bool boolean: result of the rule will be used only as a truth value
+        :return: optimized filtering rule
+        :rtype: pynspect.rules.Rule
+        """
+        rule = rule.traverse(self)
+        if boolean:
+            rule = self._simplify_truth(rule)
+        return rule
+
+    #---------------------------------------------------------------------------
+
+    def _chain_operands(self, rule, decisive):
+        """
+        Return list of operands of chain of logical operations with given decisive
+        value starting at given rule.
+        """
+        if isinstance(rule, LogicalBinOpRule) and self.binops_logical_decisive.get(rule.operation, None) is decisive:
+            return self._chain_operands(rule.left, decisive) + self._chain_operands(rule.right, decisive)
+        return [rule]
+
+    @staticmethod
+    def _simplify_chain(operation, decisive, operands, truth):
+        """
+        Simplify given operands of chain of logical operations with given decisive
+        value and build resulting rule tree.
+        """
+        result = []
+        seen = set()
+        for idx, operand in enumerate(operands):
+            last = idx == len(operands) - 1
+            if _is_constant(operand):
+                if bool(_constant_value(operand)) is decisive:
+                    if truth:
+                        return BooleanRule(decisive)
+                    result.append(operand)
+                    break
+                if truth or not last:
+                    continue
+            if operand in seen and (truth or not last):
+                continue
+            seen.add(operand)
+            result.append(operand)
+
+        if not result:
+            return BooleanRule(not decisive)
+        rule = result[-1]
+        for operand in reversed(result[:-1]):
+            rule = LogicalBinOpRule(operation, operand, rule)
+        return rule
+
+    def _simplify_truth(self, rule):
+        """
+        Simplify given rule, whose result is going to be used only as a truth value.
+        """
+        if _is_constant(rule):
+            return BooleanRule(bool(_constant_value(rule)))
+        if isinstance(rule, LogicalBinOpRule):
+            if rule.operation in self.binops_logical_decisive:
+                decisive = self.binops_logical_decisive[rule.operation]
+                operands = []
+                for operand in self._chain_operands(rule, decisive):
+                    operands.extend(self._chain_operands(self._simplify_truth(operand), decisive))
+                return self._simplify_chain(rule.operation, decisive, operands, True)
+            return LogicalBinOpRule(rule.operation, self._simplify_truth(rule.left), self._simplify_truth(rule.right))
+        if isinstance(rule, UnaryOperationRule) and rule.operation == 'OP_NOT':
+            if isinstance(rule.right, UnaryOperationRule) and rule.right.operation == 'OP_NOT':
+                return self._simplify_truth(rule.right.right)
+        return rule
+
+    #---------------------------------------------------------------------------
+
+    def ipv4(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
+        """
+        return rule
+
+    def ipv6(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
+        """
+        return rule
+
+    def datetime(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
+        """
+        return rule
+
+    def timedelta(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
+        """
+        return rule
+
+    def integer(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
+        """
+        return rule
+
+    def float(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
+        """
+        return rule
+
+    def constant(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
+        """
+        return rule
+
+    def variable(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
+        """
+        return rule
+
+    def list(self, rule, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
+        """
+        return rule
+
+    def binary_operation_logical(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
+        """
+        if rule.operation in self.binops_logical_decisive:
+            decisive = self.binops_logical_decisive[rule.operation]
+            operands = self._chain_operands(left, decisive) + self._chain_operands(right, decisive)
+            return self._simplify_chain(rule.operation, decisive, operands, False)
+        if _is_constant(left):
+            if _is_constant(right):
+                result = self.evaluate_binop_logical(rule.operation, _constant_value(left), _constant_value(right))
+                if isinstance(result, bool):
+                    return BooleanRule(result)
+            elif not _constant_value(left):
+                return right
+        return LogicalBinOpRule(rule.operation, left, right)
+
+    def binary_operation_comparison(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
+        """
+        if _is_constant(left) and _is_constant(right):
+            try:
+                result = self.evaluate_binop_comparison(rule.operation, _constant_value(left), _constant_value(right))
+                if isinstance(result, bool):
+                    return BooleanRule(result)
+            except Exception:  # pylint: disable=locally-disabled,broad-except
+                pass
+        return ComparisonBinOpRule(rule.operation, left, right)
+
+    def binary_operation_math(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
+        """
+        if isinstance(left, NumberRule) and isinstance(right, NumberRule):
+            result = self.evaluate_binop_math(rule.operation, left.value, right.value)
+            if isinstance(result, int) and not isinstance(result, bool):
+                return IntegerRule(result)
+            if isinstance(result, float):
+                return FloatRule(result)
+        if isinstance(left, (DatetimeRule, TimedeltaRule)) and isinstance(right, (DatetimeRule, TimedeltaRule)):
+            result = self.evaluate_binop_math(rule.operation, left.value, right.value)
+            if isinstance(result, (datetime.datetime, datetime.timedelta)):
+                return _constant_rule(result)
+        return MathBinOpRule(rule.operation, left, right)
+
+    def unary_operation(self, rule, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
+        """
+        if rule.operation == 'OP_EXISTS':
+            return right
+        if rule.operation == 'OP_NOT' and _is_constant(right) and _constant_value(right) is not None:
+            return BooleanRule(not _constant_value(right))
+        return UnaryOperationRule(rule.operation, right)
+
+    def function(self, rule, args, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
+        """
+        if not args and rule.function in self.constants:
+            constant = _constant_rule(self.constants[rule.function])
+            if constant is not None:
+                return constant
+        return FunctionRule(rule.function, *args)
+
+    def conversion(self, rule, result, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.BaseRuleTreeTraverser.conversion` interface.
+        """
+        return ConversionRule(rule.conversion, result)
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    DEMO_DATA     = {"Test": 15, "Attr": "ABC"}
+    DEMO_RULE     = ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10))
+    DEMO_COMPILER = IDEAFilterCompiler()
+    pprint.pprint(DEMO_COMPILER.compile(DEMO_RULE))
+
+    DEMO_CLOSURE = ClosureFilterCompiler().compile(DEMO_RULE)
+    pprint.pprint(DEMO_CLOSURE(DEMO_DATA))
+
+    DEMO_ADAPTIVE = AdaptiveFilterCompiler(interval = 1, sample = 1).compile(LogicalBinOpRule('OP_AND', DEMO_RULE, VariableRule("Attr")))
+    pprint.pprint(DEMO_ADAPTIVE(DEMO_DATA))
+    pprint.pprint(DEMO_ADAPTIVE.statistics())
+
+    DEMO_FUNCTION = SourceFilterCompiler().compile(DEMO_RULE)
+    print(DEMO_FUNCTION.source)
+    pprint.pprint(DEMO_FUNCTION(DEMO_DATA))
+
+    DEMO_OPTIMIZER = FilterOptimizer()
+    pprint.pprint(DEMO_OPTIMIZER.compile(LogicalBinOpRule('OP_AND', IntegerRule(1), DEMO_RULE)))
@@ -40,6 +40,15 @@ There are following main tools in this package:
 
   Tool capable of filtering data structures according to given filtering rules.
 
+* :py:class:`EvaluationClock`
+
+  Snapshot of current time shared by all time related filtering functions of
+  the filter for the duration of single evaluation or batch.
+
+* :py:class:`RuleCache`
+
+  Bounded thread-safe LRU cache of rules parsed and compiled by the filter.
+
 
 Available filtering functions
 ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -63,6 +72,12 @@ Available filtering functions
 
         DetectTime < (utcnow() - 02:00:00)
 
+Both time related functions read the current time from the :py:class:`EvaluationClock`
+of the filter, so they return the same value for all evaluations within single
+:py:func:`DataObjectFilter.filter` call or batch. In batches these functions are
+replaced with constants before compilation, so that the rule above is reduced
+to single comparison with precomputed threshold.
+
 
 Example filters
 ^^^^^^^^^^^^^^^
@@ -97,10 +112,14 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 import time
 import datetime
+import threading
+import collections
 
 from pynspect.rules import FilteringRuleException
 from pynspect.traversers import BaseFilteringTreeTraverser
 from pynspect.jpath import jpath_values
+from pynspect.compilers import ClosureFilterCompiler, AdaptiveFilterCompiler,\
+    FilterOptimizer
 
 
 #-------------------------------------------------------------------------------
@@ -161,6 +180,246 @@ def grfcbk_utcnow(args):
 #-------------------------------------------------------------------------------
 
 
+#: Beginning of the Unix epoch as naive datetime in UTC timezone.
+_UNIX_EPOCH = datetime.datetime(1970, 1, 1)
+
+#: Monotonic clock used for checking the age of time snapshots.
+_MONOTONIC = getattr(time, 'monotonic', time.time)
+
+#: Types of rule strings, that may be cached.
+_STRING_TYPES = (str, type(u''))
+
+
+class EvaluationClock(object):
+    """
+    Evaluation context clock providing snapshot of current time to the time
+    related filtering functions.
+
+    Snapshot of single evaluation is stored in the evaluation ``memo`` passed
+    to :py:func:`now`, so that all reads within that evaluation return the same
+    snapshot, while concurrent evaluations in other threads never affect each
+    other. Without ``granularity`` each evaluation captures its own snapshot
+    and reads outside of any evaluation return current time. With ``granularity``
+    the snapshot is kept for given number of seconds regardless of evaluations,
+    so that the time is not retrieved again for each data structure.
+
+    >>> clock = EvaluationClock(granularity = 1.0)
+    >>> flt = DataObjectFilter(clock = clock)
+    """
+
+    def __init__(self, granularity = None):
+        """
+        Initialize the clock with optional granularity.
+
+        :param float granularity: Maximal age of the snapshot in seconds.
+        """
+        self.granularity = granularity
+        self._state = None
+
+    def expired(self):
+        """
+        Check, whether the current snapshot is too old to be used.
+
+        :return: ``True`` in case the next read would capture new snapshot.
+        :rtype: bool
+        """
+        state = self._state
+        if state is None or self.granularity is None:
+            return True
+        return _MONOTONIC() >= state[1]
+
+    def tick(self):
+        """
+        Capture new snapshot of current time. With ``granularity`` the snapshot
+        is kept together with its expiration time as single tuple, so that it is
+        replaced atomically.
+
+        :return: Tuple of Unix timestamp and corresponding datetime in UTC timezone.
+        :rtype: tuple
+        """
+        now = time.time()
+        snapshot = (now, _UNIX_EPOCH + datetime.timedelta(seconds = now))
+        if self.granularity is not None:
+            self._state = (snapshot, _MONOTONIC() + self.granularity)
+        return snapshot
+
+    def now(self, memo = None):
+        """
+        Return current snapshot, capture new one when necessary. When ``memo``
+        of single evaluation is given, the snapshot is stored within it under
+        the clock itself as the key and returned by all subsequent reads.
+
+        :param dict memo: Memoization dictionary of single evaluation.
+        :return: Tuple of Unix timestamp and corresponding datetime in UTC timezone.
+        :rtype: tuple
+        """
+        if memo is not None:
+            snapshot = memo.get(self)
+            if snapshot is None:
+                snapshot = memo[self] = self.now()
+            return snapshot
+        if self.expired():
+            return self.tick()
+        return self._state[0]
+
+    def grfcbk_time(self, args, memo = None):
+        """
+        Grammar rule function callback: **time**. Clock based variant of
+        :py:func:`pynspect.filters.grfcbk_time`.
+
+        :param list args: List of function arguments. Should be empty.
+        :param dict memo: Memoization dictionary of single evaluation.
+        :return: The time in seconds since the epoch as a floating point number.
+        :rtype: float
+        """
+        if args:
+            raise FilteringRuleException("The 'time' function does not take any arguments.")
+        return self.now(memo)[0]
+
+    def grfcbk_utcnow(self, args, memo = None):
+        """
+        Grammar rule function callback: **utcnow**. Clock based variant of
+        :py:func:`pynspect.filters.grfcbk_utcnow`.
+
+        :param list args: List of function arguments. Should be empty.
+        :param dict memo: Memoization dictionary of single evaluation.
+        :return: Current datetime in UTC timezone.
+        :rtype: datetime.datetime
+        """
+        if args:
+            raise FilteringRuleException("The 'utcnow' function does not take any arguments.")
+        return self.now(memo)[1]
+
+
+#-------------------------------------------------------------------------------
+
+
+class RuleCache(object):
+    """
+    Bounded thread-safe cache of rule trees prepared by :py:func:`DataObjectFilter.prepare`,
+    that evicts the least recently used entries. Entries are keyed by the rule
+    string together with the classes of the parser and compiler and the coercion
+    flag of the compiler, so that single cache may be shared by multiple filters,
+    including filters created per request. Filters sharing the cache must not
+    otherwise configure their parsers and compilers differently.
+
+    >>> cache = RuleCache(maxsize = 512)
+    >>> flt = DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler, cache = cache)
+
+    Cached rule trees are shared by all callers and must not be modified.
+    """
+
+    def __init__(self, maxsize = 1024):
+        """
+        Initialize the cache with given maximal number of entries.
+
+        :param int maxsize: Maximal number of cached rule trees.
+        """
+        if maxsize < 1:
+            raise ValueError("Maximal size of the rule cache must be positive")
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, factory):
+        """
+        Return rule tree cached under given key, or create it with given factory
+        and cache it. The factory is called without holding the lock, so that slow
+        preparation does not block other threads. Errors are not cached.
+
+        :param tuple key: Key of the cache entry.
+        :param callable factory: Function preparing the rule tree.
+        :return: Cached rule tree.
+        :rtype: pynspect.rules.Rule
+        """
+        with self._lock:
+            try:
+                rule = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries[key] = rule
+                self.hits += 1
+                return rule
+
+        rule = factory()
+
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = rule
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last = False)
+                self.evictions += 1
+        return rule
+
+    def invalidate(self, rule):
+        """
+        Remove all entries for given rule string regardless of the parser and
+        compiler.
+
+        :param str rule: Filtering rule string.
+        :return: Number of removed entries.
+        :rtype: int
+        """
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == rule]
+            for key in keys:
+                del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Return statistics of the cache.
+
+        :return: Dictionary with number of entries, maximal size, hits, misses and evictions.
+        :rtype: dict
+        """
+        with self._lock:
+            return {
+                'size':      len(self._entries),
+                'maxsize':   self.maxsize,
+                'hits':      self.hits,
+                'misses':    self.misses,
+                'evictions': self.evictions,
+            }
+
+
+#: Operation tables, that define the evaluation of rules by :py:class:`DataObjectFilter`.
+_EVALUATION_TABLES = ('binops_logical', 'binops_logical_decisive', 'binops_comparison', 'binops_math', 'unops')
+
+#: Methods, that define the evaluation of rules by :py:class:`DataObjectFilter`.
+_EVALUATION_METHODS = (
+    'ipv4', 'ipv6', 'datetime', 'timedelta', 'integer', 'float', 'constant',
+    'variable', 'list', 'binary_operation_logical', 'binary_operation_logical_lazy',
+    'binary_operation_comparison', 'binary_operation_math', 'unary_operation',
+    'function', 'conversion', 'evaluate_binop_logical', 'is_decided_binop_logical',
+    'evaluate_binop_comparison', 'evaluate_binop_math', 'evaluate_unop',
+)
+
+
+def _overrides(flt, name):
+    """
+    Check, whether the class of given filter overrides given method of
+    :py:class:`DataObjectFilter`.
+    """
+    method = getattr(flt.__class__, name)
+    default = getattr(DataObjectFilter, name)
+    return getattr(method, '__func__', method) is not getattr(default, '__func__', default)
+
+
 class DataObjectFilter(BaseFilteringTreeTraverser):
     """
     Rule tree traverser implementing  default object filtering logic.
@@ -187,15 +446,43 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
 
     >>> rule = ComparisonBinOpRule('OP_GT', VariableRule("ConnCount"), IntegerRule(1))
     >>> result = flt.filter(rule, test_msg)
+
+    Whole batches of messages can be filtered with single rule at once:
+
+    >>> results = flt.filter_many(rule, [test_msg, test_msg])
+    >>> matching = flt.filter_many(rule, [test_msg, test_msg], matches = True)
+
+    Time related functions read the current time from the :py:class:`EvaluationClock`
+    of the filter, which may be given to refresh the time only at given granularity:
+
+    >>> flt = DataObjectFilter(clock = EvaluationClock(granularity = 1.0))
+
+    Rules prepared repeatedly from the same strings may be cached by :py:class:`RuleCache`:
+
+    >>> flt = DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler, cache = RuleCache())
+
+    Logical operations are evaluated with short-circuit, the right operand is
+    not evaluated at all, when the left one decides the result. For subclasses
+    overriding :py:func:`binary_operation_logical` (but not :py:func:`binary_operation_logical_lazy`)
+    the short-circuit is disabled, so that they receive both operands evaluated.
     """
 
-    def __init__(self, parser = None, compiler = None):
+    short_circuit = True
+
+    def __init__(self, parser = None, compiler = None, clock = None, cache = None):
         super(DataObjectFilter, self).__init__()
 
+        # Overridden evaluation of logical operations must not be bypassed.
+        if _overrides(self, 'binary_operation_logical') and not _overrides(self, 'binary_operation_logical_lazy'):
+            self.short_circuit = False
+
+        self.clock = clock or EvaluationClock()
+        self.cache = cache
+
         self.register_function('size',   grfcbk_size)
         self.register_function('strlen', grfcbk_strlen)
-        self.register_function('time',   grfcbk_time)
-        self.register_function('utcnow', grfcbk_utcnow)
+        self.register_function('time',   self.clock.grfcbk_time)
+        self.register_function('utcnow', self.clock.grfcbk_utcnow)
 
         self.parser   = parser
         self.compiler = compiler
@@ -210,9 +497,24 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
         """
         Parse and/or compile given rule into rule tree.
 
+        With :py:class:`RuleCache` given to the filter, rule strings are prepared
+        only once and the shared cached rule tree is returned, even to other filters
+        with the same configuration.
+
         :param rule: Filtering grammar rule.
         :return: Parsed and/or compiled rule.
         """
+        if self.cache is not None and isinstance(rule, _STRING_TYPES):
+            return self.cache.get(
+                (rule, type(self.parser), type(self.compiler), getattr(self.compiler, 'coercion', None)),
+                lambda: self._prepare(rule)
+            )
+        return self._prepare(rule)
+
+    def _prepare(self, rule):
+        """
+        Parse and/or compile given rule into rule tree without caching.
+        """
         if self.parser:
             rule = self.parser.parse(rule)
         if self.compiler:
@@ -221,14 +523,134 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
 
     def filter(self, rule, data):
         """
-        Apply given filtering rule to given data structure.
+        Apply given filtering rule to given data structure. Values of variables
+        are retrieved only once per call, even if the same JPath is referenced
+        multiple times within the rule, as is the current time.
 
         :param pynspect.rules.Rule rule: filtering rule to be checked
         :param any data: data structure to check against rule, ussually dict
         :return: True or False or expression result
         :rtype: bool or any
         """
-        return rule.traverse(self, obj = data)
+        return rule.traverse(self, obj = data, memo = {})
+
+    def filter_many(self, rule, messages, matches = False, adaptive = False):
+        """
+        Apply given filtering rule to all data structures in given iterable.
+
+        The rule is compiled only once for the whole batch by :py:class:`pynspect.compilers.ClosureFilterCompiler`,
+        so that the rule tree traversal, operation and function lookups are not
+        repeated for each message. Because only the truth value of the result is
+        used, the rule is first simplified by :py:class:`pynspect.compilers.FilterOptimizer`.
+        Functions ``time`` and ``utcnow`` are evaluated only once at the beginning
+        of the batch and replaced with constants, so that any math with them is
+        precomputed. With clock having granularity the rule is compiled again
+        whenever the snapshot of the time expires. With ``adaptive`` flag the rule is compiled by
+        :py:class:`pynspect.compilers.AdaptiveFilterCompiler` instead, so that
+        operands of ``and``/``or`` chains are reordered according to their
+        selectivity and cost measured on the batch. Filters customizing the
+        evaluation can not be compiled and the rule is evaluated by :py:func:`filter`
+        for each message instead, see :py:func:`compile_rule`.
+
+        :param pynspect.rules.Rule rule: filtering rule to be checked
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: return list of matching messages instead of list of booleans
+        :param bool adaptive: reorder logical operands according to runtime statistics
+        :return: List of booleans (one for each message) or list of matching messages
+        :rtype: list
+        """
+        return list(self.ifilter_many(rule, messages, matches, adaptive))
+
+    def ifilter_many(self, rule, messages, matches = False, adaptive = False):
+        """
+        Generator variant of :py:func:`filter_many` method. The rule is compiled
+        when the first message is requested.
+
+        :param pynspect.rules.Rule rule: filtering rule to be checked
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: yield only matching messages instead of booleans
+        :param bool adaptive: reorder logical operands according to runtime statistics
+        :return: Generator of booleans (one for each message) or of matching messages
+        :rtype: generator
+        """
+        evaluate = self.compile_rule(rule, adaptive)
+        if matches:
+            for data in messages:
+                if evaluate(data):
+                    yield data
+        else:
+            for data in messages:
+                yield bool(evaluate(data))
+
+    def compile_rule(self, rule, adaptive = False, snapshot = True):
+        """
+        Compile given rule into function taking single data structure, whose
+        result has the same truth value as the result of :py:func:`filter`. This
+        is the compilation used by :py:func:`filter_many`, see its documentation
+        for details. Without ``snapshot`` flag the time related functions are
+        not replaced with constants and read the clock on each evaluation, which
+        is appropriate for long running evaluation of streams.
+
+        Compilers know only the default evaluation, so for filters overriding any
+        of the evaluation methods or operation tables of :py:class:`DataObjectFilter`
+        the returned function simply calls :py:func:`filter`.
+
+        :param pynspect.rules.Rule rule: filtering rule to be compiled
+        :param bool adaptive: reorder logical operands according to runtime statistics
+        :param bool snapshot: replace time related functions with the snapshot of the clock
+        :return: Function evaluating the rule for given data structure.
+        :rtype: callable
+        """
+        if self._customized():
+            def evaluate(data):
+                return self.filter(rule, data)
+            return evaluate
+        evaluate = self._compile_batch(rule, adaptive, snapshot)
+        if snapshot and self.clock.granularity is not None:
+            evaluate = self._refreshing(evaluate, rule, adaptive)
+        return evaluate
+
+    def _customized(self):
+        """
+        Check, whether the evaluation of this filter differs from the default one.
+        """
+        for name in _EVALUATION_TABLES:
+            if getattr(self, name) is not getattr(DataObjectFilter, name):
+                return True
+        for name in _EVALUATION_METHODS:
+            if _overrides(self, name):
+                return True
+        return not self.short_circuit
+
+    def _compile_batch(self, rule, adaptive, snapshot = True):
+        """
+        Compile given rule for batch filtering, optionally with default time related
+        functions replaced with the current snapshot of the clock.
+        """
+        constants = {}
+        if snapshot:
+            now = self.clock.now()
+            if self.functions.get('time') in (grfcbk_time, self.clock.grfcbk_time):
+                constants['time'] = now[0]
+            if self.functions.get('utcnow') in (grfcbk_utcnow, self.clock.grfcbk_utcnow):
+                constants['utcnow'] = now[1]
+        rule = FilterOptimizer(constants).compile(rule, boolean = True)
+        if adaptive:
+            return AdaptiveFilterCompiler(self.functions).compile(rule)
+        return ClosureFilterCompiler(self.functions).compile(rule)
+
+    def _refreshing(self, evaluate, rule, adaptive):
+        """
+        Wrap given compiled rule into closure, that compiles the rule again
+        whenever the snapshot of the clock expires.
+        """
+        clock = self.clock
+        current = [evaluate]
+        def refreshing(data):
+            if clock.expired():
+                current[0] = self._compile_batch(rule, adaptive)
+            return current[0](data)
+        return refreshing
 
     #---------------------------------------------------------------------------
 
@@ -278,7 +700,13 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
         """
-        return jpath_values(kwargs['obj'], rule.value)
+        memo = kwargs.get('memo')
+        if memo is None:
+            return jpath_values(kwargs['obj'], rule.value)
+        values = memo.get(rule.value)
+        if values is None:
+            values = memo[rule.value] = jpath_values(kwargs['obj'], rule.value)
+        return values
 
     def list(self, rule, **kwargs):
         """
@@ -292,6 +720,16 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
         """
         return self.evaluate_binop_logical(rule.operation, left, right, **kwargs)
 
+    def binary_operation_logical_lazy(self, rule, left, right, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical_lazy` interface.
+        The right subtree is traversed only when the left operand does not decide
+        the result of the operation by itself.
+        """
+        if self.is_decided_binop_logical(rule.operation, left):
+            return left
+        return self.evaluate_binop_logical(rule.operation, left, right.traverse(self, **kwargs), **kwargs)
+
     def binary_operation_comparison(self, rule, left, right, **kwargs):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
@@ -310,6 +748,18 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
         """
         return self.evaluate_unop(rule.operation, right, **kwargs)
 
+    def function(self, rule, args, **kwargs):
+        """
+        Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
+        Time related functions of the clock read the snapshot stored in the
+        ``memo`` of current evaluation.
+        """
+        memo = kwargs.get('memo')
+        callback = self.functions.get(rule.function)
+        if memo is not None and getattr(callback, '__self__', None) is self.clock:
+            return callback(args, memo = memo)
+        return super(DataObjectFilter, self).function(rule, args, **kwargs)
+
 
 #-------------------------------------------------------------------------------
 
@@ -327,3 +777,4 @@ if __name__ == "__main__":
     DEMO_RULE   = ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10))
     DEMO_FILTER = DataObjectFilter()
     pprint.pprint(DEMO_FILTER.filter(DEMO_RULE, DEMO_DATA))
+    pprint.pprint(DEMO_FILTER.filter_many(DEMO_RULE, [DEMO_DATA, {"Test": 5}]))
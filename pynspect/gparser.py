@@ -144,6 +144,14 @@ Currently implemented grammar
          | VARIABLE COMMA list
          | CONSTANT COMMA list
 
+Alternative parser
+^^^^^^^^^^^^^^^^^^
+
+Besides the *PLY* based :py:class:`PynspectFilterParser` this module provides
+hand-written :py:class:`PynspectFilterDescentParser` with the same interface,
+which produces identical rule trees and syntax errors, but avoids the overhead
+of *PLY* lexer and grammar rule callbacks and is therefore faster for bulk parsing.
+
 .. note::
 
     Implementation of this module is very *PLY* specific, please read the
@@ -161,21 +169,41 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import os
+import copy
 import logging
+import threading
+import ply.lex
 import ply.yacc
 
-from pynspect.lexer import PynspectFilterLexer
+from pynspect.lexer import PynspectFilterLexer, LEXTAB, tokenize, token_str
 from pynspect.rules import IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule,\
     IntegerRule, FloatRule, VariableRule, ConstantRule, LogicalBinOpRule,\
     UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, FunctionRule,\
     ListRule
 
 
+#: Name of the module with pregenerated parser tables shipped within the package.
+PARSETAB = 'pynspect.parsetab'
+
+#
+# Parser objects with tables shared by all instances of given parser class within
+# the process, see :py:func:`PynspectFilterParser.build`. These objects are only
+# templates, they are never used for parsing directly.
+#
+_PARSERS = {}
+_PARSERS_LOCK = threading.Lock()
+
+
 class PynspectGrammarSyntaxError(Exception):
     """
-    Custom expression representing Pynspect grammar syntax error.
+    Custom expression representing Pynspect grammar syntax error. Offset of the
+    offending token within the parsed data is available as :py:attr:`position`
+    attribute, it is ``None`` for unexpected end of data.
     """
-    pass
+    def __init__(self, message, position = None):
+        super(PynspectGrammarSyntaxError, self).__init__(message)
+        self.position = position
 
 
 class PynspectFilterParser(object):
@@ -189,15 +217,31 @@ class PynspectFilterParser(object):
         self.lexer  = None
         self.tokens = None
         self.parser = None
+        self._lock  = threading.Lock()
 
-    def build(self):
+    def build(self, optimize = True):
         """
-        Build/rebuild the parser object
+        Build/rebuild the parser object.
+
+        Parsing tables are built only once per process for each parser class
+        and optimization mode and shared by all instances. *PLY* parser object
+        keeps the state of running parse in its attributes and is not re-entrant,
+        so each instance gets its own shallow copy of the shared parser object
+        (and its own lexer). Grammar rule callbacks are bound to the instance,
+        that built the tables first, so they must not use any instance state. In optimize mode
+        the tables are loaded from pregenerated :py:data:`PARSETAB` module without
+        checking the grammar signature, otherwise they are regenerated in memory
+        whenever the signature does not match. Table or debug files are never
+        written. Subclasses altering the grammar must be built with ``optimize``
+        disabled. Calling this method is optional, parser is built on first
+        :py:func:`parse` call.
+
+        :param bool optimize: Use pregenerated parser and lexer tables.
         """
         self.logger = logging.getLogger('ply_parser')
 
         self.lexer = PynspectFilterLexer()
-        self.lexer.build()
+        self.lexer.build(optimize = optimize)
 
         # Skip the first item in self.lexer.tokens, which is the 'EXP_ALL' token
         # to get rid of following message:
@@ -206,19 +250,26 @@ class PynspectFilterParser(object):
         #
         self.tokens = self.lexer.tokens[1:]
 
-        self.parser = ply.yacc.yacc(
-            module=self,
-            #debuglog=self.logger,
-            errorlog=self.logger
-            #start='statements',
-            #debug=yacc_debug,
-            #optimize=yacc_optimize,
-            #tabmodule=yacctab
-        )
+        key = (self.__class__, bool(optimize))
+        with _PARSERS_LOCK:
+            parser = _PARSERS.get(key)
+            if parser is None:
+                parser = _PARSERS[key] = ply.yacc.yacc(
+                    module=self,
+                    errorlog=self.logger,
+                    tabmodule=PARSETAB,
+                    optimize=optimize,
+                    debug=False,
+                    write_tables=False
+                )
+        self.parser = copy.copy(parser)
 
     def parse(self, data, filename='', debuglevel=0):
         """
-        Parse given data.
+        Parse given data. Concurrent calls of this method on the same instance
+        (for example the parser of filter shared by multiple threads) are
+        serialized by internal lock, because both lexer and parser keep the
+        state of running parse.
 
             data:
                 A string containing the filter definition
@@ -228,11 +279,14 @@ class PynspectFilterParser(object):
             debuglevel:
                 Debug level to yacc
         """
-        self.lexer.filename = filename
-        self.lexer.reset_lineno()
         if not data or data.isspace():
             return []
-        return self.parser.parse(data, lexer=self.lexer, debug=debuglevel)
+        with self._lock:
+            if self.parser is None:
+                self.build()
+            self.lexer.filename = filename
+            self.lexer.reset_lineno()
+            return self.parser.parse(data, lexer=self.lexer, debug=debuglevel)
 
 
     #---------------------------------------------------------------------------
@@ -420,11 +474,263 @@ class PynspectFilterParser(object):
     @staticmethod
     def p_error(tok):
         if tok:
-            raise PynspectGrammarSyntaxError("Syntax error at '%s'" % str(tok))
+            raise PynspectGrammarSyntaxError("Syntax error at '%s'" % str(tok), tok.lexpos)
         else:
             raise PynspectGrammarSyntaxError("Syntax error while parsing the grammar rule")
 
 
+#-------------------------------------------------------------------------------
+
+
+#: Precedence levels of binary operations, operations of the same level are right associative.
+_BINOP_LEVELS = {
+    'OP_OR':     1,
+    'OP_XOR':    2,
+    'OP_AND':    3,
+    'OP_OR_P':   4,
+    'OP_XOR_P':  5,
+    'OP_AND_P':  6,
+    'OP_LIKE':   7,
+    'OP_IN':     7,
+    'OP_IS':     7,
+    'OP_EQ':     7,
+    'OP_NE':     7,
+    'OP_GT':     7,
+    'OP_GE':     7,
+    'OP_LT':     7,
+    'OP_LE':     7,
+    'OP_PLUS':   8,
+    'OP_MINUS':  8,
+    'OP_TIMES':  8,
+    'OP_DIVIDE': 8,
+    'OP_MODULO': 8,
+}
+
+#: Precedence level of comparison operations, operands of lower levels may be unary operations.
+_CMP_LEVEL = 7
+
+#: Rule classes of binary operations indexed by precedence level.
+_BINOP_RULES = {
+    1: LogicalBinOpRule,
+    2: LogicalBinOpRule,
+    3: LogicalBinOpRule,
+    4: LogicalBinOpRule,
+    5: LogicalBinOpRule,
+    6: LogicalBinOpRule,
+    7: ComparisonBinOpRule,
+    8: MathBinOpRule,
+}
+
+#: Rule classes of factor tokens.
+_FACTOR_RULES = {
+    'IPV4':      IPV4Rule,
+    'IPV6':      IPV6Rule,
+    'DATETIME':  DatetimeRule,
+    'TIMEDELTA': TimedeltaRule,
+    'INTEGER':   IntegerRule,
+    'FLOAT':     FloatRule,
+    'VARIABLE':  VariableRule,
+    'CONSTANT':  ConstantRule,
+}
+
+
+#: Token marking the end of data.
+_END = (None, None, None)
+
+
+class PynspectFilterDescentParser(object):
+    """
+    Hand-written recursive descent parser for the filtering and query language
+    grammar with the interface of :py:class:`PynspectFilterParser`. It produces
+    identical rule trees and raises identical syntax errors. Data are tokenized
+    by :py:func:`pynspect.lexer.tokenize` and binary operations are parsed by
+    precedence climbing, so there is single function call per operand instead
+    of one grammar rule callback per precedence level.
+    """
+
+    def __init__(self):
+        self._data   = None
+        self._tokens = None
+        self._pos    = 0
+
+    def build(self, optimize = True):  # pylint: disable=locally-disabled,unused-argument
+        """
+        Build/rebuild the parser object. There is nothing to build, this method
+        is present for interface compatibility.
+
+        :param bool optimize: Ignored.
+        """
+        pass
+
+    def parse(self, data, filename='', debuglevel=0):  # pylint: disable=locally-disabled,unused-argument
+        """
+        Parse given data.
+
+            data:
+                A string containing the filter definition
+            filename:
+                Ignored, present for interface compatibility
+            debuglevel:
+                Ignored, present for interface compatibility
+        """
+        if not data or data.isspace():
+            return []
+
+        self._data   = data
+        self._tokens = tokenize(data)
+        self._tokens.append(_END)
+        self._pos = 0
+        try:
+            result = self._binop(1)
+            if self._tokens[self._pos] is not _END:
+                self._error()
+            return result
+        finally:
+            self._data   = None
+            self._tokens = None
+
+    def _error(self):
+        """
+        Raise syntax error for current token.
+        """
+        tok = self._tokens[self._pos]
+        if tok is _END:
+            raise PynspectGrammarSyntaxError("Syntax error while parsing the grammar rule")
+        raise PynspectGrammarSyntaxError("Syntax error at '%s'" % token_str(tok, self._data), tok[2])
+
+    def _binop(self, level):
+        """
+        Parse chain of binary operations of given or higher precedence level.
+        """
+        if level < _CMP_LEVEL:
+            left = self._unop()
+        else:
+            left = self._factor()
+        tok = self._tokens[self._pos]
+        while True:
+            oplevel = _BINOP_LEVELS.get(tok[0])
+            if oplevel is None or oplevel < level:
+                break
+            self._pos += 1
+            left = _BINOP_RULES[oplevel](tok[1], left, self._binop(oplevel))
+            tok = self._tokens[self._pos]
+        return left
+
+    def _unop(self):
+        """
+        Parse optional ``OP_NOT`` and ``OP_EXISTS`` operations.
+        """
+        tok = self._tokens[self._pos]
+        if tok[0] == 'OP_NOT':
+            self._pos += 1
+            return UnaryOperationRule(tok[1], self._exists())
+        return self._exists()
+
+    def _exists(self):
+        """
+        Parse optional ``OP_EXISTS`` operation.
+        """
+        tok = self._tokens[self._pos]
+        if tok[0] == 'OP_EXISTS':
+            self._pos += 1
+            return UnaryOperationRule(tok[1], self._binop(_CMP_LEVEL))
+        return self._binop(_CMP_LEVEL)
+
+    def _expect(self, toktype):
+        """
+        Consume token of given type.
+        """
+        tok = self._tokens[self._pos]
+        if tok[0] != toktype:
+            self._error()
+        self._pos += 1
+
+    def _factor(self):
+        """
+        Parse single factor.
+        """
+        tok = self._tokens[self._pos]
+        toktype = tok[0]
+        if toktype in _FACTOR_RULES:
+            self._pos += 1
+            return _FACTOR_RULES[toktype](tok[1])
+        if toktype == 'FUNCTION':
+            self._pos += 1
+            nxt = self._tokens[self._pos]
+            if nxt[0] == 'RPAREN':
+                self._pos += 1
+                return FunctionRule(tok[1])
+            args = self._binop(1)
+            self._expect('RPAREN')
+            return FunctionRule(tok[1], args)
+        if toktype == 'LPAREN':
+            self._pos += 1
+            result = self._binop(1)
+            self._expect('RPAREN')
+            return result
+        if toktype == 'LBRACK':
+            self._pos += 1
+            result = ListRule(self._list())
+            self._expect('RBRACK')
+            return result
+        return self._error()
+
+    def _list(self):
+        """
+        Parse comma separated list of factor tokens.
+        """
+        items = []
+        while True:
+            tok = self._tokens[self._pos]
+            if tok[0] not in _FACTOR_RULES:
+                self._error()
+            items.append(_FACTOR_RULES[tok[0]](tok[1]))
+            self._pos += 1
+            nxt = self._tokens[self._pos]
+            if nxt[0] != 'COMMA':
+                return items
+            self._pos += 1
+
+
+#-------------------------------------------------------------------------------
+
+
+def write_tables(outputdir = None):
+    """
+    Generate lexer and parser tables into given directory. The tables are always
+    regenerated from the token and grammar rules, so this function must be called
+    whenever these rules change. Generated modules are :py:data:`pynspect.lexer.LEXTAB`
+    and :py:data:`PARSETAB`.
+
+    :param str outputdir: Target directory, defaults to the directory of this package.
+    """
+    if outputdir is None:
+        outputdir = os.path.dirname(os.path.abspath(__file__))
+
+    lexer = PynspectFilterLexer()
+    ply.lex.lex(module=lexer).writetab(LEXTAB, outputdir)
+
+    # Following lines reproduce the table generation part of ply.yacc.yacc(),
+    # which would use any importable tables with matching signature instead.
+    parser = PynspectFilterParser()
+    parser.tokens = lexer.tokens[1:]
+    pdict = dict((name, getattr(parser, name)) for name in dir(parser))
+    pdict['__file__'] = __file__
+    pinfo = ply.yacc.ParserReflect(pdict, log=logging.getLogger('ply_parser'))
+    pinfo.get_all()
+    if pinfo.error or pinfo.validate_all():
+        raise ply.yacc.YaccError('Unable to build parser')
+
+    grammar = ply.yacc.Grammar(pinfo.tokens)
+    for term, assoc, level in pinfo.preclist:
+        grammar.set_precedence(term, assoc, level)
+    for funcname, (fname, line, prodname, syms) in pinfo.grammar:
+        grammar.add_production(prodname, syms, funcname, fname, line)
+    grammar.set_start(pinfo.start)
+
+    ply.yacc.LRGeneratedTable(grammar).write_table(PARSETAB, outputdir, pinfo.signature())
+
+
 #
 # Perform the demonstration.
 #
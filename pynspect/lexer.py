@@ -69,6 +69,19 @@ Currently recognized grammar tokens
     FUNCTION  = r'[_a-zA-Z][_a-zA-Z0-9]{2,}\('
     VARIABLE  = r'[_a-zA-Z][-_a-zA-Z0-9]*(?:\[(?:\d+|-\d+|\#)\])?(?:\.?[a-zA-Z][-_a-zA-Z0-9]*(?:\[(?:\d+|-\d+|\#)\])?)*'
 
+Fast tokenizer
+^^^^^^^^^^^^^^
+
+Besides the *PLY* based :py:class:`PynspectFilterLexer` this module provides
+:py:func:`tokenize` function, which produces the same token stream in form of
+lightweight ``(type, value, position)`` tuples by single pass of single regular
+expression built from the token rules of the lexer. It is used by the hand-written
+:py:class:`pynspect.gparser.PynspectFilterDescentParser` and it is suitable also
+for standalone tooling like syntax highlighters::
+
+    >>> tokenize('Source.Port in [22, 80]')
+    [('VARIABLE', 'Source.Port', 0), ('OP_IN', 'OP_IN', 12), ('LBRACK', '[', 15), ('INTEGER', 22, 16), ('COMMA', ',', 18), ('INTEGER', 80, 20), ('RBRACK', ']', 22)]
+
 .. note::
 
     Implementation of this module is very *PLY* specific, please read the
@@ -94,9 +107,22 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
 import re
+import threading
+import importlib
 import ply.lex as plylex
 
 
+#: Name of the module with pregenerated lexer tables shipped within the package.
+LEXTAB = 'pynspect.lextab'
+
+#
+# Master lexer objects shared by all instances of given lexer class within the
+# process, see :py:func:`PynspectFilterLexer.build`.
+#
+_MASTERS = {}
+_MASTERS_LOCK = threading.Lock()
+
+
 class PynspectFilterLexer(object):
     """
     Object encapsulation of `PLY <http://www.dabeaz.com/ply/>`__ lexical analyzer
@@ -221,15 +247,43 @@ class PynspectFilterLexer(object):
     def __init__(self):
         self.lexer = None
 
-    def build(self, **kwargs):
+    def build(self, optimize = True, **kwargs):
         """
         Build/rebuild the lexer object.
 
         (Re)Initialize internal `PLY <http://www.dabeaz.com/ply/>`__ lexer object.
-
-        :param dict kwargs: Optional keyword arguments are passed down to underlying lex.lex object constructor.
+        Master lexer is built only once per process for each lexer class and
+        optimization mode and each instance receives its cheap clone. In optimize
+        mode the master is loaded from pregenerated tables in :py:data:`LEXTAB`
+        module, without validation of token rules. When the tables are missing,
+        the master is built from token rules, but the tables are never written.
+        Subclasses altering token rules must be built with ``optimize`` disabled.
+
+        :param bool optimize: Use pregenerated lexer tables.
+        :param dict kwargs: Optional keyword arguments are passed down to underlying lex.lex object constructor, private lexer object is built when given.
         """
-        self.lexer = plylex.lex(module=self, **kwargs)
+        if kwargs:
+            self.lexer = plylex.lex(module=self, **kwargs)
+            return
+
+        key = (self.__class__, bool(optimize))
+        with _MASTERS_LOCK:
+            master = _MASTERS.get(key)
+            if master is None:
+                master = _MASTERS[key] = self._build_master(optimize)
+        self.lexer = master.clone()
+
+    def _build_master(self, optimize):
+        """
+        Build master lexer object, optionally from pregenerated tables.
+        """
+        if optimize:
+            try:
+                importlib.import_module(LEXTAB)
+                return plylex.lex(module=self, optimize=1, lextab=LEXTAB)
+            except ImportError:
+                pass
+        return plylex.lex(module=self)
 
     def test(self, data, separator = ''):
         """
@@ -347,6 +401,96 @@ class PynspectFilterLexer(object):
         return self.lexer.token()
 
 
+#-------------------------------------------------------------------------------
+
+
+#: Types of tokens, whose values are wrapped into tuples by :py:class:`PynspectFilterLexer`.
+_VALUE_TOKENS = frozenset(('TIMEDELTA', 'IPV4', 'IPV6', 'DATETIME', 'FLOAT', 'INTEGER', 'FUNCTION', 'VARIABLE', 'CONSTANT'))
+
+#: Conversions of matched text into token values, other tokens keep the matched text.
+_CONVERSIONS = {
+    'FLOAT':    float,
+    'INTEGER':  int,
+    'FUNCTION': lambda value: value[:-1],
+    'CONSTANT': lambda value: re.sub('["\']', '', value),
+}
+
+def _build_master(lexer_class):
+    """
+    Build single regular expression recognizing all tokens of given lexer class
+    by named groups. Alternatives are in the order used by *PLY*: ignored
+    characters, rules defined by functions in the order of definition, rules
+    defined by strings sorted by decreasing length and any illegal character.
+    """
+    functions = []
+    strings   = []
+    for name in dir(lexer_class):
+        if not name.startswith('t_') or name in ('t_ignore', 't_error'):
+            continue
+        rule = getattr(lexer_class, name)
+        if callable(rule):
+            code = getattr(rule, '__func__', rule).__code__
+            functions.append((code.co_firstlineno, name[2:], rule.__doc__))
+        else:
+            strings.append((name[2:], rule))
+    functions.sort()
+    strings.sort(key = lambda item: len(item[1]), reverse = True)
+
+    alternatives = ['(?P<_ignore>[{}]+)'.format(re.escape(lexer_class.t_ignore))]
+    alternatives += ['(?P<{}>{})'.format(name, regex) for _, name, regex in functions]
+    alternatives += ['(?P<{}>{})'.format(name, regex) for name, regex in strings]
+    alternatives.append('(?P<_error>[\\s\\S])')
+    return re.compile('|'.join(alternatives), re.VERBOSE)
+
+_MASTER_RE = _build_master(PynspectFilterLexer)
+_RESERVED  = PynspectFilterLexer.reserved
+_DISCARDED = frozenset(('_ignore', '_error', 'newline'))
+
+
+def tokenize(data):
+    """
+    Tokenize given data by single pass of single precompiled regular expression.
+    Tokens are lightweight tuples ``(type, value, position)``, where the position
+    is the offset of the token within the data. Resulting token stream is the
+    same as the stream produced by :py:class:`PynspectFilterLexer`, except that
+    the values are not wrapped into tuples with token type. Illegal characters
+    are silently skipped.
+
+    :param str data: Data to be tokenized.
+    :return: List of tokens.
+    :rtype: list
+    """
+    result = []
+    append = result.append
+    for match in _MASTER_RE.finditer(data):
+        toktype = match.lastgroup
+        if toktype == 'EXP_ALL':
+            toktype = _RESERVED[match.group()]
+            append((toktype, toktype, match.start()))
+        elif toktype in _CONVERSIONS:
+            append((toktype, _CONVERSIONS[toktype](match.group()), match.start()))
+        elif toktype not in _DISCARDED:
+            append((toktype, match.group(), match.start()))
+    return result
+
+def token_str(token, data):
+    """
+    Format given token produced by :py:func:`tokenize` the same way as *PLY*
+    formats tokens of :py:class:`PynspectFilterLexer`, for example for error
+    messages.
+
+    :param tuple token: Token tuple.
+    :param str data: Tokenized data.
+    :return: Formatted token.
+    :rtype: str
+    """
+    toktype, value, position = token
+    if toktype in _VALUE_TOKENS:
+        value = (toktype, value)
+    lineno = 1 + sum([len(match.group()) for match in _MASTER_RE.finditer(data, 0, position) if match.lastgroup == 'newline'])
+    return 'LexToken(%s,%r,%d,%d)' % (toktype, value, lineno, position)
+
+
 #
 # Perform the demonstration by parsing text containing all possible tokens.
 #
@@ -387,3 +531,4 @@ if __name__ == "__main__":
     DEMO_LEXER = PynspectFilterLexer()
     DEMO_LEXER.build(debug=1)
     print(DEMO_LEXER.test(TEST_DATA, "\n"))
+    print("\n".join([token_str(tok, TEST_DATA) for tok in tokenize(TEST_DATA)]))
@@ -0,0 +1,10 @@
+# lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('COMMA', 'CONSTANT', 'DATETIME', 'EXP_ALL', 'FLOAT', 'FUNCTION', 'INTEGER', 'IPV4', 'IPV6', 'LBRACK', 'LPAREN', 'OP_AND', 'OP_AND_P', 'OP_DIVIDE', 'OP_EQ', 'OP_EXISTS', 'OP_GE', 'OP_GT', 'OP_IN', 'OP_IS', 'OP_LE', 'OP_LIKE', 'OP_LT', 'OP_MINUS', 'OP_MODULO', 'OP_NE', 'OP_NOT', 'OP_OR', 'OP_OR_P', 'OP_PLUS', 'OP_TIMES', 'OP_XOR', 'OP_XOR_P', 'RBRACK', 'RPAREN', 'TIMEDELTA', 'VARIABLE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_EXP_ALL>(-|\\+|\\*|/|%|like|LIKE|=~|in|IN|~~|is|IS|eq|EQ|==|ne|NE|!=|<>|ge|GE|>=|gt|GT|>|le|LE|<=|lt|LT|<|or|OR|\\|\\||xor|XOR|\\^\\^|and|AND|&&|not|NOT|!|exists|EXISTS|\\?))|(?P<t_TIMEDELTA>([0-9]+[D|d])?[0-9]{2}:[0-9]{2}:[0-9]{2})|(?P<t_IPV4>\\d{1,3}\\.\\d{1,3}\\.\\d{1,3}\\.\\d{1,3}(?:\\/\\d{1,2}|(?:-|\\.\\.)\\d{1,3}\\.\\d{1,3}\\.\\d{1,3}\\.\\d{1,3})?)|(?P<t_IPV6>[:a-fA-F0-9]+:[:a-fA-F0-9]*(?:\\/\\d{1,3}|(?:-|\\.\\.)[:a-fA-F0-9]+:[:a-fA-F0-9]*)?)|(?P<t_DATETIME>[0-9]{4}-[0-9]{2}-[0-9]{2}[Tt][0-9]{2}:[0-9]{2}:[0-9]{2}(?:\\.[0-9]+)?(?:[Zz]|(?:[+-][0-9]{2}:[0-9]{2})))|(?P<t_FLOAT>\\d+\\.\\d+)|(?P<t_INTEGER>\\d+)|(?P<t_FUNCTION>[_a-zA-Z][_a-zA-Z0-9]{2,}\\()|(?P<t_VARIABLE>[_a-zA-Z][-_a-zA-Z0-9]*(?:\\[(?:\\d+|-\\d+|\\#)\\])?(?:\\.?[a-zA-Z][-_a-zA-Z0-9]*(?:\\[(?:\\d+|-\\d+|\\#)\\])?)*)|(?P<t_CONSTANT>"([^"]+)"|\\\'([^\\\']+)\\\')|(?P<t_newline>\\n+)|(?P<t_COMMA>,|;)|(?P<t_LBRACK>\\[)|(?P<t_LPAREN>\\()|(?P<t_RBRACK>\\])|(?P<t_RPAREN>\\))', [None, ('t_EXP_ALL', 'EXP_ALL'), None, ('t_TIMEDELTA', 'TIMEDELTA'), None, ('t_IPV4', 'IPV4'), ('t_IPV6', 'IPV6'), ('t_DATETIME', 'DATETIME'), ('t_FLOAT', 'FLOAT'), ('t_INTEGER', 'INTEGER'), ('t_FUNCTION', 'FUNCTION'), ('t_VARIABLE', 'VARIABLE'), ('t_CONSTANT', 'CONSTANT'), None, None, ('t_newline', 'newline'), (None, 'COMMA'), (None, 'LBRACK'), (None, 'LPAREN'), (None, 'RBRACK'), (None, 'RPAREN')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
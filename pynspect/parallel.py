@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for filtering large streams of data structures in
+parallel by pool of worker processes.
+
+There are following main tools in this package:
+
+* :py:class:`ParallelFilter`
+
+  Filtering front-end, that splits the stream of data structures into batches
+  and spreads them across pool of worker processes. Each worker compiles the
+  filtering rule only once at start-up. Results are returned in the order of
+  input data structures, while the number of batches being processed at once
+  is bounded.
+
+Following example demonstrates ParallelFilter usage::
+
+    >>> with ParallelFilter('Category in ["Recon.Scanning"]', processes = 8) as pflt:
+    ...     matching = pflt.filter_many(messages, matches = True)
+
+Only the plain rule tree (which consists of picklable objects) and optional
+dictionary of filtering functions are ever sent to workers. Rule string is
+parsed and compiled by the parser and compiler classes in the parent process,
+so that syntax errors are reported immediately. The evaluation closure is then
+built by :py:class:`pynspect.compilers.ClosureFilterCompiler` in each worker,
+because neither the closures nor the traverser objects can be pickled. Filtering
+functions must therefore be picklable, that is defined at module level.
+"""
+
+
+from __future__ import print_function
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import itertools
+import collections
+import multiprocessing
+
+from pynspect.rules import Rule
+from pynspect.gparser import PynspectFilterParser
+from pynspect.compilers import ClosureFilterCompiler, FilterOptimizer
+from pynspect.filters import DataObjectFilter
+
+
+#: Evaluation state of current worker process, set by :py:func:`_worker_init`.
+_WORKER = {}
+
+
+def _worker_init(rule, functions):
+    """
+    Initialize worker process by compiling given rule tree. Any error is remembered
+    and raised from each task, because exception raised from pool initializer
+    would only cause the worker to be restarted over and over.
+    """
+    _WORKER.clear()
+    try:
+        if functions is None:
+            functions = DataObjectFilter().functions
+        rule = FilterOptimizer().compile(rule, boolean = True)
+        _WORKER['evaluate'] = ClosureFilterCompiler(functions).compile(rule)
+    except Exception as exc:  # pylint: disable=locally-disabled,broad-except
+        _WORKER['error'] = exc
+
+def _worker_filter(batch, matches):
+    """
+    Filter given batch of data structures in worker process. Indices of matching
+    data structures are returned instead of the data structures themselves, so
+    that they do not have to be sent back.
+    """
+    if 'error' in _WORKER:
+        raise _WORKER['error']
+    evaluate = _WORKER['evaluate']
+    if matches:
+        return [idx for idx, data in enumerate(batch) if evaluate(data)]
+    return [bool(evaluate(data)) for data in batch]
+
+
+class ParallelFilter(object):
+    """
+    Parallel filtering front-end spreading batches of data structures across pool
+    of worker processes.
+    """
+
+    def __init__(self, rule, processes = None, batch_size = 1000, inflight = None, parser = PynspectFilterParser, compiler = None, functions = None):
+        """
+        Initialize the filter and start the pool of worker processes.
+
+        :param rule: Filtering rule string or rule tree.
+        :param int processes: Number of worker processes, defaults to number of CPUs.
+        :param int batch_size: Number of data structures sent to worker in single task.
+        :param int inflight: Maximal number of batches being processed at once, defaults to twice the number of processes.
+        :param parser: Parser class or instance used for parsing rule strings.
+        :param compiler: Optional compiler class or instance, for example :py:class:`pynspect.compilers.IDEAFilterCompiler`.
+        :param dict functions: Picklable filtering functions, functions of :py:class:`pynspect.filters.DataObjectFilter` are used by default.
+        """
+        if not isinstance(rule, Rule):
+            rule = DataObjectFilter(parser, compiler).prepare(rule)
+        elif compiler:
+            rule = DataObjectFilter(None, compiler).prepare(rule)
+        self.rule = rule
+
+        self.processes  = processes or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.inflight   = inflight or 2 * self.processes
+        self.pool = multiprocessing.Pool(
+            self.processes,
+            initializer = _worker_init,
+            initargs = (rule, functions)
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Shut down the pool of worker processes.
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def filter_many(self, messages, matches = False):
+        """
+        Apply the filtering rule to all data structures in given iterable.
+
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: return list of matching messages instead of list of booleans
+        :return: List of booleans (one for each message) or list of matching messages
+        :rtype: list
+        """
+        return list(self.ifilter_many(messages, matches))
+
+    def ifilter_many(self, messages, matches = False):
+        """
+        Generator variant of :py:func:`filter_many` method. The input iterable is
+        consumed only as far as the bounded number of batches in flight allows.
+
+        :param iterable messages: data structures to check against rule, ussually dicts
+        :param bool matches: yield only matching messages instead of booleans
+        :return: Generator of booleans (one for each message) or of matching messages
+        :rtype: generator
+        """
+        if self.pool is None:
+            raise ValueError("Filter has already been closed")
+        messages = iter(messages)
+        pending  = collections.deque()
+        while True:
+            batch = list(itertools.islice(messages, self.batch_size))
+            if batch:
+                pending.append((batch, self.pool.apply_async(_worker_filter, (batch, matches))))
+            if pending and (not batch or len(pending) >= self.inflight):
+                done, result = pending.popleft()
+                if matches:
+                    for idx in result.get():
+                        yield done[idx]
+                else:
+                    for res in result.get():
+                        yield res
+            elif not batch:
+                return
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    DEMO_DATA = [{"Test": idx, "Attr": "ABC"} for idx in range(20)]
+    with ParallelFilter('Test > 10 and Test % 2 == 0', processes = 2, batch_size = 5) as DEMO_FILTER:
+        pprint.pprint(DEMO_FILTER.filter_many(DEMO_DATA, matches = True))
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for profiling evaluation of filtering rules.
+
+There are following main tools in this package:
+
+* :py:class:`RuleProfiler`
+
+  Tool creating instrumented copy of given rule tree, that records number of
+  evaluations, outcomes and wall time of each rule node, when it is evaluated
+  by :py:class:`pynspect.filters.DataObjectFilter`. Collected statistics are
+  available as report keyed by the node path and by the subexpression.
+
+* :py:class:`ProfiledRule`
+
+  Custom rule wrapping single rule node and recording its statistics.
+
+Following example demonstrates RuleProfiler usage::
+
+    >>> flt = DataObjectFilter()
+    >>> profiler = RuleProfiler(flt.prepare(rule))
+    >>> for msg in messages:
+    ...     flt.filter(profiler.rule, msg)
+    >>> report = profiler.report()
+
+The original rule tree is never modified, so there is no overhead at all when
+profiling is not used. Instrumented rule tree must be evaluated by traversal
+(:py:func:`pynspect.filters.DataObjectFilter.filter`). Compiling it with any
+compiler records only the compilation and any compiler examining the types of
+subtrees (like :py:class:`pynspect.compilers.IDEAFilterCompiler`) must be
+applied before profiling.
+"""
+
+
+from __future__ import print_function
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import copy
+import collections
+
+from pynspect.rules import Rule, FunctionRule
+from pynspect.compilers import CLOCK
+
+
+#-------------------------------------------------------------------------------
+
+
+#: Names of counters recorded for each rule node.
+COUNTERS = ('count', 'true', 'false', 'none', 'errors')
+
+
+class ProfiledRule(Rule):
+    """
+    Custom rule wrapping single node of the rule tree. Each traversal of the
+    wrapped rule is passed through, while the number of traversals, truth value
+    of their results and their wall time are recorded. The time includes the
+    time of evaluation of all subtrees.
+    """
+    __slots__ = ('rule', 'path', 'expression', 'children') + COUNTERS + ('elapsed', 'max')
+
+    def __init__(self, rule, path):
+        """
+        Initialize the wrapper with given rule and its path within the rule tree.
+
+        :param pynspect.rules.Rule rule: Rule to be wrapped.
+        :param str path: Path of the rule within the rule tree.
+        """
+        self.rule = rule
+        self.path = path
+        self.expression = str(rule)
+        self.children = []
+        self.reset()
+
+    def reset(self):
+        """
+        Reset all recorded statistics.
+        """
+        self.count   = 0
+        self.true    = 0
+        self.false   = 0
+        self.none    = 0
+        self.errors  = 0
+        self.elapsed = 0.0
+        self.max     = 0.0
+
+    def __str__(self):
+        return self.expression
+
+    def __repr__(self):
+        return "PROFILED({})".format(repr(self.rule))
+
+    def traverse(self, traverser, **kwargs):
+        """
+        Implementation of mandatory interface for traversing the whole rule tree.
+        This method will call the ``traverse`` method of wrapped rule and record
+        the statistics of the traversal.
+
+        :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
+        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        """
+        start = CLOCK()
+        try:
+            result = self.rule.traverse(traverser, **kwargs)
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            elapsed = CLOCK() - start
+            self.count += 1
+            self.elapsed += elapsed
+            if elapsed > self.max:
+                self.max = elapsed
+        if result is None:
+            self.none += 1
+        elif result:
+            self.true += 1
+        else:
+            self.false += 1
+        return result
+
+
+class RuleProfiler(object):
+    """
+    Profiler of filtering rule evaluation. Each node of given rule tree is wrapped
+    into :py:class:`ProfiledRule` within the copy of the tree available as
+    :py:attr:`rule` attribute.
+
+    Nodes are identified by their path from the root, which consists of attribute
+    names of subtrees, for example ``root.left.right`` or ``root.args[0]``.
+    Members of constant lists are not profiled separately.
+    """
+
+    def __init__(self, rule):
+        """
+        Initialize the profiler with given rule tree.
+
+        :param pynspect.rules.Rule rule: Filtering rule tree to be profiled.
+        """
+        self.nodes = []
+        self.rule = self._wrap(rule, 'root')
+
+    def _wrap(self, rule, path):
+        """
+        Create instrumented copy of given rule subtree.
+        """
+        profiled = ProfiledRule(rule, path)
+        self.nodes.append(profiled)
+
+        clone = copy.copy(rule)
+        for attr in ('left', 'right', 'rule'):
+            child = getattr(rule, attr, None)
+            if isinstance(child, Rule):
+                child = self._wrap(child, '{}.{}'.format(path, attr))
+                profiled.children.append(child)
+                setattr(clone, attr, child)
+        if isinstance(rule, FunctionRule):
+            args = []
+            for idx, child in enumerate(rule.args):
+                child = self._wrap(child, '{}.args[{}]'.format(path, idx))
+                profiled.children.append(child)
+                args.append(child)
+            clone.args = tuple(args)
+        profiled.rule = clone
+        return profiled
+
+    def reset(self):
+        """
+        Reset all recorded statistics.
+        """
+        for node in self.nodes:
+            node.reset()
+
+    def by_path(self):
+        """
+        Return statistics of all rule nodes keyed by their path. Besides the
+        counters of evaluations and their outcomes (``count``, ``true``, ``false``,
+        ``none`` and ``errors``) each record contains the expression, cumulative
+        and maximal wall time of single evaluation in seconds (``elapsed`` and
+        ``max``) and wall time not spent in evaluation of subtrees (``own``).
+
+        :return: Ordered dictionary of statistics in pre-order of the rule tree.
+        :rtype: collections.OrderedDict
+        """
+        result = collections.OrderedDict()
+        for node in self.nodes:
+            record = collections.OrderedDict()
+            record['expression'] = node.expression
+            for counter in COUNTERS:
+                record[counter] = getattr(node, counter)
+            record['elapsed'] = node.elapsed
+            record['max'] = node.max
+            record['own'] = max(node.elapsed - sum([child.elapsed for child in node.children]), 0.0)
+            result[node.path] = record
+        return result
+
+    def by_expression(self):
+        """
+        Return statistics of rule nodes aggregated by their expression, so that
+        the cost of subexpression occuring at multiple places within the rule
+        is summed up. Each record additionally contains the number of aggregated
+        rule nodes (``nodes``).
+
+        :return: Ordered dictionary of statistics sorted by descending cumulative wall time.
+        :rtype: collections.OrderedDict
+        """
+        result = {}
+        for record in self.by_path().values():
+            expression = record.pop('expression')
+            if expression not in result:
+                record['nodes'] = 1
+                result[expression] = record
+                continue
+            total = result[expression]
+            total['nodes'] += 1
+            for counter in COUNTERS + ('elapsed', 'own'):
+                total[counter] += record[counter]
+            total['max'] = max(total['max'], record['max'])
+        return collections.OrderedDict(
+            sorted(result.items(), key = lambda item: item[1]['elapsed'], reverse = True)
+        )
+
+    def report(self):
+        """
+        Return complete report of recorded statistics.
+
+        :return: Dictionary with statistics by path (``paths``) and by expression (``expressions``).
+        :rtype: dict
+        """
+        return {
+            'paths':       self.by_path(),
+            'expressions': self.by_expression(),
+        }
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    from pynspect.rules import IntegerRule, VariableRule, ComparisonBinOpRule,\
+        LogicalBinOpRule
+    from pynspect.filters import DataObjectFilter
+
+    DEMO_RULE = LogicalBinOpRule(
+        'OP_AND',
+        ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10)),
+        ComparisonBinOpRule('OP_LT', VariableRule("Test"), IntegerRule(20))
+    )
+    DEMO_FILTER = DataObjectFilter()
+    DEMO_PROFILER = RuleProfiler(DEMO_RULE)
+    for DEMO_VALUE in range(30):
+        DEMO_FILTER.filter(DEMO_PROFILER.rule, {"Test": DEMO_VALUE})
+    pprint.pprint(DEMO_PROFILER.by_path())
@@ -40,6 +40,11 @@ Additionally there is following class representing functions without/with argume
 Desired hierarchical rule tree can be created either programatically, or by
 parsing string rules using :py:mod:`pynspect.gparser`.
 
+All rules support structural comparison and hashing, so that identical rule
+trees (or their subtrees) are equal and can be used as dictionary keys. Rule
+trees must not be modified after they were hashed. Canonical shared instances
+of identical subtrees can be obtained from :py:class:`RuleInterner`.
+
 Working with rule tree is then done via objects implementing rule tree
 traverser interface:
 
@@ -135,10 +140,30 @@ Rule evaluation
 from __future__ import print_function
 
 
+import copy
+
+
 __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>, Andrea Kropáčová <andrea.kropacova@cesnet.cz>"
 
 
+try:
+    from sys import intern as _sys_intern
+except ImportError:
+    _sys_intern = intern  # pylint: disable=locally-disabled,undefined-variable
+
+
+def _intern(value):
+    """
+    Intern given string value, so that variable names and operation types are
+    shared across all rule trees and can be compared by identity. Values of any
+    other type are returned unchanged.
+    """
+    if type(value) is str:  # pylint: disable=locally-disabled,unidiomatic-typecheck
+        return _sys_intern(value)
+    return value
+
+
 class FilteringRuleException(Exception):
     """
     Custom filtering rule specific exception.
@@ -146,7 +171,7 @@ class FilteringRuleException(Exception):
     This exception will be thrown on module specific errors.
     """
     def __init__(self, description):
-        super(FilteringRuleException).__init__()
+        super(FilteringRuleException, self).__init__(description)
         self.description = description
 
     def __str__(self):
@@ -157,6 +182,50 @@ class Rule(object):
     """
     Base class for all filter tree rules.
     """
+    __slots__ = ('_hash',)
+
+    def _key(self):
+        """
+        Return tuple of components defining the structure of the rule, which is
+        used for structural comparison and hashing. Rules without known structure
+        are compared by identity.
+        """
+        return (id(self),)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Rule):
+            return NotImplemented
+        return self.__class__ is other.__class__ and hash(self) == hash(other) and self._key() == other._key()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def __hash__(self):
+        try:
+            return self._hash
+        except AttributeError:
+            self._hash = hash((self.__class__,) + self._key())
+            return self._hash
+
+    def __getstate__(self):
+        # Cached hash is never copied or pickled, because the copy may be
+        # modified and hashes of strings differ between processes.
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in self.__class__.__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name != '_hash' and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
     def traverse(self, traverser, **kwargs):
         """
         Mandatory interface for traversing the whole rule tree. This method must
@@ -174,6 +243,8 @@ class ValueRule(Rule):  # pylint: disable=locally-disabled,abstract-method
     """
     Base class for all filter tree value rules.
     """
+    __slots__ = ('value',)
+
     def __init__(self, value):
         """
         Initialize the rule with given value.
@@ -182,6 +253,9 @@ class ValueRule(Rule):  # pylint: disable=locally-disabled,abstract-method
         """
         self.value = value
 
+    def _key(self):
+        return (self.value,)
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -190,6 +264,16 @@ class VariableRule(ValueRule):
     """
     Class representing filtering expression variables.
     """
+    __slots__ = ()
+
+    def __init__(self, value):
+        """
+        Initialize the rule with given variable name.
+
+        :param str value: Name of the variable (JPath).
+        """
+        super(VariableRule, self).__init__(_intern(value))
+
     def __repr__(self):
         return "VARIABLE({})".format(repr(self.value))
 
@@ -211,6 +295,8 @@ class ConstantRule(ValueRule):
     """
     Class representing filtering expression string constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '"{}"'.format(self.value)
 
@@ -235,6 +321,8 @@ class IPV4Rule(ConstantRule):
     """
     Class representing filtering expression IPv4 address/range/network constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -259,6 +347,8 @@ class IPV6Rule(ConstantRule):
     """
     Class representing filtering expression IPv6 address/range/network constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -283,6 +373,8 @@ class DatetimeRule(ConstantRule):
     """
     Class representing filtering expression datetime constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -307,6 +399,8 @@ class TimedeltaRule(ConstantRule):
     """
     Class representing filtering expression timedelta constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -331,6 +425,8 @@ class NumberRule(ConstantRule):
     """
     Base class for all filtering expression numerical constants.
     """
+    __slots__ = ()
+
     def __str__(self):
         return '{}'.format(self.value)
 
@@ -339,6 +435,8 @@ class IntegerRule(NumberRule):
     """
     Class representing filtering expression integer numerical constants.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return "INTEGER({})".format(repr(self.value))
 
@@ -360,6 +458,8 @@ class FloatRule(NumberRule):
     """
     Class representing filtering expression floating point numerical constants.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return "FLOAT({})".format(repr(self.value))
 
@@ -381,6 +481,8 @@ class ListRule(ValueRule):
     """
     Class representing filtering expression list of constants.
     """
+    __slots__ = ()
+
     def __init__(self, rule, next_rule = None):
         """
         Initialize the list with given rule. Optionally add next rule to the list.
@@ -396,6 +498,9 @@ class ListRule(ValueRule):
         if next_rule:
             self.value += next_rule.value
 
+    def _key(self):
+        return tuple(self.value)
+
     def __str__(self):
         return '[{}]'.format(', '.join([str(v) for v in self.value]))
 
@@ -426,13 +531,15 @@ class OperationRule(Rule):  # pylint: disable=locally-disabled,abstract-method
     """
     Base class for all expression operations (both unary and binary).
     """
-    pass
+    __slots__ = ()
 
 
 class BinaryOperationRule(OperationRule):  # pylint: disable=locally-disabled,abstract-method
     """
     Base class for all expression binary operations.
     """
+    __slots__ = ('operation', 'left', 'right')
+
     def __init__(self, operation, left, right):
         """
         Initialize the object with operation type and both operands.
@@ -441,10 +548,13 @@ class BinaryOperationRule(OperationRule):  # pylint: disable=locally-disabled,ab
         :param pynspect.rules.Rule left: Left operation operand.
         :param pynspect.rules.Rule right: Right operation operand.
         """
-        self.operation = operation
+        self.operation = _intern(operation)
         self.left = left
         self.right = right
 
+    def _key(self):
+        return (self.operation, self.left, self.right)
+
     def __str__(self):
         return "({} {} {})".format(str(self.left), str(self.operation), str(self.right))
 
@@ -453,6 +563,8 @@ class LogicalBinOpRule(BinaryOperationRule):
     """
     Base class for all expression logical binary operations.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return "LOGBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
@@ -466,10 +578,16 @@ class LogicalBinOpRule(BinaryOperationRule):
         are passed down to traverser callback as additional arguments and can be
         used to provide additional data or context.
 
+        Traversers with enabled ``short_circuit`` flag receive the right subtree
+        itself instead through :py:func:`pynspect.rules.RuleTreeTraverser.binary_operation_logical_lazy`
+        method and may decide to not traverse it at all.
+
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
         :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
         """
         lrt = self.left.traverse(traverser, **kwargs)
+        if getattr(traverser, 'short_circuit', False):
+            return traverser.binary_operation_logical_lazy(self, lrt, self.right, **kwargs)
         rrt = self.right.traverse(traverser, **kwargs)
         return traverser.binary_operation_logical(self, lrt, rrt, **kwargs)
 
@@ -478,6 +596,8 @@ class ComparisonBinOpRule(BinaryOperationRule):
     """
     Base class for all expression comparison binary operations.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return "COMPBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
@@ -503,6 +623,8 @@ class MathBinOpRule(BinaryOperationRule):
     """
     Base class for all expression mathematical binary operations.
     """
+    __slots__ = ()
+
     def __repr__(self):
         return "MATHBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
@@ -528,6 +650,8 @@ class UnaryOperationRule(OperationRule):
     """
     Base class for all expression unary operations.
     """
+    __slots__ = ('operation', 'right')
+
     def __init__(self, operation, operand):
         """
         Initialize the object with operation type operand.
@@ -535,9 +659,12 @@ class UnaryOperationRule(OperationRule):
         :param str operation: Type of the binary operations.
         :param pynspect.rules.Rule operand: Operation operand.
         """
-        self.operation = operation
+        self.operation = _intern(operation)
         self.right = operand
 
+    def _key(self):
+        return (self.operation, self.right)
+
     def __str__(self):
         return "({} {})".format(str(self.operation), str(self.right))
 
@@ -564,6 +691,8 @@ class FunctionRule(Rule):
     """
     Base class for all expression binary operations.
     """
+    __slots__ = ('function', 'args')
+
     def __init__(self, function, *args):
         """
         Initialize the object with function name and arguments.
@@ -571,9 +700,12 @@ class FunctionRule(Rule):
         :param str function: Name of the function.
         :param args: Optional function arguments.
         """
-        self.function = function
+        self.function = _intern(function)
         self.args = args
 
+    def _key(self):
+        return (self.function,) + tuple(self.args)
+
     def __str__(self):
         return "{}{}".format(str(self.function), str(self.args))
 
@@ -597,6 +729,91 @@ class FunctionRule(Rule):
             atr.append(arg.traverse(traverser, **kwargs))
         return traverser.function(self, atr, **kwargs)
 
+
+class RuleInterner(object):
+    """
+    Factory of canonical rule instances. Interning given rule tree returns its
+    structurally identical tree consisting of canonical instances shared with all
+    rule trees interned before, so that each distinct subexpression is stored only
+    once. Rule trees are never modified, rules with subtrees replaced by canonical
+    ones are copied. Subtrees are interned bottom-up, so that the lookup of each
+    canonical instance compares the subtrees only by identity.
+
+    Canonical instances are shared and must not be modified by any compiler.
+    """
+
+    def __init__(self):
+        self.rules = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __contains__(self, rule):
+        return (rule.__class__,) + rule._key() in self.rules  # pylint: disable=locally-disabled,protected-access
+
+    def clear(self):
+        """
+        Forget all canonical instances.
+        """
+        self.rules.clear()
+
+    @staticmethod
+    def _children(rule):
+        """
+        Return list of ``(attribute, subtree)`` pairs for all direct subtrees of
+        given rule, arguments of functions are identified by their index.
+        """
+        children = []
+        for attr in ('left', 'right', 'rule'):
+            child = getattr(rule, attr, None)
+            if isinstance(child, Rule):
+                children.append((attr, child))
+        if isinstance(rule, FunctionRule):
+            children.extend(enumerate(rule.args))
+        return children
+
+    def intern(self, rule):
+        """
+        Return canonical instance of given rule tree.
+
+        :param pynspect.rules.Rule rule: Rule tree to be interned.
+        :return: Canonical rule tree.
+        :rtype: pynspect.rules.Rule
+        """
+        key = (rule.__class__,) + rule._key()  # pylint: disable=locally-disabled,protected-access
+        if isinstance(rule, ValueRule):
+            return self.rules.setdefault(key, rule)
+
+        shared = {}
+        replaced = {}
+        for attr, child in self._children(rule):
+            canonical = self.intern(child)
+            if canonical is not child:
+                shared[attr] = canonical
+                replaced[id(child)] = canonical
+
+        # Canonical instances are looked up by the structural key with canonical
+        # subtrees, which are compared by identity.
+        if replaced:
+            key = tuple([replaced.get(id(item), item) for item in key])
+
+        canonical = self.rules.get(key)
+        if canonical is None:
+            if shared:
+                canonical = copy.copy(rule)
+                args = list(getattr(rule, 'args', ()))
+                for attr, child in shared.items():
+                    if isinstance(attr, int):
+                        args[attr] = child
+                    else:
+                        setattr(canonical, attr, child)
+                if isinstance(rule, FunctionRule):
+                    canonical.args = tuple(args)
+            else:
+                canonical = rule
+            self.rules[key] = canonical
+        return canonical
+
 #-------------------------------------------------------------------------------
 
 
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for evaluating large sets of filtering rules against
+the same data structures.
+
+There are following main tools in this package:
+
+* :py:class:`RuleSet`
+
+  Collection of identified filtering rule trees, that are merged together into
+  single directed acyclic graph of distinct subexpressions. Each distinct
+  subexpression is evaluated at most once per data structure, regardless of
+  how many rules contain it. Rules requiring particular value of some variable
+  by equality or ``in`` predicate within their top-level conjunction are indexed
+  by that value and evaluated only against data structures containing it.
+
+Following example demonstrates RuleSet usage in conjuction with PynspectFilterParser::
+
+    >>> psr = PynspectFilterParser()
+    >>> psr.build()
+    >>> rset = RuleSet()
+    >>> rset.add('scans', psr.parse('Category in ["Recon.Scanning"]'))
+    >>> rset.add('big-scans', psr.parse('Category in ["Recon.Scanning"] and ConnCount > 100'))
+    >>> rset.match(test_msg)
+    ['scans']
+"""
+
+
+from __future__ import print_function
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import copy
+import heapq
+import collections
+
+from pynspect.rules import Rule, FunctionRule, VariableRule, ConstantRule,\
+    IntegerRule, FloatRule, ListRule, LogicalBinOpRule, ComparisonBinOpRule,\
+    RuleInterner
+from pynspect.compilers import ClosureFilterCompiler, SetListRule, _jpath_memo
+from pynspect.filters import DataObjectFilter
+
+
+#-------------------------------------------------------------------------------
+
+
+class _CompiledRule(Rule):
+    """
+    Internal placeholder for already compiled subtree of the rule tree. Traversing
+    it simply returns the compiled closure, which enables compiling each distinct
+    subexpression separately.
+    """
+    __slots__ = ('closure',)
+
+    def __init__(self, closure):
+        self.closure = closure
+
+    def _key(self):
+        return (self.closure,)
+
+    def traverse(self, traverser, **kwargs):
+        return self.closure
+
+
+#: Internal marker of missing value in memo dictionary.
+_MISSING = object()
+
+
+def _shared_function(closure, key):
+    """
+    Create closure remembering the result of given closure in the memo dictionary
+    under given key for the duration of single evaluation.
+    """
+    def shared(obj, memo):
+        result = memo.get(key, _MISSING)
+        if result is _MISSING:
+            result = memo[key] = closure(obj, memo)
+        return result
+    return shared
+
+def _rule_children(rule):
+    """
+    Return list of ``(attribute, subtree)`` pairs for all direct subtrees of given
+    rule. Lists and constants are considered to be tree leaves.
+    """
+    children = []
+    for attr in ('left', 'right', 'rule'):
+        child = getattr(rule, attr, None)
+        if isinstance(child, Rule):
+            children.append((attr, child))
+    if isinstance(rule, FunctionRule):
+        for idx, child in enumerate(rule.args):
+            children.append((idx, child))
+    return children
+
+
+#: Classes of constants, that may be used as keys of the discrimination index.
+_INDEX_CONSTANTS = (ConstantRule, IntegerRule, FloatRule)
+
+def _index_values(rule):
+    """
+    Return list of values of given simple constant or list of simple constants,
+    or ``None`` for any other rule.
+    """
+    if rule.__class__ in _INDEX_CONSTANTS:
+        return [rule.value]
+    if rule.__class__ in (ListRule, SetListRule) and rule.value and all(i.__class__ in _INDEX_CONSTANTS for i in rule.value):
+        return [i.value for i in rule.value]
+    return None
+
+def _conjunction(rule):
+    """
+    Return list of all operands of top-level conjunction of given rule.
+    """
+    if isinstance(rule, LogicalBinOpRule) and rule.operation in ('OP_AND', 'OP_AND_P'):
+        return _conjunction(rule.left) + _conjunction(rule.right)
+    return [rule]
+
+def _discriminator(rule, fields = None):
+    """
+    Find the most selective predicate within top-level conjunction of given rule,
+    that requires value of some variable to be equal to one of the constants.
+    Rule can match only data structures containing such value, so the rule is
+    indexable by it.
+
+    :param pynspect.rules.Rule rule: Filtering rule tree.
+    :param fields: Optional collection of JPaths allowed to be used for indexing.
+    :return: Tuple of JPath and list of values, or ``None`` for unindexable rule.
+    :rtype: tuple
+    """
+    best = None
+    for operand in _conjunction(rule):
+        if not isinstance(operand, ComparisonBinOpRule) or operand.operation not in ('OP_EQ', 'OP_IN'):
+            continue
+        variable, values = operand.left, _index_values(operand.right)
+        if operand.operation == 'OP_EQ' and values is None:
+            variable, values = operand.right, _index_values(operand.left)
+        if values is None or variable.__class__ is not VariableRule:
+            continue
+        if fields is not None and variable.value not in fields:
+            continue
+        if best is None or len(values) < len(best[1]):
+            best = (variable.value, values)
+    return best
+
+
+class RuleSet(object):
+    """
+    Collection of identified filtering rules evaluated together against the same
+    data structures.
+
+    All rule trees are hash-consed by their canonical representation into single
+    graph of distinct subexpressions, each compiled exactly once with
+    :py:class:`pynspect.compilers.ClosureFilterCompiler`. Subexpressions referenced
+    from more than one place remember their result for the currently evaluated
+    data structure, as do the values of all referenced variables, so the cost of
+    :py:func:`match` grows with the number of distinct subexpressions and JPaths
+    rather than with the number of rules.
+
+    Additionally the rules are kept in discrimination index. Each rule, whose
+    top-level conjunction contains ``==`` or ``in`` comparison of variable with
+    simple constants (strings or numbers), is registered only under these
+    constants for the JPath of that variable. Remaining rules are kept in
+    catch-all bucket. Only the rules from the catch-all bucket and from the
+    buckets of values actually present in the data structure are evaluated by
+    :py:func:`match`, so the rules requiring for example particular ``Category``
+    cost only single hash lookup for data structures of any other category.
+    """
+
+    def __init__(self, rules = None, functions = None, fields = None):
+        """
+        Initialize the set with optional rules and optional dictionary of filtering
+        functions. Functions of :py:class:`pynspect.filters.DataObjectFilter`
+        are used by default.
+
+        :param rules: Dictionary or iterable of ``(rule_id, rule)`` pairs.
+        :param dict functions: Filtering rule functions.
+        :param fields: Optional collection of JPaths to be used for indexing, any JPath may be used by default.
+        """
+        if functions is None:
+            functions = DataObjectFilter().functions
+        self.functions = functions
+        self.fields = fields
+        self.rules = collections.OrderedDict()
+        self._roots = None
+        self._nodes = None
+        self._shared = None
+        self._index = None
+        self._catchall = None
+
+        if rules:
+            if isinstance(rules, dict):
+                rules = rules.items()
+            for rule_id, rule in rules:
+                self.add(rule_id, rule)
+
+    def __len__(self):
+        return len(self.rules)
+
+    def __contains__(self, rule_id):
+        return rule_id in self.rules
+
+    def add(self, rule_id, rule):
+        """
+        Add given filtering rule under given identifier. Rule already registered
+        under the same identifier is replaced.
+
+        :param rule_id: Unique identifier of the rule.
+        :param pynspect.rules.Rule rule: Filtering rule tree.
+        """
+        self.rules[rule_id] = rule
+        self._roots = None
+
+    def remove(self, rule_id):
+        """
+        Remove filtering rule with given identifier.
+
+        :param rule_id: Unique identifier of the rule.
+        """
+        del self.rules[rule_id]
+        self._roots = None
+
+    def match(self, data):
+        """
+        Evaluate all rules against given data structure.
+
+        :param any data: data structure to check against rules, ussually dict
+        :return: List of identifiers of all matching rules in order of their addition.
+        :rtype: list
+        """
+        if self._roots is None:
+            self.compile()
+        memo = {}
+        hits = set()
+        for jpath, bucket in self._index:
+            for value in _jpath_memo(data, memo, jpath):
+                try:
+                    positions = bucket.get(value)
+                except TypeError:
+                    continue
+                if positions:
+                    hits.update(positions)
+        positions = self._catchall
+        if hits:
+            positions = heapq.merge(sorted(hits), positions)
+        roots = self._roots
+        return [roots[pos][0] for pos in positions if roots[pos][1](data, memo)]
+
+    def compile(self):
+        """
+        Merge all registered rules into graph of distinct subexpressions and
+        compile it. This is done automatically on first :py:func:`match` after
+        any change of the set.
+        """
+        nodes = collections.OrderedDict()
+        refs = collections.defaultdict(int)
+        roots = []
+        index = collections.OrderedDict()
+        catchall = []
+        interner = RuleInterner()
+        for pos, (rule_id, rule) in enumerate(self.rules.items()):
+            roots.append((rule_id, self._intern(interner.intern(rule), nodes, refs)))
+            discriminator = _discriminator(rule, self.fields)
+            if discriminator is None:
+                catchall.append(pos)
+                continue
+            bucket = index.setdefault(discriminator[0], {})
+            for value in set(discriminator[1]):
+                bucket.setdefault(value, []).append(pos)
+
+        compiler = ClosureFilterCompiler(self.functions)
+        compiled = {}
+        for idx, (key, rule) in enumerate(nodes.items()):
+            closure = self._compile_node(rule, compiler, compiled)
+            if refs[key] > 1:
+                closure = _shared_function(closure, idx)
+            compiled[key] = closure
+
+        self._roots = [(rule_id, compiled[key]) for rule_id, key in roots]
+        self._nodes = len(nodes)
+        self._shared = len([key for key in nodes if refs[key] > 1])
+        self._index = list(index.items())
+        self._catchall = catchall
+
+    def stats(self):
+        """
+        Return statistics of the compiled set.
+
+        :return: Dictionary with number of rules, distinct and shared subexpressions, indexed JPaths and rules in catch-all bucket.
+        :rtype: dict
+        """
+        if self._roots is None:
+            self.compile()
+        return {
+            'rules':    len(self.rules),
+            'nodes':    self._nodes,
+            'shared':   self._shared,
+            'indexed':  len(self._index),
+            'catchall': len(self._catchall),
+        }
+
+    #---------------------------------------------------------------------------
+
+    def _intern(self, rule, nodes, refs):
+        """
+        Register given rule subtree and all its distinct subtrees into ``nodes``
+        dictionary in bottom-up order and count references to them.
+        """
+        refs[rule] += 1
+        if not rule in nodes:
+            for _, child in _rule_children(rule):
+                self._intern(child, nodes, refs)
+            nodes[rule] = rule
+        return rule
+
+    @staticmethod
+    def _compile_node(rule, compiler, compiled):
+        """
+        Compile single node of the rule graph with all its subtrees already compiled.
+        Tree leaves are left in place, so that the compiler is able to see
+        the constants and perform any operand specific optimizations.
+        """
+        children = _rule_children(rule)
+        if not children:
+            return compiler.compile_memo(rule)
+        clone = copy.copy(rule)
+        args = []
+        for attr, child in children:
+            if _rule_children(child):
+                child = _CompiledRule(compiled[child])
+            if isinstance(attr, int):
+                args.append(child)
+            else:
+                setattr(clone, attr, child)
+        if isinstance(rule, FunctionRule):
+            clone.args = tuple(args)
+        return compiler.compile_memo(clone)
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    import pprint
+
+    from pynspect.rules import IntegerRule, VariableRule, ComparisonBinOpRule,\
+        LogicalBinOpRule
+
+    DEMO_DATA = {"Test": 15, "Attr": "ABC"}
+    DEMO_RULE = ComparisonBinOpRule('OP_GT', VariableRule("Test"), IntegerRule(10))
+    DEMO_SET  = RuleSet([
+        ('first',  DEMO_RULE),
+        ('second', LogicalBinOpRule('OP_AND', DEMO_RULE, ComparisonBinOpRule('OP_LT', VariableRule("Test"), IntegerRule(20)))),
+        ('third',  LogicalBinOpRule('OP_AND', DEMO_RULE, ComparisonBinOpRule('OP_LT', VariableRule("Test"), IntegerRule(12)))),
+    ])
+    pprint.pprint(DEMO_SET.match(DEMO_DATA))
+    pprint.pprint(DEMO_SET.stats())
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+This module provides tools for compact binary serialization of filtering rule
+trees, so that parsed and compiled rules can be stored in database or sent to
+another process and loaded back without running the parser and compilers again.
+
+There are following main tools in this package:
+
+* :py:func:`dumps`
+
+  Serialize given rule tree into bytes.
+
+* :py:func:`loads`
+
+  Load rule tree from bytes created by :py:func:`dumps`.
+
+Following example demonstrates the serialization usage::
+
+    >>> rule = IDEAFilterCompiler().compile(psr.parse('Source.IP4 in [10.0.0.0/8]'))
+    >>> data = dumps(rule)
+    >>> rule = loads(data)
+
+Rule tree is converted into nested arrays of simple values tagged with numeric
+identifiers of the rule classes, which is then serialized as compact ASCII
+`JSON <https://tools.ietf.org/html/rfc8259>`__. Unlike :py:mod:`marshal` or
+:py:mod:`pickle`, this encoding does not depend on the version of the Python
+interpreter, so the data may be stored persistently and loaded by any supported
+interpreter.
+Compiled values (IP addresses/ranges/networks, datetimes, timedeltas and regular
+expression patterns) are stored in their simplest form and re-created on load.
+Conversion functions of :py:class:`pynspect.compilers.ConversionRule` are stored
+by their name and must be available as module level attributes. Serialized data
+starts with :py:data:`MAGIC` header followed by format :py:data:`VERSION`, data
+of unknown version are refused. Serialized data must come from trusted source.
+"""
+
+
+from __future__ import print_function
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import re
+import sys
+import json
+import datetime
+import importlib
+
+import ipranges
+from pynspect.rules import FilteringRuleException, VariableRule, ConstantRule,\
+    IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule, IntegerRule, FloatRule,\
+    ListRule, LogicalBinOpRule, ComparisonBinOpRule, MathBinOpRule,\
+    UnaryOperationRule, FunctionRule
+from pynspect.compilers import IPListRule, SetListRule, RegexRule,\
+    ConversionRule, BooleanRule
+
+
+#: Header of serialized rule trees.
+MAGIC = b'PYNS'
+
+#: Version of serialization format.
+VERSION = 2
+
+_HEADER = MAGIC + bytes(bytearray([VERSION]))
+
+
+#
+# Identifiers of serialized rule classes.
+#
+_VARIABLE, _CONSTANT, _IPV4, _IPV6, _DATETIME, _TIMEDELTA, _INTEGER, _FLOAT,\
+    _BOOLEAN, _REGEX, _LIST, _IPLIST, _SETLIST, _LOGBINOP, _COMPBINOP,\
+    _MATHBINOP, _UNOP, _FUNCTION, _CONVERSION = range(19)
+
+#
+# Identifiers of serialized compiled values.
+#
+_V_IP4, _V_IP4RANGE, _V_IP4NET, _V_IP6, _V_IP6RANGE, _V_IP6NET, _V_DATETIME,\
+    _V_TIMEDELTA, _V_REGEX = range(9)
+
+#: Classes of IP address/range/network values.
+_IP_VALUES = {
+    ipranges.IP4:      _V_IP4,
+    ipranges.IP4Range: _V_IP4RANGE,
+    ipranges.IP4Net:   _V_IP4NET,
+    ipranges.IP6:      _V_IP6,
+    ipranges.IP6Range: _V_IP6RANGE,
+    ipranges.IP6Net:   _V_IP6NET,
+}
+
+#: Rule classes storing single value.
+_VALUE_RULES = {
+    VariableRule:  _VARIABLE,
+    ConstantRule:  _CONSTANT,
+    IPV4Rule:      _IPV4,
+    IPV6Rule:      _IPV6,
+    DatetimeRule:  _DATETIME,
+    TimedeltaRule: _TIMEDELTA,
+    IntegerRule:   _INTEGER,
+    FloatRule:     _FLOAT,
+    BooleanRule:   _BOOLEAN,
+    RegexRule:     _REGEX,
+}
+
+#: Rule classes storing list of rules.
+_LIST_RULES = {
+    ListRule:    _LIST,
+    IPListRule:  _IPLIST,
+    SetListRule: _SETLIST,
+}
+
+#: Rule classes storing binary operation.
+_BINOP_RULES = {
+    LogicalBinOpRule:    _LOGBINOP,
+    ComparisonBinOpRule: _COMPBINOP,
+    MathBinOpRule:       _MATHBINOP,
+}
+
+#: Native types of values, that are serialized directly.
+_NATIVE_TYPES = (type(None), bool, int, float, str, type(u''), type(2**64))
+
+
+#-------------------------------------------------------------------------------
+
+
+def _dump_value(value):
+    """
+    Convert given rule value into serializable form.
+    """
+    if isinstance(value, _NATIVE_TYPES):
+        return value
+    if value.__class__ in _IP_VALUES:
+        if isinstance(value, ipranges.IPNetBase):
+            return (_IP_VALUES[value.__class__], value.base, value.cidr)
+        return (_IP_VALUES[value.__class__], value.low(), value.high())
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise FilteringRuleException("Unable to serialize timezone aware datetime '{}'".format(value))
+        return (_V_DATETIME, value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond)
+    if isinstance(value, datetime.timedelta):
+        return (_V_TIMEDELTA, value.days, value.seconds, value.microseconds)
+    if hasattr(value, 'pattern') and hasattr(value, 'flags'):
+        return (_V_REGEX, value.pattern, value.flags)
+    raise FilteringRuleException("Unable to serialize rule value '{}'".format(repr(value)))
+
+def _dump_conversion(conversion):
+    """
+    Convert given conversion function into serializable reference.
+    """
+    module = getattr(conversion, '__module__', None)
+    name   = getattr(conversion, '__name__', None)
+    if not module or not name or getattr(sys.modules.get(module), name, None) is not conversion:
+        raise FilteringRuleException("Unable to serialize conversion '{}', it is not module level attribute".format(repr(conversion)))
+    return (module, name)
+
+def _dump(rule):
+    """
+    Convert given rule tree into nested tagged tuples, which are serialized as
+    JSON arrays.
+    """
+    cls = rule.__class__
+    if cls in _VALUE_RULES:
+        return (_VALUE_RULES[cls], _dump_value(rule.value))
+    if cls in _BINOP_RULES:
+        return (_BINOP_RULES[cls], rule.operation, _dump(rule.left), _dump(rule.right))
+    if cls in _LIST_RULES:
+        return (_LIST_RULES[cls], tuple([_dump(i) for i in rule.value]))
+    if cls is UnaryOperationRule:
+        return (_UNOP, rule.operation, _dump(rule.right))
+    if cls is FunctionRule:
+        return (_FUNCTION, rule.function, tuple([_dump(i) for i in rule.args]))
+    if cls is ConversionRule:
+        return (_CONVERSION, _dump_conversion(rule.conversion), _dump(rule.rule))
+    raise FilteringRuleException("Unable to serialize rule of type '{}'".format(cls.__name__))
+
+
+#-------------------------------------------------------------------------------
+
+
+#: Classes of IP address/range/network values indexed by identifier.
+_IP_LOADERS = dict((tag, cls) for cls, tag in _IP_VALUES.items())
+
+def _load_value(value):
+    """
+    Re-create rule value from its serializable form.
+    """
+    tag = value[0]
+    if tag in _IP_LOADERS:
+        if tag in (_V_IP4, _V_IP6):
+            return _IP_LOADERS[tag](value[1])
+        return _IP_LOADERS[tag](value[1:])
+    if tag == _V_DATETIME:
+        return datetime.datetime(*value[1:])
+    if tag == _V_TIMEDELTA:
+        return datetime.timedelta(*value[1:])
+    if tag == _V_REGEX:
+        return re.compile(value[1], value[2])
+    raise ValueError("Invalid serialized rule value '{}'".format(repr(value)))
+
+def _load_conversion(reference):
+    """
+    Resolve conversion function from its serializable reference.
+    """
+    module, name = reference
+    try:
+        return getattr(sys.modules.get(module) or importlib.import_module(module), name)
+    except (ImportError, AttributeError):
+        raise ValueError("Invalid serialized conversion '{}.{}'".format(module, name))
+
+#
+# Loaders of serialized rules. Each loader is indexed by the rule identifier in
+# :py:data:`_LOADERS` list and receives whole serialized node. Loaders call each
+# other directly through this list, so that there is only single function call
+# per rule node.
+#
+_LOADERS = [None] * (_CONVERSION + 1)
+
+def _value_loader(cls):
+    """
+    Create loader of value rule of given class.
+    """
+    def load(node):
+        value = node[1]
+        if value.__class__ is list:
+            value = _load_value(value)
+        return cls(value)
+    return load
+
+def _binop_loader(cls):
+    """
+    Create loader of binary operation rule of given class.
+    """
+    def load(node):
+        left, right = node[2], node[3]
+        return cls(node[1], _LOADERS[left[0]](left), _LOADERS[right[0]](right))
+    return load
+
+def _list_loader(cls):
+    """
+    Create loader of list rule of given class.
+    """
+    def load(node):
+        return cls([_LOADERS[i[0]](i) for i in node[1]])
+    return load
+
+def _load_unop(node):
+    """
+    Load unary operation rule.
+    """
+    right = node[2]
+    return UnaryOperationRule(node[1], _LOADERS[right[0]](right))
+
+def _load_function(node):
+    """
+    Load function rule.
+    """
+    return FunctionRule(node[1], *[_LOADERS[i[0]](i) for i in node[2]])
+
+def _load_conversion_rule(node):
+    """
+    Load conversion rule.
+    """
+    rule = node[2]
+    return ConversionRule(_load_conversion(node[1]), _LOADERS[rule[0]](rule))
+
+for _cls, _tag in _VALUE_RULES.items():
+    _LOADERS[_tag] = _value_loader(_cls)
+for _cls, _tag in _BINOP_RULES.items():
+    _LOADERS[_tag] = _binop_loader(_cls)
+for _cls, _tag in _LIST_RULES.items():
+    _LOADERS[_tag] = _list_loader(_cls)
+_LOADERS[_UNOP]       = _load_unop
+_LOADERS[_FUNCTION]   = _load_function
+_LOADERS[_CONVERSION] = _load_conversion_rule
+
+
+#-------------------------------------------------------------------------------
+
+
+def dumps(rule):
+    """
+    Serialize given rule tree into bytes.
+
+    :param pynspect.rules.Rule rule: Rule tree to be serialized.
+    :return: Serialized rule tree.
+    :rtype: bytes
+    :raises pynspect.rules.FilteringRuleException: If the rule tree contains rule or value, that can not be serialized.
+    """
+    return _HEADER + json.dumps(_dump(rule), separators = (',', ':')).encode('ascii')
+
+def loads(data):
+    """
+    Load rule tree from bytes created by :py:func:`dumps`.
+
+    :param bytes data: Serialized rule tree.
+    :return: Rule tree.
+    :rtype: pynspect.rules.Rule
+    :raises ValueError: If the data are not valid serialized rule tree of supported version.
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError("Invalid serialized rule, missing header")
+    if data[:len(_HEADER)] != _HEADER:
+        raise ValueError("Unsupported version of serialized rule")
+    try:
+        node = json.loads(data[len(_HEADER):].decode('ascii'))
+    except ValueError as exc:
+        raise ValueError("Invalid serialized rule: {}".format(exc))
+    try:
+        return _LOADERS[node[0]](node)
+    except (TypeError, IndexError, KeyError) as exc:
+        raise ValueError("Invalid serialized rule: {}".format(exc))
+
+
+#-------------------------------------------------------------------------------
+
+
+#
+# Perform the demonstration.
+#
+if __name__ == "__main__":
+
+    from pynspect.gparser import PynspectFilterParser
+    from pynspect.compilers import IDEAFilterCompiler
+
+    DEMO_PARSER = PynspectFilterParser()
+    DEMO_PARSER.build()
+    DEMO_RULE = IDEAFilterCompiler().compile(
+        DEMO_PARSER.parse('Source.IP4 in [10.0.0.0/8, 192.168.1.1] and DetectTime > 2017-01-01T12:00:00Z')
+    )
+    DEMO_DATA = dumps(DEMO_RULE)
+    print(repr(DEMO_DATA))
+    print(repr(loads(DEMO_DATA)))
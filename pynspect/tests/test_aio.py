@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.aio` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import sys
+import threading
+import unittest
+
+# The tested module uses syntax and API available only in Python 3.7 or newer,
+# it must not be imported at all on older interpreters.
+if sys.version_info >= (3, 7):
+    import asyncio
+    import concurrent.futures
+    from pynspect.aio import afilter
+else:
+    afilter = None
+
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+from pynspect.tests import test_filters
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+class AsyncSource(object):
+    """
+    Asynchronous iterator over given list of data structures, that records the
+    number of consumed items and optionally fails at the end.
+    """
+    def __init__(self, items, failure = None):
+        self.items = list(items)
+        self.failure = failure
+        self.consumed = 0
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        if self.consumed >= len(self.items):
+            if self.failure:
+                raise self.failure
+            raise StopAsyncIteration  # pylint: disable=locally-disabled,undefined-variable
+        self.consumed += 1
+        return asyncio.sleep(0, result = self.items[self.consumed - 1])
+
+
+@unittest.skipIf(afilter is None, "Requires Python 3.7 or newer")
+class TestAsyncFilter(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.aio` module.
+    """
+
+    test_messages = [dict(test_filters.TestDataObjectFilter.test_msg1, ConnCount = idx) for idx in range(50)]
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def _collect(self, agen, limit = None):
+        """
+        Collect items yielded by given asynchronous generator.
+        """
+        result = []
+        while limit is None or len(result) < limit:
+            try:
+                result.append(self.loop.run_until_complete(agen.__anext__()))
+            except StopAsyncIteration:  # pylint: disable=locally-disabled,undefined-variable
+                break
+        return result
+
+    def test_01_filtering(self):
+        """
+        Compare results of asynchronous filtering with results of the data object filter.
+        """
+        self.maxDiff = None
+
+        flt = DataObjectFilter(PynspectFilterParser)
+        for rule_str in ('ConnCount > 20 and ConnCount % 3 == 1', 'ConnCount < 5 or ConnCount == 49', 'Missing'):
+            expected = flt.filter_many(flt.prepare(rule_str), self.test_messages, matches = True)
+            self.assertEqual(self._collect(afilter(rule_str, AsyncSource(self.test_messages), batch_size = 7)), expected, rule_str)
+            self.assertEqual(self._collect(afilter(rule_str, self.test_messages, batch_size = 100)), expected, rule_str)
+
+        rule = flt.prepare('ConnCount == 3')
+        self.assertEqual(self._collect(afilter(rule, AsyncSource(self.test_messages), flt = DataObjectFilter())), [self.test_messages[3]])
+        self.assertEqual(self._collect(afilter(rule, AsyncSource([]))), [])
+
+        class NegatedFilter(DataObjectFilter):
+            binops_comparison = dict(DataObjectFilter.binops_comparison, OP_EQ = lambda x, y: x != y)
+
+        flt = NegatedFilter(PynspectFilterParser)
+        rule = flt.prepare('ConnCount == 3 and ConnCount < 5')
+        expected = [msg for msg in self.test_messages if flt.filter(rule, msg)]
+        self.assertEqual(expected, self.test_messages[:3] + self.test_messages[4:5])
+        self.assertEqual(self._collect(afilter(rule, AsyncSource(self.test_messages), flt = flt)), expected)
+
+    def test_02_offload(self):
+        """
+        Perform tests of evaluation offloaded to executor.
+        """
+        self.maxDiff = None
+
+        threads = set()
+        def where(args):
+            threads.add(threading.current_thread().name)
+            return args[0]
+
+        flt = DataObjectFilter(PynspectFilterParser)
+        flt.register_function('where', where)
+        with concurrent.futures.ThreadPoolExecutor(2, thread_name_prefix = 'offload') as executor:
+            result = self._collect(afilter('where(ConnCount) > 47', AsyncSource(self.test_messages), flt = flt, offload = True, executor = executor))
+        self.assertEqual(result, self.test_messages[48:])
+        self.assertTrue(threads)
+        self.assertTrue(all(name.startswith('offload') for name in threads))
+
+    def test_03_backpressure(self):
+        """
+        Perform tests of bounded reading ahead and error propagation.
+        """
+        self.maxDiff = None
+
+        source = AsyncSource(self.test_messages)
+        agen = afilter('ConnCount < 50', source, batch_size = 5, queue_size = 10)
+        self.assertEqual(self._collect(agen, 1), [self.test_messages[0]])
+        self.assertTrue(source.consumed <= 16)
+        self.loop.run_until_complete(agen.aclose())
+        self.loop.run_until_complete(asyncio.sleep(0))
+        self.assertEqual([task for task in asyncio.all_tasks(self.loop) if not task.done()], [])
+
+        source = AsyncSource(self.test_messages, ValueError("Broken source"))
+        agen = afilter('ConnCount > 40', source, batch_size = 5)
+        self.assertEqual(self._collect(agen, 9), self.test_messages[41:])
+        self.assertRaises(ValueError, self._collect, agen)
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.columnar` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import random
+import datetime
+import unittest
+
+from pynspect import columnar
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler
+from pynspect.columnar import ColumnarFilter
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+def _random_message(rnd):
+    """
+    Generate random message with optional attributes of various data types.
+    """
+    base = datetime.datetime(2016, 6, 21, 11, 0, 0)
+    msg = {}
+    if rnd.random() < 0.8:
+        msg['ConnCount'] = rnd.choice([0, 1, 2, 3, 5, 10, -4])
+    if rnd.random() < 0.8:
+        msg['Format'] = rnd.choice(['IDEA0', 'IDEA1'])
+    if rnd.random() < 0.7:
+        msg['Category'] = rnd.sample(['Recon.Scanning', 'Spam', 'Attempt.Login'], rnd.randint(1, 2))
+    if rnd.random() < 0.7:
+        msg['Ratio'] = rnd.choice([0.0, 0.5, 1.5, 3.25])
+    if rnd.random() < 0.7:
+        msg['DetectTime'] = base + datetime.timedelta(minutes = rnd.randint(-100, 100))
+    if rnd.random() < 0.6:
+        msg['EventTime'] = base + datetime.timedelta(minutes = rnd.randint(-100, 100))
+    if rnd.random() < 0.6:
+        msg['Source'] = [{'IP4': [rnd.choice(['192.168.0.5', '10.0.0.1', '8.8.8.8'])]}]
+    if rnd.random() < 0.3:
+        msg['Mixed'] = rnd.choice([1, 'a', 2.5, True])
+    if rnd.random() < 0.5:
+        msg['Node'] = [{'Name': rnd.choice(['a.b', 'c.d'])} for _ in range(rnd.randint(1, 2))]
+    return msg
+
+
+@unittest.skipIf(columnar.numpy is None, "NumPy library is not available")
+class TestColumnarFilter(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.columnar` module.
+    """
+
+    test_messages = [_random_message(random.Random(idx)) for idx in range(500)]
+
+    test_rules = [
+        'ConnCount > 2',
+        'ConnCount >= 3 or Format == "IDEA0"',
+        'not ConnCount',
+        'not exists ConnCount',
+        'ConnCount + 1 > 3',
+        'ConnCount * 2 == 4 and Ratio < 1',
+        'ConnCount / 2 > 1',
+        'ConnCount % 3 == 1',
+        'Ratio % 2 > 1',
+        'Ratio * ConnCount > 1',
+        'Ratio / ConnCount > 0',
+        'not (Ratio - 0.5)',
+        '2 < ConnCount',
+        'ConnCount in [1, 2, 3.0]',
+        'Category in ["Spam"]',
+        'Category in ["Spam", "Recon.Scanning"] and not Format == "IDEA1"',
+        'Category == "Spam" or Category like "Login"',
+        'Format like "IDEA"',
+        'Format like "0$"',
+        'Format is ["IDEA0"]',
+        'Format in ["IDEA0"] or Ratio is [0.5]',
+        'Node.Name == "a.b"',
+        'EventTime > DetectTime',
+        'exists EventTime and exists DetectTime and EventTime > DetectTime',
+        'DetectTime > 2016-06-21T11:30:00Z',
+        'DetectTime - 00:30:00 < 2016-06-21T10:30:00Z',
+        'EventTime - DetectTime > 00:10:00',
+        'Source.IP4 in [192.168.0.0/24]',
+        'Source.IP4 == 10.0.0.1',
+        'ConnCount xor Format',
+        '(ConnCount > 2) xor (Ratio > 1)',
+        'not (ConnCount > 2 and Ratio)',
+        '(ConnCount > 2 or Ratio) == 1',
+        '(ConnCount or Ratio) + 1 > 2',
+        'ConnCount and Format and Ratio',
+        'not (not ConnCount)',
+        'exists Missing or ConnCount == 0',
+        'Mixed == 1',
+        'Mixed',
+        'size(Category) > 1',
+        'size(Node.Name) == 2',
+        'time() > 5 and ConnCount',
+    ]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.cflt = ColumnarFilter(chunk_size = 97)
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+
+    def test_01_equivalence(self):
+        """
+        Compare results of columnar filter with results of the data object filter.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            for rule in (rule, self.cpl.compile(rule)):
+                try:
+                    expected = [bool(self.flt.filter(rule, msg)) for msg in self.test_messages]
+                except Exception as exc:  # pylint: disable=locally-disabled,broad-except
+                    self.assertRaises(type(exc), self.cflt.filter, rule, self.test_messages)
+                    continue
+                self.assertEqual(self.cflt.filter(rule, self.test_messages).tolist(), expected, rule_str)
+                self.assertEqual(self.cflt.filter_many(rule, self.test_messages), expected, rule_str)
+                self.assertEqual(self.cflt.filter_many(rule, iter(self.test_messages), matches = True), [msg for msg, res in zip(self.test_messages, expected) if res], rule_str)
+
+    def test_02_special_cases(self):
+        """
+        Perform tests of special cases.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('ConnCount > 2')
+        self.assertEqual(self.cflt.filter(rule, []).tolist(), [])
+        self.assertEqual(self.cflt.filter_many(rule, []), [])
+        self.assertEqual(self.cflt.filter(rule, [{}, {'ConnCount': None}, {'ConnCount': [3, None]}, {'ConnCount': 2 ** 60}]).tolist(), [False, False, True, True])
+        self.assertEqual(self.cflt.filter(self.psr.parse('ConnCount * 4 > 2'), [{'ConnCount': 2 ** 52}, {'ConnCount': 1}]).tolist(), [True, True])
+        self.assertEqual(self.cflt.filter(self.psr.parse('ConnCount / Zero'), [{'ConnCount': 2, 'Zero': 0}, {'ConnCount': 2, 'Zero': 2}]).tolist(), [False, True])
+        self.assertEqual(self.cflt.filter(self.psr.parse('1 and 0'), [{}, {}]).tolist(), [False, False])
+
+        self.assertRaises(TypeError, self.cflt.filter, self.psr.parse('ConnCount > "abc"'), [{'ConnCount': 2}])
+        self.assertRaises(TypeError, self.cflt.filter, self.psr.parse('Format > 2'), [{'Format': 'IDEA0'}])
+
+        numpy = columnar.numpy
+        try:
+            columnar.numpy = None
+            self.assertRaises(ImportError, ColumnarFilter)
+        finally:
+            columnar.numpy = numpy
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,12 +19,19 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import time
+import datetime
 import unittest
 
-from pynspect.rules import ConstantRule, NumberRule
+import pynspect.compilers
+from pynspect.rules import FilteringRuleException, ConstantRule, NumberRule,\
+    VariableRule, FunctionRule
 from pynspect.gparser import PynspectFilterParser
-from pynspect.compilers import IDEAFilterCompiler, clean_variable, compile_ip_v4,\
-    compile_ip_v6, compile_timedelta, compile_datetime, compile_timeoper
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler, ClosureFilterCompiler,\
+    AdaptiveFilterCompiler, SourceFilterCompiler, FilterOptimizer, source_cache_size, source_cache_clear,\
+    ConversionRule, clean_variable, compile_ip_v4, compile_ip_v6,\
+    compile_timedelta, compile_datetime, compile_timeoper
 
 #-------------------------------------------------------------------------------
 # NOTE: Sorry for the long lines in this file. They are deliberate, because the
@@ -353,6 +360,447 @@ class TestIDEAFilterCompiler(unittest.TestCase):
         res = cpl.compile(rule)
         self.assertEqual(repr(res), "COMPBINOP(MATHBINOP(VARIABLE('DetectTime') OP_PLUS TIMEDELTA(datetime.timedelta(0, 3600))) OP_GT FUNCTION(utcnow()))")
 
+    def test_06_regex_compilations(self):
+        """
+        Perform compilation tests of regular expression patterns.
+        """
+        self.maxDiff = None
+
+        flt = DataObjectFilter()
+        cpl = IDEAFilterCompiler()
+        psr = PynspectFilterParser()
+        psr.build()
+
+        rule = psr.parse('ID like "e214d2d9"')
+        self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('ID') OP_LIKE CONSTANT('e214d2d9'))")
+        res = cpl.compile(rule)
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('ID') OP_LIKE REGEX('e214d2d9'))")
+        self.assertEqual(str(res), '(ID OP_LIKE "e214d2d9")')
+        self.assertEqual(flt.filter(res, self.test_msg1), True)
+        self.assertEqual(repr(cpl.compile(res)), "COMPBINOP(VARIABLE('ID') OP_LIKE REGEX('e214d2d9'))")
+
+        rule = psr.parse('Note like ["^SSH", "login$"]')
+        res = cpl.compile(rule)
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('Note') OP_LIKE LIST(REGEX('^SSH'), REGEX('login$')))")
+        self.assertEqual(flt.filter(res, self.test_msg1), True)
+
+        rule = psr.parse('Source.IP4 like "^188\\."')
+        res = cpl.compile(rule)
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('Source.IP4') OP_LIKE REGEX('^188\\\\.'))")
+        self.assertEqual(flt.filter(res, self.test_msg1), True)
+
+        rule = psr.parse('ConnCount like 2')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('ConnCount') OP_LIKE INTEGER(2))")
+
+        self.assertRaises(ValueError, cpl.compile, psr.parse('ID like "e214("'))
+        self.assertRaises(ValueError, ClosureFilterCompiler().compile, psr.parse('ID like "e214("'))
+        self.assertRaises(ValueError, SourceFilterCompiler().compile, psr.parse('ID like ["e214", "e214("]'))
+
+    def test_07_set_list_compilations(self):
+        """
+        Perform compilation tests of constant lists for IN operations.
+        """
+        self.maxDiff = None
+
+        flt = DataObjectFilter()
+        cpl = IDEAFilterCompiler()
+        psr = PynspectFilterParser()
+        psr.build()
+
+        rule = psr.parse('Category in ["Phishing", "Attempt.Login"]')
+        res = cpl.compile(rule)
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('Category') OP_IN SETLIST(CONSTANT('Phishing'), CONSTANT('Attempt.Login')))")
+        self.assertEqual(flt.filter(res, self.test_msg1), True)
+        self.assertTrue(res.right.values() is res.right.values())
+        self.assertEqual(res.right.values(), ['Phishing', 'Attempt.Login'])
+
+        rule = psr.parse('ConnCount in [1, 2.5, 3]')
+        res = cpl.compile(rule)
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('ConnCount') OP_IN SETLIST(INTEGER(1), FLOAT(2.5), INTEGER(3)))")
+        self.assertEqual(flt.filter(res, self.test_msg1), False)
+
+        rule = psr.parse('Category in ["Phishing", Format]')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('Category') OP_IN LIST(CONSTANT('Phishing'), VARIABLE('Format')))")
+        rule = psr.parse('Source.IP4 in ["188.14.166.39", "10.0.0.1"]')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('Source.IP4') OP_IN IPLIST(IPV4(IP4('188.14.166.39')), IPV4(IP4('10.0.0.1'))))")
+        rule = psr.parse('Category is ["Attempt.Login"]')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('Category') OP_IS LIST(CONSTANT('Attempt.Login')))")
+
+
+class TestClosureFilterCompiler(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.compilers.ClosureFilterCompiler`.
+    """
+
+    test_msg1 = TestIDEAFilterCompiler.test_msg1
+
+    test_rules = [
+        'ID like "e214d2d9"',
+        'ID like "xxxxxxxx"',
+        'ID == "e214d2d9-359b-443d-993d-3cc5637107a0"',
+        'Category in ["Phishing" , "Attempt.Login"]',
+        'Category IN ["Phishing" , "Spam"]',
+        'Category is ["Attempt.Login"]',
+        'ConnCount > 1 and ConnCount < 3',
+        'ConnCount >= 3 or ConnCount <= 1',
+        'ConnCount == 2 xor Format == "IDEA0"',
+        'not exists Target.Anonymised',
+        'exists Missing.Attribute',
+        'not Missing.Attribute',
+        'Missing.Attribute == 1',
+        '(ConnCount + 10) > 11',
+        'ConnCount * 5',
+        'ConnCount + Missing',
+        'Node.Name == "cz.uhk.apate.cowrie" && Node.SW in ["Kippo"]',
+        'size(Node.Type) > 3',
+        'strlen(Note) == 17',
+        'Source.IP4 == 188.14.166.39',
+    ]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+        self.cfc = ClosureFilterCompiler(self.flt.functions)
+
+    def test_01_equivalence(self):
+        """
+        Compare results of compiled closures with results of the filter.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            self.assertEqual(self.cfc.compile(rule)(self.test_msg1), self.flt.filter(rule, self.test_msg1), rule_str)
+
+            rule = self.cpl.compile(rule)
+            self.assertEqual(self.cfc.compile(rule)(self.test_msg1), self.flt.filter(rule, self.test_msg1), rule_str)
+
+    def test_02_special_rules(self):
+        """
+        Perform tests of special rules and error conditions.
+        """
+        self.maxDiff = None
+
+        rule = ConversionRule(len, VariableRule('Node.Type'))
+        self.assertEqual(self.cfc.compile(rule)(self.test_msg1), 4)
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), 4)
+
+        self.assertRaises(FilteringRuleException, self.cfc.compile, FunctionRule('invalid'))
+        self.assertRaises(FilteringRuleException, ClosureFilterCompiler().compile, FunctionRule('size', VariableRule('Node.Type')))
+
+    def test_03_short_circuit(self):
+        """
+        Perform tests of short-circuit evaluation of logical operations.
+        """
+        self.maxDiff = None
+
+        failing = ClosureFilterCompiler({'fail': self.fail})
+        for rule_str, result in (
+                ('exists Missing and fail()', []),
+                ('exists ConnCount or fail()', [2]),
+                ('ConnCount == 1 && fail() && fail() && fail()', False),
+                ('ConnCount == 2 || fail() || fail()', True),
+                ('ConnCount == 2 and (Format == "IDEA0" and ID like "e214")', True),
+                ('ConnCount == 2 and (Format == "IDEA0" and ID like "xxxx")', False),
+                ('Missing or ConnCount < 2 or Missing.Attr', []),
+            ):
+            self.assertEqual(failing.compile(self.psr.parse(rule_str))(self.test_msg1), result, rule_str)
+
+
+class TestAdaptiveFilterCompiler(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.compilers.AdaptiveFilterCompiler`.
+    """
+
+    test_msg1 = TestIDEAFilterCompiler.test_msg1
+    test_rules = TestClosureFilterCompiler.test_rules + [
+        'ConnCount < 3 and Format == "IDEA0" and Node.SW in ["Kippo"]',
+        'ConnCount > 3 or Format == "IDEA1" or not exists Missing',
+        '(ConnCount or Missing) and not (Missing and ConnCount)',
+        'ConnCount and (Missing or Format == "IDEA0") xor Missing',
+        'exists (Missing or ConnCount)',
+    ]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+
+    def test_01_equivalence(self):
+        """
+        Compare results of adaptively compiled functions with results of the filter.
+        """
+        self.maxDiff = None
+
+        afc = AdaptiveFilterCompiler(self.flt.functions, interval = 1, sample = 1)
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            for rule in (rule, self.cpl.compile(rule)):
+                evaluate = afc.compile(rule)
+                for _ in range(5):
+                    self.assertEqual(evaluate(self.test_msg1), bool(self.flt.filter(rule, self.test_msg1)), rule_str)
+
+    def test_02_reordering(self):
+        """
+        Perform tests of reordering operands according to runtime statistics.
+        """
+        self.maxDiff = None
+
+        calls = []
+        def expensive(args):
+            calls.append(args)
+            time.sleep(0.001)
+            return True
+
+        afc = AdaptiveFilterCompiler({'expensive': expensive}, interval = 10, sample = 1)
+        evaluate = afc.compile(self.psr.parse('expensive() and ConnCount > 3 and Format == "IDEA0"'))
+        self.assertEqual(len(evaluate.chains), 1)
+        self.assertEqual([item['operand'] for item in evaluate.statistics()[0]], ['expensive()', '(ConnCount OP_GT 3)', '(Format OP_EQ "IDEA0")'])
+
+        for _ in range(10):
+            self.assertEqual(evaluate(self.test_msg1), False)
+        self.assertEqual(len(calls), 10)
+        self.assertEqual([item['operand'] for item in evaluate.statistics()[0]], ['(Format OP_EQ "IDEA0")', '(ConnCount OP_GT 3)', 'expensive()'])
+
+        for _ in range(100):
+            self.assertEqual(evaluate(self.test_msg1), False)
+        self.assertEqual(len(calls), 10)
+        self.assertEqual(evaluate(dict(self.test_msg1, ConnCount = 5)), True)
+        self.assertEqual(len(calls), 11)
+
+        # Chains, whose value is not used as a truth value, are never reordered.
+        evaluate = afc.compile(self.psr.parse('(ConnCount or Format) == 2 and not (Missing and ConnCount)'))
+        self.assertEqual(len(evaluate.chains), 1)
+        for _ in range(20):
+            self.assertEqual(evaluate(self.test_msg1), True)
+
+
+class TestSourceFilterCompiler(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.compilers.SourceFilterCompiler`.
+    """
+
+    test_msg1 = TestIDEAFilterCompiler.test_msg1
+    test_rules = TestClosureFilterCompiler.test_rules
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+        self.sfc = SourceFilterCompiler(self.flt.functions)
+        source_cache_clear()
+
+    def test_01_equivalence(self):
+        """
+        Compare results of compiled functions with results of the filter.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            self.assertEqual(self.sfc.compile(rule)(self.test_msg1), self.flt.filter(rule, self.test_msg1), rule_str)
+
+            rule = self.cpl.compile(rule)
+            self.assertEqual(self.sfc.compile(rule)(self.test_msg1), self.flt.filter(rule, self.test_msg1), rule_str)
+
+    def test_02_source_and_cache(self):
+        """
+        Perform tests of generated source code and compilation cache.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('ConnCount > 1 and Format == "IDEA0"')
+        self.assertEqual(source_cache_size(), 0)
+        func = self.sfc.compile(rule)
+        self.assertEqual(source_cache_size(), 1)
+        self.assertTrue(self.sfc.compile(self.psr.parse('ConnCount > 1 and Format == "IDEA0"')) is func)
+        self.assertEqual(source_cache_size(), 1)
+        self.assertEqual(func.source, self.sfc.source(rule))
+        self.assertTrue("obj['ConnCount']" in func.source)
+        self.assertTrue("_jpath" not in func.source)
+        self.assertTrue(func.source.startswith('# {}'.format(repr(rule))))
+
+        SourceFilterCompiler().compile(rule)
+        self.assertEqual(source_cache_size(), 2)
+        source_cache_clear()
+        self.assertEqual(source_cache_size(), 0)
+
+        rule = self.psr.parse('ConnCount > 5 or ConnCount == 2 or Format == "IDEA0"')
+        func = self.sfc.compile(rule)
+        self.assertTrue("_p0 = None" in func.source)
+        self.assertTrue("if _p0 is None:" in func.source)
+        self.assertTrue("obj['Format']" in func.source)
+        self.assertEqual(func(self.test_msg1), True)
+
+        rule = self.psr.parse('Source[1].Port == 80 or Node.Name like "cowrie"')
+        func = self.sfc.compile(rule)
+        self.assertTrue("_jpath(obj, 'Source[1].Port')" in func.source)
+        self.assertTrue("_jpath(obj, 'Node.Name')" not in func.source)
+        self.assertEqual(func(self.test_msg1), True)
+
+        rule = ConversionRule(len, VariableRule('Node.Type'))
+        self.assertEqual(self.sfc.compile(rule)(self.test_msg1), 4)
+        self.assertRaises(FilteringRuleException, self.sfc.compile, FunctionRule('invalid'))
+
+    def test_03_cache_keys(self):
+        """
+        Perform tests of structural keys and size limit of compilation cache.
+        """
+        self.maxDiff = None
+
+        func_a = self.sfc.compile(ConversionRule(lambda x: 'a', VariableRule('ConnCount')))
+        func_b = self.sfc.compile(ConversionRule(lambda x: 'b', VariableRule('ConnCount')))
+        self.assertEqual(source_cache_size(), 2)
+        self.assertEqual(func_a(self.test_msg1), 'a')
+        self.assertEqual(func_b(self.test_msg1), 'b')
+
+        class CustomCompiler(SourceFilterCompiler):
+            pass
+
+        rule = self.psr.parse('ConnCount == 2')
+        negated = SourceFilterCompiler(self.flt.functions)
+        negated.binops_comparison = dict(negated.binops_comparison, OP_EQ = lambda x, y: x != y)
+        for compilers in ((negated, self.sfc), (self.sfc, negated)):
+            source_cache_clear()
+            self.assertEqual([cpl.compile(rule)(self.test_msg1) for cpl in compilers], [compilers[0] is self.sfc, compilers[1] is self.sfc])
+            self.assertEqual(source_cache_size(), 2)
+        self.assertFalse(CustomCompiler(self.flt.functions).compile(rule) is self.sfc.compile(rule))
+
+        limit = pynspect.compilers.SOURCE_CACHE_LIMIT
+        pynspect.compilers.SOURCE_CACHE_LIMIT = 3
+        try:
+            source_cache_clear()
+            funcs = [self.sfc.compile(self.psr.parse('ConnCount > {}'.format(i))) for i in range(3)]
+            self.assertTrue(self.sfc.compile(self.psr.parse('ConnCount > 0')) is funcs[0])
+            self.sfc.compile(self.psr.parse('ConnCount > 3'))
+            self.assertEqual(source_cache_size(), 3)
+            self.assertTrue(self.sfc.compile(self.psr.parse('ConnCount > 0')) is funcs[0])
+            self.assertTrue(self.sfc.compile(self.psr.parse('ConnCount > 1')) is not funcs[1])
+        finally:
+            pynspect.compilers.SOURCE_CACHE_LIMIT = limit
+
+    def test_04_short_circuit(self):
+        """
+        Perform tests of short-circuit evaluation of logical operations.
+        """
+        self.maxDiff = None
+
+        failing = SourceFilterCompiler({'fail': self.fail})
+        for rule_str, result in (
+                ('exists Missing and fail()', []),
+                ('exists ConnCount or fail()', [2]),
+                ('ConnCount == 1 && fail() && fail() && fail()', False),
+                ('ConnCount == 2 || fail() || fail()', True),
+                ('Missing or ConnCount < 2 or Missing.Attr', []),
+            ):
+            self.assertEqual(failing.compile(self.psr.parse(rule_str))(self.test_msg1), result, rule_str)
+
+
+class TestFilterOptimizer(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.compilers.FilterOptimizer`.
+    """
+
+    test_msg1 = TestIDEAFilterCompiler.test_msg1
+    test_rules = TestClosureFilterCompiler.test_rules + [
+        '1 and ConnCount > 1',
+        'ConnCount > 1 and 1',
+        '0 or ConnCount and Format == "IDEA0"',
+        'ConnCount or 0',
+        'Missing or 0',
+        'Missing and 0',
+        'ConnCount and 0 and fail()',
+        'ConnCount and ConnCount and ConnCount',
+        'Format and ConnCount and Format',
+        'not (not ConnCount)',
+        'not (not Missing)',
+        '(1 + 2 * 3 > 5) or fail()',
+        '0 xor ConnCount',
+        '1 xor ConnCount',
+        'ConnCount > (1 + 1) or (ConnCount and 0 or Format == "IDEA0")',
+        'exists ConnCount and exists Missing',
+        '"abc" == "abc" and ID like "e214d2d9"',
+    ]
+
+    def setUp(self):
+        self.flt = DataObjectFilter({'fail': self.fail})
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+        self.opt = FilterOptimizer()
+
+    def test_01_simplifications(self):
+        """
+        Perform tests of constant folding and algebraic simplifications.
+        """
+        self.maxDiff = None
+
+        for rule_str, result, result_bool in (
+                ('1 and ConnCount', "VARIABLE('ConnCount')", "VARIABLE('ConnCount')"),
+                ('ConnCount or 0', "LOGBINOP(VARIABLE('ConnCount') OP_OR INTEGER(0))", "VARIABLE('ConnCount')"),
+                ('ConnCount and 0 and fail()', "LOGBINOP(VARIABLE('ConnCount') OP_AND INTEGER(0))", "BOOLEAN(False)"),
+                ('ConnCount and Format and ConnCount', "LOGBINOP(VARIABLE('ConnCount') OP_AND LOGBINOP(VARIABLE('Format') OP_AND VARIABLE('ConnCount')))", "LOGBINOP(VARIABLE('ConnCount') OP_AND VARIABLE('Format'))"),
+                ('ConnCount and ConnCount and Format', "LOGBINOP(VARIABLE('ConnCount') OP_AND VARIABLE('Format'))", "LOGBINOP(VARIABLE('ConnCount') OP_AND VARIABLE('Format'))"),
+                ('ConnCount or (Format or ConnCount > 1)', "LOGBINOP(VARIABLE('ConnCount') OP_OR LOGBINOP(VARIABLE('Format') OP_OR COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(1))))", "LOGBINOP(VARIABLE('ConnCount') OP_OR LOGBINOP(VARIABLE('Format') OP_OR COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(1))))"),
+                ('not (not ConnCount)', "UNOP(OP_NOT UNOP(OP_NOT VARIABLE('ConnCount')))", "VARIABLE('ConnCount')"),
+                ('not 0', "BOOLEAN(True)", "BOOLEAN(True)"),
+                ('exists ConnCount', "VARIABLE('ConnCount')", "VARIABLE('ConnCount')"),
+                ('(1 + 2 * 3 > 5) or fail()', "BOOLEAN(True)", "BOOLEAN(True)"),
+                ('ConnCount > 2 * 2.5', "COMPBINOP(VARIABLE('ConnCount') OP_GT FLOAT(5.0))", "COMPBINOP(VARIABLE('ConnCount') OP_GT FLOAT(5.0))"),
+                ('"a" in ["a", "b"] and ConnCount', "VARIABLE('ConnCount')", "VARIABLE('ConnCount')"),
+                ('0 xor ConnCount', "VARIABLE('ConnCount')", "VARIABLE('ConnCount')"),
+                ('1 xor 0', "BOOLEAN(True)", "BOOLEAN(True)"),
+                ('ConnCount', "VARIABLE('ConnCount')", "VARIABLE('ConnCount')"),
+                ('5', "INTEGER(5)", "BOOLEAN(True)"),
+            ):
+            rule = self.psr.parse(rule_str)
+            self.assertEqual(repr(self.opt.compile(rule)), result, rule_str)
+            self.assertEqual(repr(self.opt.compile(rule, boolean = True)), result_bool, rule_str)
+
+        rule = self.psr.parse('1 and ConnCount > 1')
+        rule_repr = repr(rule)
+        self.opt.compile(rule, boolean = True)
+        self.assertEqual(repr(rule), rule_repr)
+
+    def test_02_equivalence(self):
+        """
+        Compare results of optimized rules with results of original rules.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            for rule in (rule, self.cpl.compile(rule)):
+                try:
+                    result = self.flt.filter(rule, self.test_msg1)
+                except AssertionError:
+                    continue
+                self.assertEqual(self.flt.filter(self.opt.compile(rule), self.test_msg1), result, rule_str)
+                self.assertEqual(bool(self.flt.filter(self.opt.compile(rule, boolean = True), self.test_msg1)), bool(result), rule_str)
+
+    def test_03_constants(self):
+        """
+        Perform tests of replacing functions with constants.
+        """
+        self.maxDiff = None
+
+        opt = FilterOptimizer({'utcnow': datetime.datetime(2016, 6, 21, 11, 30), 'time': 1466508600.0, 'bogus': object()})
+        for rule_str, result in (
+                ('DetectTime < (utcnow() - 02:00:00)', "COMPBINOP(VARIABLE('DetectTime') OP_LT DATETIME(datetime.datetime(2016, 6, 21, 9, 30)))"),
+                ('DetectTime > (utcnow() + 3600) or EventTime < utcnow()', "LOGBINOP(COMPBINOP(VARIABLE('DetectTime') OP_GT DATETIME(datetime.datetime(2016, 6, 21, 12, 30))) OP_OR COMPBINOP(VARIABLE('EventTime') OP_LT DATETIME(datetime.datetime(2016, 6, 21, 11, 30))))"),
+                ('(time() - 60) > 1466508000', "BOOLEAN(True)"),
+                ('time(ConnCount) > 5', "COMPBINOP(FUNCTION(time(VARIABLE('ConnCount'),)) OP_GT INTEGER(5))"),
+                ('bogus() > 5', "COMPBINOP(FUNCTION(bogus()) OP_GT INTEGER(5))"),
+            ):
+            self.assertEqual(repr(opt.compile(self.cpl.compile(self.psr.parse(rule_str)))), result, rule_str)
+
+        rule = self.cpl.compile(self.psr.parse('DetectTime < (utcnow() - 02:00:00)'))
+        self.assertEqual(repr(self.opt.compile(rule)), repr(rule))
+
 
 #-------------------------------------------------------------------------------
 
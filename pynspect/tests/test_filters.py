@@ -20,12 +20,15 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import threading
 import unittest
 
-from pynspect.rules import IntegerRule, VariableRule, ConstantRule, ListRule,\
+from pynspect.rules import FilteringRuleException, IntegerRule, VariableRule, ConstantRule, ListRule,\
     LogicalBinOpRule, UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule
 from pynspect.gparser import PynspectFilterParser
-from pynspect.filters import DataObjectFilter
+from pynspect.filters import DataObjectFilter, EvaluationClock, RuleCache
+from pynspect.gparser import PynspectGrammarSyntaxError
+from pynspect.compilers import IDEAFilterCompiler
 
 
 #-------------------------------------------------------------------------------
@@ -369,6 +372,229 @@ class TestDataObjectFilter(unittest.TestCase):
         self.assertEqual(repr(rule), "COMPBINOP(FUNCTION(time()) OP_GT FLOAT(500.12))")
         self.assertEqual(self.flt.filter(rule, self.test_msg1), True)
 
+    def test_09_short_circuit(self):
+        """
+        Perform tests of short-circuit evaluation of logical operations.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('exists Missing and bogus(ID)')
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), [])
+        rule = self.psr.parse('exists ConnCount or bogus(ID)')
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), [2])
+        rule = self.psr.parse('ConnCount == 1 && bogus(ID) && bogus(ID)')
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), False)
+        rule = self.psr.parse('ConnCount == 2 || bogus(ID)')
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), True)
+        rule = self.psr.parse('exists ConnCount and bogus(ID)')
+        self.assertRaises(FilteringRuleException, self.flt.filter, rule, self.test_msg1)
+        rule = self.psr.parse('exists Missing xor bogus(ID)')
+        self.assertRaises(FilteringRuleException, self.flt.filter, rule, self.test_msg1)
+
+        class RecordingFilter(DataObjectFilter):
+            """
+            Filter recording the operands of logical operations.
+            """
+            operands = []
+            def binary_operation_logical(self, rule, left, right, **kwargs):
+                self.operands.append((rule.operation, left, right))
+                return super(RecordingFilter, self).binary_operation_logical(rule, left, right, **kwargs)
+
+        flt = RecordingFilter()
+        self.assertEqual(flt.filter(self.psr.parse('ConnCount == 2 or ConnCount > 1'), self.test_msg1), True)
+        self.assertEqual(flt.filter(self.psr.parse('exists Missing and ConnCount'), self.test_msg1), [])
+        self.assertEqual(flt.operands, [('OP_OR', True, True), ('OP_AND', [], [2])])
+
+    def test_10_filter_many(self):
+        """
+        Perform tests of batch filtering.
+        """
+        self.maxDiff = None
+
+        test_msg2 = dict(self.test_msg1, ConnCount = 5)
+        messages = [self.test_msg1, test_msg2, {}]
+
+        rule = self.psr.parse('ConnCount > 3')
+        self.assertEqual(self.flt.filter_many(rule, messages), [False, True, False])
+        self.assertEqual(self.flt.filter_many(rule, messages, matches = True), [test_msg2])
+        self.assertEqual(list(self.flt.ifilter_many(rule, iter(messages))), [False, True, False])
+        self.assertEqual(list(self.flt.ifilter_many(rule, iter(messages), True)), [test_msg2])
+        self.assertEqual(self.flt.filter_many(rule, []), [])
+
+        rule = self.psr.parse('exists ConnCount and (time() > 500.12) and (size(Node.Type) > 2)')
+        self.assertEqual(self.flt.filter_many(rule, messages), [True, True, False])
+        self.assertEqual(self.flt.filter_many(rule, messages, matches = True), [self.test_msg1, test_msg2])
+
+        for rule_str in ('ConnCount + 1', 'ID like "e214d2d9"', 'not exists Missing', 'Node.Name == "cz.uhk.apate.cowrie" && Node.SW in ["Kippo"]'):
+            rule = self.psr.parse(rule_str)
+            self.assertEqual(self.flt.filter_many(rule, messages), [bool(self.flt.filter(rule, msg)) for msg in messages], rule_str)
+            self.assertEqual(self.flt.filter_many(rule, messages, adaptive = True), [bool(self.flt.filter(rule, msg)) for msg in messages], rule_str)
+
+        rule = self.psr.parse('time(ID) > 5')
+        self.assertRaises(FilteringRuleException, self.flt.filter_many, rule, messages)
+
+        class NegatedFilter(DataObjectFilter):
+            """
+            Filter with redefined equality.
+            """
+            binops_comparison = dict(DataObjectFilter.binops_comparison, OP_EQ = lambda x, y: x != y)
+
+        class MissingFilter(DataObjectFilter):
+            """
+            Filter treating missing variables as zero.
+            """
+            def variable(self, rule, **kwargs):
+                return super(MissingFilter, self).variable(rule, **kwargs) or [0]
+
+        instance = DataObjectFilter()
+        instance.binops_comparison = NegatedFilter.binops_comparison
+        for flt in (NegatedFilter(), instance, MissingFilter()):
+            for rule_str in ('ConnCount == 2', '1 == 1', 'ConnCount == 5 or Missing == 0', 'not (Missing > 1)'):
+                rule = self.psr.parse(rule_str)
+                expected = [bool(flt.filter(rule, msg)) for msg in messages]
+                self.assertEqual(flt.filter_many(rule, messages), expected, rule_str)
+                self.assertEqual(flt.filter_many(rule, messages, adaptive = True), expected, rule_str)
+        self.assertEqual(NegatedFilter().filter_many(self.psr.parse('ConnCount == 2'), messages), [False, True, False])
+
+        rule = self.psr.parse('time() > 500.12 and ConnCount > 3')
+        self.assertEqual([bool(self.flt.compile_rule(rule, snapshot = False)(msg)) for msg in messages], [False, True, False])
+
+    def test_11_memoization(self):
+        """
+        Perform tests of variable value memoization during single evaluation.
+        """
+        self.maxDiff = None
+
+        class CountingDict(dict):
+            """
+            Dictionary counting key lookups.
+            """
+            lookups = []
+            def __contains__(self, key):
+                self.lookups.append(key)
+                return super(CountingDict, self).__contains__(key)
+
+        msg = CountingDict(ConnCount = 2, Note = "SSH login attempt")
+        for rule_str, result in (
+                ('ConnCount > 5 or ConnCount == 2 or (ConnCount + 1) == 3', True),
+                ('ConnCount in [1, 3] or strlen(Note) > ConnCount', True),
+            ):
+            rule = self.psr.parse(rule_str)
+            for evaluate in (lambda: self.flt.filter(rule, msg), lambda: self.flt.filter_many(rule, [msg])[0]):
+                del CountingDict.lookups[:]
+                self.assertEqual(evaluate(), result, rule_str)
+                self.assertEqual(sorted(CountingDict.lookups), sorted(set(CountingDict.lookups)), rule_str)
+            del CountingDict.lookups[:]
+            self.flt.filter(rule, msg)
+            self.flt.filter(rule, msg)
+            self.assertEqual(len(CountingDict.lookups), 2 * len(set(CountingDict.lookups)), rule_str)
+
+    def test_12_clock(self):
+        """
+        Perform tests of evaluation clock.
+        """
+        self.maxDiff = None
+
+        class CountingClock(EvaluationClock):
+            """
+            Evaluation clock counting captured snapshots.
+            """
+            ticks = 0
+            def tick(self):
+                self.ticks += 1
+                return super(CountingClock, self).tick()
+
+        messages = [self.test_msg1, dict(self.test_msg1, ConnCount = 5), {}]
+        rule_time = self.psr.parse('time() > 500.12 and time() == time() and utcnow() == utcnow()')
+        rule_plain = self.psr.parse('ConnCount > 3')
+
+        flt = DataObjectFilter(clock = CountingClock())
+        self.assertEqual(flt.filter(rule_time, self.test_msg1), True)
+        self.assertEqual(flt.clock.ticks, 1)
+        self.assertEqual(flt.filter(rule_time, self.test_msg1), True)
+        self.assertEqual(flt.clock.ticks, 2)
+        self.assertEqual(flt.filter(rule_plain, self.test_msg1), False)
+        self.assertEqual(flt.clock.ticks, 2)
+        self.assertEqual(flt.filter_many(rule_time, messages), [True, True, True])
+        self.assertEqual(flt.clock.ticks, 3)
+        flt.functions['time']([])
+        flt.functions['time']([])
+        self.assertEqual(flt.clock.ticks, 5)
+        self.assertRaises(FilteringRuleException, flt.functions['utcnow'], [1])
+
+        flt = DataObjectFilter(clock = CountingClock())
+        flt.register_function('probe', lambda args: 0 if flt.filter(rule_time, self.test_msg1) else 1)
+        self.assertEqual(flt.filter(self.psr.parse('time() + probe() == time()'), self.test_msg1), True)
+        self.assertEqual(flt.clock.ticks, 2)
+        memo_a, memo_b = {}, {}
+        self.assertTrue(flt.clock.now(memo_a) is flt.clock.now(memo_a))
+        self.assertTrue(flt.clock.now(memo_b) is not flt.clock.now(memo_a))
+
+        flt = DataObjectFilter(clock = CountingClock(granularity = 3600))
+        for _ in range(3):
+            self.assertEqual(flt.filter(rule_time, self.test_msg1), True)
+            self.assertEqual(flt.filter_many(rule_time, messages), [True, True, True])
+            flt.functions['time']([])
+        self.assertEqual(flt.clock.ticks, 1)
+
+        flt = DataObjectFilter(clock = CountingClock(granularity = 0))
+        self.assertEqual(flt.filter_many(rule_time, messages, matches = True), messages)
+        self.assertEqual(flt.clock.ticks, 4)
+        self.assertEqual(flt.filter_many(rule_plain, messages, adaptive = True), [False, True, False])
+
+    def test_13_cache(self):
+        """
+        Perform tests of cache of prepared rules.
+        """
+        self.maxDiff = None
+
+        cache = RuleCache(maxsize = 2)
+        flt1 = DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler, cache = cache)
+        flt2 = DataObjectFilter(flt1.parser, cache = cache)
+
+        rule = flt1.prepare('ConnCount > 1')
+        self.assertIs(flt1.prepare('ConnCount > 1'), rule)
+        self.assertEqual(flt1.filter(rule, self.test_msg1), True)
+        self.assertIsNot(flt2.prepare('ConnCount > 1'), rule)
+        self.assertEqual(cache.stats(), {'size': 2, 'maxsize': 2, 'hits': 1, 'misses': 2, 'evictions': 0})
+
+        flt1.prepare('ConnCount > 1')
+        flt1.prepare('ConnCount > 2')
+        self.assertIs(flt1.prepare('ConnCount > 1'), rule)
+        self.assertEqual(cache.stats(), {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 3, 'evictions': 1})
+
+        self.assertRaises(PynspectGrammarSyntaxError, flt1.prepare, 'ConnCount >')
+        self.assertRaises(PynspectGrammarSyntaxError, flt1.prepare, 'ConnCount >')
+        self.assertEqual(len(cache), 2)
+
+        self.assertEqual(cache.invalidate('ConnCount > 1'), 1)
+        self.assertEqual(cache.invalidate('ConnCount > 1'), 0)
+        self.assertIsNot(flt1.prepare('ConnCount > 1'), rule)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+        self.assertRaises(ValueError, RuleCache, 0)
+
+        cache = RuleCache()
+        rule = DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler, cache = cache).prepare('ConnCount > 1')
+        for _ in range(3):
+            self.assertIs(DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler, cache = cache).prepare('ConnCount > 1'), rule)
+        self.assertIsNot(DataObjectFilter(PynspectFilterParser, IDEAFilterCompiler(coercion = True), cache = cache).prepare('ConnCount > 1'), rule)
+        self.assertEqual(cache.stats(), {'size': 2, 'maxsize': 1024, 'hits': 3, 'misses': 2, 'evictions': 0})
+
+        cache = RuleCache(maxsize = 100)
+        keys = [('ConnCount > {}'.format(idx), None, None) for idx in range(10)]
+        results = []
+        def worker():
+            results.append([cache.get(key, lambda key = key: key[0].upper()) for key in keys * 10])
+        workers = [threading.Thread(target = worker) for _ in range(4)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        self.assertEqual(results, [[key[0].upper() for key in keys * 10]] * 4)
+        stats = cache.stats()
+        self.assertEqual((stats['size'], stats['hits'] + stats['misses'], stats['evictions']), (10, 400, 0))
+
 
 #-------------------------------------------------------------------------------
 
@@ -20,6 +20,7 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import pickle
 import unittest
 import datetime
 
@@ -28,7 +29,8 @@ from pynspect.rules import IntegerRule, VariableRule, ConstantRule,\
     LogicalBinOpRule, UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, ListRule
 from pynspect.gparser import PynspectFilterParser
 from pynspect.filters import DataObjectFilter
-from pynspect.compilers import IDEAFilterCompiler
+from pynspect.compilers import IDEAFilterCompiler, coercion_cache_size, coercion_cache_clear,\
+    coerce_datetime, coerce_ip_v4, coerce_ip_v6, parse_timestamp
 
 
 #-------------------------------------------------------------------------------
@@ -390,6 +392,65 @@ class TestDataObjectFilterIDEA(unittest.TestCase):
         self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('Source.IP4') OP_EQ IPV4(IP4('188.14.166.39')))")
         self.assertEqual(self.check_rule(rule), True)
 
+    def test_07_coercion(self):
+        """
+        Perform tests of coercion of message values.
+        """
+        self.maxDiff = None
+
+        cpl = IDEAFilterCompiler(coercion = True)
+        rule = cpl.compile(self.psr.parse('(Source.IP4 == 188.14.166.39)'))
+        self.assertEqual(repr(rule), "COMPBINOP(CONVERSION(VARIABLE('Source.IP4'):coerce_ip_v4) OP_EQ IPV4(IP4('188.14.166.39')))")
+        rule = cpl.compile(self.psr.parse('DetectTime + 3600'))
+        self.assertEqual(self.flt.filter(rule, self.test_msg1), datetime.datetime(2016, 6, 21, 14, 8, 27))
+
+        coercion_cache_clear()
+        for rule_str in (
+                '(DetectTime == 2016-06-21T13:08:27Z)',
+                '(DetectTime >= 2016-06-21T14:08:27Z)',
+                '(WinStartTime < WinEndTime) and (DetectTime > 2016-06-21T11:00:00Z)',
+                'DetectTime < (utcnow() + 05:00:00)',
+                '(Source.IP4 == 188.14.166.39)',
+                '(Source.IP4 in ["188.14.166.0/24","10.0.0.0/8","189.14.166.41"])',
+                '(Target.IP4 in [195.113.165.128/25])',
+                '(Target.IP4 == 195.113.165.130)',
+                '(Source.IP4 in [10.0.0.0/8]) or (ConnCount > 1)',
+                '(Source.IP6 in ["2001:db8::/32"]) or (Target.IP6 == "2001:db8::1")',
+            ):
+            rule = self.psr.parse(rule_str)
+            expected = self.flt.filter(self.cpl.compile(rule), self.msg_idea)
+            self.assertEqual(self.flt.filter(cpl.compile(rule), self.test_msg1), expected, rule_str)
+            self.assertEqual(self.flt.filter_many(cpl.compile(rule), [self.test_msg1]), [bool(expected)], rule_str)
+        self.assertEqual(coercion_cache_size(), 5)
+
+        msg = dict(self.test_msg1, DetectTime = "invalid", Source = [{"IP4": ["300.1.1.1", "188.14.166.39"]}])
+        self.assertEqual(self.flt.filter(cpl.compile(self.psr.parse('Source.IP4 == 188.14.166.39')), msg), True)
+        self.assertRaises(TypeError, self.flt.filter, cpl.compile(self.psr.parse('DetectTime > 2016-06-21T11:00:00Z')), msg)
+        self.assertEqual(coercion_cache_size(), 7)
+        coercion_cache_clear()
+        self.assertEqual(coercion_cache_size(), 0)
+
+        for coercion in (coerce_datetime, coerce_ip_v4, coerce_ip_v6):
+            self.assertTrue(pickle.loads(pickle.dumps(coercion)) is coercion)
+        rule = cpl.compile(self.psr.parse('Source.IP4 == 188.14.166.39 and DetectTime > 2016-06-21T11:00:00Z'))
+        self.assertEqual(pickle.loads(pickle.dumps(rule)), rule)
+        self.assertEqual(self.flt.filter(pickle.loads(pickle.dumps(rule)), self.test_msg1), True)
+
+    def test_08_timestamps(self):
+        """
+        Perform tests of parsing of RFC3339 timestamps in message values.
+        """
+        self.maxDiff = None
+
+        self.assertEqual(parse_timestamp('2016-06-21T13:08:27Z'), datetime.datetime(2016, 6, 21, 13, 8, 27))
+        self.assertEqual(parse_timestamp('2016-06-21t13:08:27z'), datetime.datetime(2016, 6, 21, 13, 8, 27))
+        self.assertEqual(parse_timestamp('2016-06-21 13:08:27Z'), datetime.datetime(2016, 6, 21, 13, 8, 27))
+        self.assertEqual(parse_timestamp('2016-06-21 15:08:27.25+02:00'), datetime.datetime(2016, 6, 21, 13, 8, 27, 250000))
+        self.assertEqual(parse_timestamp('2016-06-21  13:08:27Z'), None)
+        self.assertEqual(parse_timestamp('2016-06-21_13:08:27Z'), None)
+        self.assertEqual(parse_timestamp('2016-06-21 13:08:27'), None)
+        self.assertEqual(coerce_datetime(['2016-06-21 13:08:27Z', 'invalid']), [datetime.datetime(2016, 6, 21, 13, 8, 27), 'invalid'])
+
 
 #-------------------------------------------------------------------------------
 
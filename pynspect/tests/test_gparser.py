@@ -19,10 +19,15 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import os
 import six
+import shutil
+import tempfile
+import threading
 import unittest
 
-from pynspect.gparser import PynspectFilterParser, PynspectGrammarSyntaxError
+from pynspect.gparser import PynspectFilterParser, PynspectFilterDescentParser,\
+    PynspectGrammarSyntaxError, write_tables
 
 
 #-------------------------------------------------------------------------------
@@ -330,6 +335,132 @@ class TestPynspectFilterParser(unittest.TestCase):
         six.assertRaisesRegex(self, PynspectGrammarSyntaxError, 'Syntax error while parsing the grammar rule', self.psr.parse, 'Source/IP4 in [195.113.20.138')
         six.assertRaisesRegex(self, PynspectGrammarSyntaxError, 'Syntax error at', self.psr.parse, 'Description eq "SSH dictionary/bruteforce attack and Source/IP4 in [195.113.20.138')
 
+        for rule, position in (('1 2', 2), ('(1 + 2', None), ('Test == not 1', 8), ('not not 1', 4), ('[1, Test >= 2]', 9), ('func() and []', 12), ('size(1)) or 1', 7)):
+            try:
+                self.psr.parse(rule)
+                self.fail("Syntax error not raised for '{}'".format(rule))
+            except PynspectGrammarSyntaxError as exc:
+                self.assertEqual(exc.position, position, rule)
+
+
+class TestPynspectFilterDescentParser(TestPynspectFilterParser):
+    """
+    Unit test class for testing the :py:class:`pynspect.gparser.PynspectFilterDescentParser`
+    with all test cases of the *PLY* based parser.
+    """
+
+    def setUp(self):
+        self.psr = PynspectFilterDescentParser()
+        self.psr.build()
+
+    def test_08_equivalence(self):
+        """
+        Compare rule trees and syntax errors with the *PLY* based parser.
+        """
+        self.maxDiff = None
+
+        def parse(psr, rule):
+            try:
+                return repr(psr.parse(rule))
+            except PynspectGrammarSyntaxError as exc:
+                return (str(exc), exc.position)
+
+        psr = PynspectFilterParser()
+        for rule in (
+                '1 - 2 * 3 % 4 + 5 / 6',
+                'a or b and c xor d || e && f ^^ g or h',
+                'not exists Test and ? Test > 1 + 2 && ! A.B == 1 || C',
+                'exists not Test',
+                'size(Source.IP4 in [10.0.0.1, 10.0.0.2]) >= (1 + 2) * 3',
+                'utcnow() > DetectTime + 01:00:00 and Note like "login" xor ID in ["a"; "b"] or 1.5 < 2',
+                '((1)) == [127.0.0.1-127.0.0.5, ::1, 2016-06-21T12:00:00Z, 5D00:00:00, Var, "c"]',
+                '1 < 2 < 3 == (4 > 5)',
+                'Source.Port[0] + 1 and [1,2,3]',
+                '[', ']', ')', 'a and', 'and a', '1 +', 'size(', 'size(1', '[1,]', '[(1)]', '(a or)', 'a b', '1 == == 2'):
+            self.assertEqual(parse(self.psr, rule), parse(psr, rule), rule)
+        self.assertEqual(self.psr.parse('  '), [])
+
+
+class TestParserTables(unittest.TestCase):
+    """
+    Unit test class for testing the pregenerated tables of the :py:mod:`pynspect.gparser` module.
+    """
+
+    def setUp(self):
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+
+    def test_01_tables(self):
+        """
+        Test the pregenerated tables and shared lazy parser construction.
+        """
+        self.maxDiff = None
+
+        def load(dirname, name):
+            namespace = {}
+            with open(os.path.join(dirname, name)) as tabfile:
+                exec(tabfile.read(), namespace)  # pylint: disable=locally-disabled,exec-used
+            return namespace
+
+        # Tables shipped within the package must match the token and grammar rules.
+        tmpdir = tempfile.mkdtemp()
+        try:
+            write_tables(tmpdir)
+            pkgdir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            for name, attrs in (('lextab.py', ('_lextokens', '_lexstatere', '_lexstateignore')), ('parsetab.py', ('_lr_signature', '_lr_productions'))):
+                shipped, current = load(pkgdir, name), load(tmpdir, name)
+                for attr in attrs:
+                    # Productions contain also source line numbers of grammar rules, which do not matter.
+                    if attr == '_lr_productions':
+                        shipped[attr], current[attr] = [prod[:4] for prod in shipped[attr]], [prod[:4] for prod in current[attr]]
+                    self.assertEqual(shipped[attr], current[attr], '{} is out of date, regenerate it with "make tables"'.format(name))
+        finally:
+            shutil.rmtree(tmpdir)
+
+        # Parser is built lazily, its tables are shared by all instances and nothing is written to the current directory.
+        class CustomParser(PynspectFilterParser):
+            pass
+
+        cwd, tmpdir = os.getcwd(), tempfile.mkdtemp()
+        try:
+            os.chdir(tmpdir)
+            for optimize in (True, False):
+                psr1 = CustomParser()
+                psr1.build(optimize = optimize)
+                psr2 = CustomParser()
+                self.assertEqual(psr2.parser, None)
+                self.assertEqual(repr(psr2.parse('1 and 1')), 'LOGBINOP(INTEGER(1) OP_AND INTEGER(1))')
+                self.assertEqual(repr(psr1.parse('Test < 2')), "COMPBINOP(VARIABLE('Test') OP_LT INTEGER(2))")
+                self.assertFalse(psr1.parser is psr2.parser)
+                self.assertTrue(psr1.parser.action is psr2.parser.action)
+                self.assertFalse(psr1.lexer is psr2.lexer)
+                self.assertFalse(psr1.lexer.lexer is psr2.lexer.lexer)
+            self.assertEqual(os.listdir(tmpdir), [])
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(tmpdir)
+
+    def test_02_threads(self):
+        """
+        Perform tests of concurrent parsing by shared and separate parser instances.
+        """
+        self.maxDiff = None
+
+        shared = PynspectFilterParser()
+        results = []
+        def worker(idx):
+            for psr in (shared, PynspectFilterParser()):
+                for _ in range(50):
+                    results.append((idx, repr(psr.parse('(Test{0} + {0}) * 2 > {0} or Node[{0}].Name in ["a{0}", "b"]'.format(idx)))))
+        threads = [threading.Thread(target = worker, args = (idx,)) for idx in range(1, 9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 800)
+        for idx, result in results:
+            self.assertEqual(result, "LOGBINOP(COMPBINOP(MATHBINOP(MATHBINOP(VARIABLE('Test{0}') OP_PLUS INTEGER({0})) OP_TIMES INTEGER(2)) OP_GT INTEGER({0})) OP_OR COMPBINOP(VARIABLE('Node[{0}].Name') OP_IN LIST(CONSTANT('a{0}'), CONSTANT('b'))))".format(idx))
+
 
 #-------------------------------------------------------------------------------
 
@@ -21,7 +21,7 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 import unittest
 
-from pynspect.lexer import PynspectFilterLexer
+from pynspect.lexer import PynspectFilterLexer, tokenize, token_str
 
 
 #-------------------------------------------------------------------------------
@@ -182,6 +182,41 @@ class TestPynspectFilterLexer(unittest.TestCase):
         self.assertEqual(self.lex.test('_AB3('), "LexToken(FUNCTION,('FUNCTION', '_AB3'),1,0)")
 
 
+class FastLexer(object):
+    """
+    Adapter of :py:func:`pynspect.lexer.tokenize` to the interface of the lexer
+    used by the test cases.
+    """
+    def test(self, data, separator = ''):  # pylint: disable=locally-disabled,no-self-use
+        return ''.join(['{}{}'.format(token_str(tok, data), separator) for tok in tokenize(data)])
+
+
+class TestTokenize(TestPynspectFilterLexer):
+    """
+    Unit test class for testing the :py:func:`pynspect.lexer.tokenize` with all
+    test cases of the *PLY* based lexer.
+    """
+
+    def setUp(self):
+        self.lex = FastLexer()
+
+    def test_07_tokens(self):
+        """
+        Check the token tuples and compare the token stream with the *PLY* based lexer.
+        """
+        self.maxDiff = None
+
+        self.assertEqual(tokenize('Test.IP4 in [127.0.0.1, "x"] and\n size(1.5) >= 2'), [('VARIABLE', 'Test.IP4', 0), ('OP_IN', 'OP_IN', 9), ('LBRACK', '[', 12), ('IPV4', '127.0.0.1', 13), ('COMMA', ',', 22), ('CONSTANT', 'x', 24), ('RBRACK', ']', 27), ('OP_AND', 'OP_AND', 29), ('FUNCTION', 'size', 34), ('FLOAT', 1.5, 39), ('RPAREN', ')', 42), ('OP_GE', 'OP_GE', 44), ('INTEGER', 2, 47)])
+        self.assertEqual(tokenize(' \t\n'), [])
+        self.assertEqual(token_str(tokenize('1\n"a\nb" +')[2], '1\n"a\nb" +'), "LexToken(OP_PLUS,'OP_PLUS',2,8)")
+
+        lexer = PynspectFilterLexer()
+        lexer.build()
+        for data in ('origin index isolated', '2016-06-21T13:08:27Z-12:00:00+15D00:00:00', '::1..::5 ::1/64 10.0.0.1..10.0.0.5 10.0.0.1-10.0.0.5', 'a:b:c dead:beef Node[#].Name Source[-1].IP4', "'it\"s' \"it's\" ___( x(", '1.2.3 1.2 12 12:34', '=~~~!=<><=>===&&||^^!?'):
+            lexer.reset_lineno()
+            self.assertEqual(self.lex.test(data, '|'), lexer.test(data, '|'), data)
+
+
 #-------------------------------------------------------------------------------
 
 
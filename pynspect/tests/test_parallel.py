@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.parallel` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import pickle
+import unittest
+
+from pynspect.rules import FilteringRuleException
+from pynspect.gparser import PynspectFilterParser, PynspectGrammarSyntaxError
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler
+from pynspect.parallel import ParallelFilter
+from pynspect.tests import test_filters
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+def double(args):
+    """
+    Picklable filtering function for testing purposes.
+    """
+    return [item * 2 for item in args[0]]
+
+
+class TestParallelFilter(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.parallel` module.
+    """
+
+    test_messages = [dict(test_filters.TestDataObjectFilter.test_msg1, ConnCount = idx) for idx in range(50)]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+
+    def test_01_filtering(self):
+        """
+        Compare results of parallel filtering with results of the data object filter.
+        """
+        self.maxDiff = None
+
+        for rule_str in ('ConnCount > 20 and ConnCount % 3 == 1', 'Source.IP4 == 188.14.166.39 or ConnCount < 5', 'Category in ["Attempt.Login"] and ConnCount >= 48'):
+            rule = IDEAFilterCompiler().compile(self.psr.parse(rule_str))
+            expected = self.flt.filter_many(rule, self.test_messages)
+            with ParallelFilter(rule_str, processes = 2, batch_size = 7, compiler = IDEAFilterCompiler) as pflt:
+                self.assertEqual(pflt.filter_many(self.test_messages), expected, rule_str)
+                self.assertEqual(pflt.filter_many(iter(self.test_messages), matches = True), [msg for msg, res in zip(self.test_messages, expected) if res], rule_str)
+                self.assertEqual(pflt.filter_many([]), [])
+
+        with ParallelFilter(self.psr.parse('double(ConnCount) == 8'), processes = 2, batch_size = 3, functions = {'double': double}) as pflt:
+            self.assertEqual(pflt.filter_many(self.test_messages, matches = True), [self.test_messages[4]])
+
+    def test_02_bounded_inflight(self):
+        """
+        Perform tests of bounded number of batches in flight.
+        """
+        self.maxDiff = None
+
+        consumed = []
+        def messages():
+            for msg in self.test_messages:
+                consumed.append(msg)
+                yield msg
+
+        with ParallelFilter('ConnCount > 0', processes = 2, batch_size = 5, inflight = 3) as pflt:
+            results = pflt.ifilter_many(messages())
+            self.assertEqual(next(results), False)
+            self.assertEqual(len(consumed), 15)
+            self.assertEqual(list(results), [True] * 49)
+            self.assertEqual(len(consumed), 50)
+
+    def test_03_errors(self):
+        """
+        Perform tests of error handling.
+        """
+        self.maxDiff = None
+
+        self.assertRaises(PynspectGrammarSyntaxError, ParallelFilter, 'ConnCount >', processes = 1)
+        with ParallelFilter('bogus(ConnCount) > 1', processes = 1) as pflt:
+            self.assertRaises(FilteringRuleException, pflt.filter_many, self.test_messages)
+        with ParallelFilter('ConnCount > "a"', processes = 1) as pflt:
+            self.assertRaises(TypeError, pflt.filter_many, self.test_messages)
+        pflt.close()
+        self.assertRaises(ValueError, pflt.filter_many, self.test_messages)
+
+        exc = pickle.loads(pickle.dumps(FilteringRuleException("Invalid function name 'bogus'")))
+        self.assertEqual(exc.description, "Invalid function name 'bogus'")
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
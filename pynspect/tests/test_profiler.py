@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.profiler` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import time
+import unittest
+
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler
+from pynspect.profiler import RuleProfiler
+from pynspect.tests import test_filters
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+class TestRuleProfiler(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.profiler` module.
+    """
+
+    test_messages = [dict(test_filters.TestDataObjectFilter.test_msg1, ConnCount = idx) for idx in range(10)] + [{}]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+
+    def _counters(self, report):
+        """
+        Strip wall times from given report.
+        """
+        return [(path, record['expression'], record['count'], record['true'], record['false'], record['none'], record['errors']) for path, record in report.items()]
+
+    def test_01_counters(self):
+        """
+        Perform tests of evaluation counters.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('ConnCount > 5 and (Category in ["Attempt.Login"] or size(Node.SW) > 1)')
+        original = repr(rule)
+        profiler = RuleProfiler(rule)
+        for msg in self.test_messages:
+            self.assertEqual(self.flt.filter(profiler.rule, msg), self.flt.filter(rule, msg))
+        self.assertEqual(repr(rule), original)
+        self.assertEqual(str(profiler.rule), str(rule))
+
+        self.assertEqual(self._counters(profiler.by_path()), [
+            ('root', '((ConnCount OP_GT 5) OP_AND ((Category OP_IN ["Attempt.Login"]) OP_OR (size(VARIABLE(\'Node.SW\'),) OP_GT 1)))', 11, 4, 6, 1, 0),
+            ('root.left', '(ConnCount OP_GT 5)', 11, 4, 6, 1, 0),
+            ('root.left.left', 'ConnCount', 11, 10, 1, 0, 0),
+            ('root.left.right', '5', 11, 11, 0, 0, 0),
+            ('root.right', '((Category OP_IN ["Attempt.Login"]) OP_OR (size(VARIABLE(\'Node.SW\'),) OP_GT 1))', 4, 4, 0, 0, 0),
+            ('root.right.left', '(Category OP_IN ["Attempt.Login"])', 4, 4, 0, 0, 0),
+            ('root.right.left.left', 'Category', 4, 4, 0, 0, 0),
+            ('root.right.left.right', '["Attempt.Login"]', 4, 4, 0, 0, 0),
+            ('root.right.right', "(size(VARIABLE('Node.SW'),) OP_GT 1)", 0, 0, 0, 0, 0),
+            ('root.right.right.left', "size(VARIABLE('Node.SW'),)", 0, 0, 0, 0, 0),
+            ('root.right.right.left.args[0]', 'Node.SW', 0, 0, 0, 0, 0),
+            ('root.right.right.right', '1', 0, 0, 0, 0, 0),
+        ])
+
+        profiler.reset()
+        self.assertEqual(set([record['count'] for record in profiler.by_path().values()]), set([0]))
+
+        rule = self.cpl.compile(self.psr.parse('Source.IP4 == 188.14.166.39 or ConnCount == ConnCount'))
+        profiler = RuleProfiler(rule)
+        for msg in self.test_messages:
+            self.assertEqual(self.flt.filter(profiler.rule, msg), self.flt.filter(rule, msg))
+        report = profiler.report()
+        self.assertEqual(report['paths']['root']['true'], 10)
+        self.assertEqual(report['paths']['root']['none'], 1)
+        self.assertEqual(report['expressions']['ConnCount']['nodes'], 2)
+        self.assertEqual(report['expressions']['ConnCount']['count'], 22)
+
+    def test_02_times(self):
+        """
+        Perform tests of wall time measurements.
+        """
+        self.maxDiff = None
+
+        def slow(args):
+            time.sleep(0.002)
+            return args[0]
+
+        self.flt.register_function('slow', slow)
+        profiler = RuleProfiler(self.psr.parse('ConnCount > 3 or slow(ConnCount) > 8'))
+        for msg in self.test_messages:
+            self.flt.filter(profiler.rule, msg)
+
+        paths = profiler.by_path()
+        self.assertTrue(paths['root']['elapsed'] >= paths['root.right']['elapsed'] >= 0.008)
+        self.assertTrue(paths['root.right.left']['max'] >= 0.002)
+        self.assertTrue(paths['root.right.left']['own'] >= 0.008)
+        self.assertTrue(paths['root']['own'] < paths['root.right.left']['own'])
+        self.assertTrue(all(record['own'] >= 0.0 for record in paths.values()))
+
+        expressions = profiler.by_expression()
+        self.assertEqual(list(expressions.keys())[:3], ["((ConnCount OP_GT 3) OP_OR (slow(VARIABLE('ConnCount'),) OP_GT 8))", "(slow(VARIABLE('ConnCount'),) OP_GT 8)", "slow(VARIABLE('ConnCount'),)"])
+
+    def test_03_errors(self):
+        """
+        Perform tests of error handling.
+        """
+        self.maxDiff = None
+
+        profiler = RuleProfiler(self.psr.parse('ConnCount > 3 and bogus(ConnCount)'))
+        self.assertEqual(self.flt.filter(profiler.rule, self.test_messages[0]), False)
+        self.assertRaises(Exception, self.flt.filter, profiler.rule, self.test_messages[5])
+        paths = profiler.by_path()
+        self.assertEqual([(path, record['count'], record['errors']) for path, record in paths.items()], [
+            ('root', 2, 1),
+            ('root.left', 2, 0),
+            ('root.left.left', 2, 0),
+            ('root.left.right', 2, 0),
+            ('root.right', 1, 1),
+            ('root.right.args[0]', 1, 0),
+        ])
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,12 +19,15 @@ __author__ = "Jan Mach <jan.mach@cesnet.cz>"
 __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
+import copy
+import pickle
 import unittest
 from pprint import pformat
 
 from pynspect.rules import IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule,\
     IntegerRule, FloatRule, VariableRule, ConstantRule, LogicalBinOpRule,\
-    UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, FunctionRule, ListRule
+    UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, FunctionRule, ListRule,\
+    RuleInterner
 
 
 #-------------------------------------------------------------------------------
@@ -112,6 +115,76 @@ class TestPynspectRules(unittest.TestCase):
         self.assertEqual(str(rule_func2), "resolve(INTEGER(15),)")
         self.assertEqual(repr(rule_func2), "FUNCTION(resolve(INTEGER(15),))")
 
+    def test_04_compact(self):
+        """
+        Perform tests of compact representation of rule objects.
+        """
+        self.maxDiff = None
+
+        rule = LogicalBinOpRule("OP_OR", ComparisonBinOpRule("OP_IN", VariableRule("Test".join(["", ""])), ListRule(IntegerRule(1), ListRule(IntegerRule(2)))), UnaryOperationRule("OP_NOT", FunctionRule("exists".join(["", ""]), VariableRule("Test"))))
+        for node in (rule, rule.left, rule.left.left, rule.left.right, rule.right, rule.right.right, rule.right.right.args[0]):
+            self.assertFalse(hasattr(node, '__dict__'), repr(node))
+        self.assertRaises(AttributeError, setattr, rule, 'bogus', 1)
+
+        self.assertIs(rule.operation, LogicalBinOpRule("OP_OR", None, None).operation)
+        self.assertIs(rule.left.left.value, rule.right.right.args[0].value)
+        self.assertIs(rule.right.right.function, FunctionRule("exists").function)
+
+        self.assertEqual(repr(copy.copy(rule)), repr(rule))
+        self.assertEqual(repr(copy.deepcopy(rule)), repr(rule))
+        self.assertEqual(repr(pickle.loads(pickle.dumps(rule, pickle.HIGHEST_PROTOCOL))), repr(rule))
+
+    def test_05_structural(self):
+        """
+        Perform tests of structural comparison, hashing and interning of rule objects.
+        """
+        self.maxDiff = None
+
+        def build(limit):
+            return LogicalBinOpRule("OP_AND", ComparisonBinOpRule("OP_GT", MathBinOpRule("OP_PLUS", VariableRule("Test"), IntegerRule(10)), IntegerRule(limit)), UnaryOperationRule("OP_NOT", FunctionRule("exists", VariableRule("Test"))))
+
+        rule1, rule2, rule3 = build(20), build(20), build(30)
+        self.assertEqual(rule1, rule2)
+        self.assertEqual(hash(rule1), hash(rule2))
+        self.assertNotEqual(rule1, rule3)
+        self.assertEqual(rule1.right, rule3.right)
+        self.assertEqual(rule1.left.left, rule3.left.left)
+        self.assertFalse(rule1 != rule2)
+        self.assertNotEqual(IntegerRule(1), FloatRule(1.0))
+        self.assertNotEqual(VariableRule("Test"), ConstantRule("Test"))
+        self.assertNotEqual(VariableRule("Test"), "Test")
+        self.assertEqual(ListRule(IntegerRule(1), ListRule(IntegerRule(2))), ListRule([IntegerRule(1), IntegerRule(2)]))
+        self.assertNotEqual(ListRule([IntegerRule(1), IntegerRule(2)]), ListRule([IntegerRule(2), IntegerRule(1)]))
+        self.assertEqual(FunctionRule("utcnow"), FunctionRule("utcnow"))
+        self.assertNotEqual(FunctionRule("size", VariableRule("Test")), FunctionRule("size", VariableRule("Other")))
+        self.assertEqual(len(set([rule1, rule2, rule3, rule1.right, rule3.right])), 3)
+
+        clone = copy.copy(rule1)
+        clone.right = rule3.left
+        self.assertNotEqual(clone, rule1)
+        self.assertEqual(clone, LogicalBinOpRule("OP_AND", rule1.left, rule3.left))
+        self.assertEqual(pickle.loads(pickle.dumps(rule1, pickle.HIGHEST_PROTOCOL)), rule1)
+
+        interner = RuleInterner()
+        canon1 = interner.intern(rule1)
+        self.assertEqual(canon1, rule1)
+        self.assertIs(canon1.left, rule1.left)
+        self.assertIs(canon1.right.right.args[0], rule1.left.left.left)
+        self.assertEqual(len(interner), 8)
+        self.assertIs(interner.intern(rule2), canon1)
+        self.assertIs(interner.intern(canon1), canon1)
+        canon3 = interner.intern(rule3)
+        self.assertEqual(canon3, rule3)
+        self.assertIs(canon3.right, canon1.right)
+        self.assertIs(canon3.left.left, canon1.left.left)
+        self.assertIs(canon3.left.right, rule3.left.right)
+        self.assertEqual(repr(rule3), repr(build(30)))
+        self.assertIsNot(rule3.right.right.args[0], rule3.left.left.left)
+        self.assertEqual(len(interner), 11)
+        self.assertTrue(rule3 in interner)
+        interner.clear()
+        self.assertEqual(len(interner), 0)
+
 
 #-------------------------------------------------------------------------------
 
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.rulesets` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import unittest
+
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler
+from pynspect.rulesets import RuleSet
+from pynspect.tests import test_filters
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+class TestRuleSet(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.rulesets` module.
+    """
+
+    test_msg1 = test_filters.TestDataObjectFilter.test_msg1
+    test_msg2 = dict(test_filters.TestDataObjectFilter.test_msg1, ConnCount = 5, Category = ["Recon.Scanning"])
+
+    test_rules = [
+        ('login',     'Category in ["Attempt.Login"]'),
+        ('scan',      'Category in ["Recon.Scanning"]'),
+        ('big-scan',  'Category in ["Recon.Scanning"] and ConnCount > 3'),
+        ('big-login', 'Category in ["Attempt.Login"] and ConnCount > 3'),
+        ('any-big',   'ConnCount > 3 or (Category in ["Attempt.Login"] and ConnCount > 1)'),
+        ('kippo',     'Node.Name == "cz.uhk.apate.cowrie" && Node.SW in ["Kippo"]'),
+        ('kippo-2',   'Node.Name == "cz.uhk.apate.cowrie" && Node.SW in ["Kippo"]'),
+        ('note',      'strlen(Note) == 17 and not exists Missing'),
+        ('math',      '(ConnCount + 10) > 12'),
+    ]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+        self.cpl = IDEAFilterCompiler()
+
+    def test_01_match(self):
+        """
+        Perform basic tests of rule set matching.
+        """
+        self.maxDiff = None
+
+        rset = RuleSet([(rule_id, self.psr.parse(rule)) for rule_id, rule in self.test_rules])
+        self.assertEqual(len(rset), 9)
+        self.assertTrue('scan' in rset)
+        self.assertEqual(rset.match(self.test_msg1), ['login', 'any-big', 'kippo', 'kippo-2', 'note'])
+        self.assertEqual(rset.match(self.test_msg2), ['scan', 'big-scan', 'any-big', 'kippo', 'kippo-2', 'note', 'math'])
+        self.assertEqual(rset.match({}), [])
+
+        rset.remove('kippo-2')
+        rset.add('login', self.psr.parse('ConnCount == 2'))
+        self.assertEqual(rset.match(self.test_msg1), ['login', 'any-big', 'kippo', 'note'])
+        self.assertEqual(rset.match(self.test_msg2), ['scan', 'big-scan', 'any-big', 'kippo', 'note', 'math'])
+
+        self.assertEqual(RuleSet().match(self.test_msg1), [])
+
+    def test_02_equivalence(self):
+        """
+        Compare results of rule set matching with results of the filter.
+        """
+        self.maxDiff = None
+
+        rules = [(rule_id, self.cpl.compile(self.psr.parse(rule))) for rule_id, rule in self.test_rules]
+        rset = RuleSet(dict(rules))
+        for msg in (self.test_msg1, self.test_msg2, {}):
+            self.assertEqual(sorted(rset.match(msg)), sorted([rule_id for rule_id, rule in rules if self.flt.filter(rule, msg)]))
+
+    def test_03_sharing(self):
+        """
+        Perform tests of common subexpression sharing.
+        """
+        self.maxDiff = None
+
+        calls = []
+        def count(args):
+            calls.append(args)
+            return len(args[0])
+
+        functions = dict(self.flt.functions, count = count)
+        rset = RuleSet(functions = functions)
+        for idx in range(50):
+            rset.add(idx, self.psr.parse('count(Node.Type) > 1 and ConnCount > {}'.format(idx)))
+        self.assertEqual(rset.stats(), {'rules': 50, 'nodes': 154, 'shared': 3, 'indexed': 0, 'catchall': 50})
+
+        self.assertEqual(rset.match(self.test_msg1), [0, 1])
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(rset.match(self.test_msg2)), 5)
+        self.assertEqual(len(calls), 2)
+
+        rset = RuleSet(functions = functions)
+        for idx in range(10):
+            rset.add(idx, self.psr.parse('Category in ["Recon.Scanning"] or count(Node.Type) > 5'))
+        self.assertEqual(rset.stats(), {'rules': 10, 'nodes': 8, 'shared': 1, 'indexed': 0, 'catchall': 10})
+        self.assertEqual(rset.match(self.test_msg1), [])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(rset.match(self.test_msg2), list(range(10)))
+        self.assertEqual(len(calls), 3)
+
+    def test_04_index(self):
+        """
+        Perform tests of discrimination index.
+        """
+        self.maxDiff = None
+
+        calls = []
+        def count(args):
+            calls.append(args)
+            return len(args[0])
+
+        rules = [(rule_id, self.psr.parse(rule)) for rule_id, rule in self.test_rules]
+        rules += [
+            ('eq-left',   self.psr.parse('"Attempt.Login" == Category')),
+            ('number',    self.psr.parse('ConnCount == 2.0 and Category in ["Attempt.Login", "Spam"]')),
+            ('chain',     self.psr.parse('ConnCount > 1 and (Node.SW in ["Kippo", "Cowrie"] and Node.Name in ["cz.uhk.apate.cowrie"])')),
+            ('negated',   self.psr.parse('not Category in ["Recon.Scanning"]')),
+            ('counted',   self.psr.parse('Category in ["Spam"] and count(Node.Type) > 0')),
+            ('compiled',  self.cpl.compile(self.psr.parse('Category in ["Spam", "Attempt.Login"] && ConnCount == 2'))),
+            ('unhashable', self.psr.parse('Weird == "a"')),
+        ]
+        flt = DataObjectFilter()
+        flt.register_function('count', count)
+        functions = flt.functions
+        rset = RuleSet(rules, functions = functions)
+        self.assertEqual(rset.stats(), {'rules': 16, 'nodes': 62, 'shared': 9, 'indexed': 4, 'catchall': 4})
+        self.assertEqual(RuleSet(rules, functions = functions, fields = ['Category']).stats()['catchall'], 8)
+        self.assertEqual(RuleSet(rules, functions = functions, fields = []).stats()['catchall'], 16)
+
+        msgs = [self.test_msg1, self.test_msg2, {}, dict(self.test_msg2, Category = ["Spam"]), {'ConnCount': 2, 'Category': "Spam"}, {'Weird': [["a"], {}, "a"]}]
+        for fields in (None, ['Category'], []):
+            rset = RuleSet(rules, functions = functions, fields = fields)
+            for msg in msgs:
+                self.assertEqual(rset.match(msg), [rule_id for rule_id, rule in rules if flt.filter(rule, msg)])
+
+        del calls[:]
+        rset = RuleSet(rules, functions = functions)
+        self.assertEqual(rset.match(self.test_msg1), ['login', 'any-big', 'kippo', 'kippo-2', 'note', 'eq-left', 'number', 'chain', 'negated', 'compiled'])
+        self.assertEqual(rset.match(self.test_msg2), ['scan', 'big-scan', 'any-big', 'kippo', 'kippo-2', 'note', 'math', 'chain'])
+        self.assertEqual(len(calls), 0)
+        self.assertEqual(rset.match(dict(self.test_msg2, Category = ["Spam"])), ['any-big', 'kippo', 'kippo-2', 'note', 'math', 'chain', 'negated', 'counted'])
+        self.assertEqual(len(calls), 1)
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
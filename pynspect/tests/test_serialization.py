@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#-------------------------------------------------------------------------------
+# This file is part of Pynspect package (https://pypi.python.org/pypi/pynspect).
+# Originally part of Mentat system (https://mentat.cesnet.cz/).
+#
+# Copyright (C) since 2016 CESNET, z.s.p.o (http://www.ces.net/).
+# Copyright (C) since 2016 Jan Mach <honza.mach.ml@gmail.com>
+# Use of this source is governed by the MIT license, see LICENSE file.
+#-------------------------------------------------------------------------------
+
+
+"""
+Unit test module for testing the :py:mod:`pynspect.serialization` module.
+"""
+
+
+__author__ = "Jan Mach <jan.mach@cesnet.cz>"
+__credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
+
+
+import unittest
+
+import ipranges
+
+from pynspect.rules import FilteringRuleException, VariableRule, IPV6Rule
+from pynspect.gparser import PynspectFilterParser
+from pynspect.filters import DataObjectFilter
+from pynspect.compilers import IDEAFilterCompiler, FilterOptimizer, ConversionRule, IPListRule
+from pynspect.serialization import dumps, loads, MAGIC, VERSION
+from pynspect.tests import test_filters
+
+
+#-------------------------------------------------------------------------------
+# NOTE: Sorry for the long lines in this file. They are deliberate, because the
+# assertion permutations are (IMHO) more readable this way.
+#-------------------------------------------------------------------------------
+
+
+class TestSerialization(unittest.TestCase):
+    """
+    Unit test class for testing the :py:mod:`pynspect.serialization` module.
+    """
+
+    test_rules = [
+        'ConnCount > 1 and not (Format == "IDEA0" or Note like "login")',
+        '(ConnCount + 10) * 2.5 >= 30 xor ID in ["a", "b", 1, 2.5]',
+        'Source.IP4 in [188.14.166.0/24, 10.0.0.1-10.0.0.5, 127.0.0.1] or Target.IP4 == 195.113.165.128/25',
+        'DetectTime > 2016-06-21T12:00:00Z and DetectTime < WinEndTime + 1D00:00:00',
+        'Node.Name like ["cz\\\\.cesnet", "cowrie$"] and exists(Target.Port)',
+        'size(Node.Type) > 1 and Node.SW == utcnow()',
+    ]
+
+    test_messages = [test_filters.TestDataObjectFilter.test_msg1, dict(test_filters.TestDataObjectFilter.test_msg1, ConnCount = 20, Note = "Nothing"), {}]
+
+    def setUp(self):
+        self.flt = DataObjectFilter()
+        self.psr = PynspectFilterParser()
+        self.psr.build()
+
+    def test_01_roundtrip(self):
+        """
+        Perform tests of serialization of parsed and compiled rule trees.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules:
+            rule = self.psr.parse(rule_str)
+            data = dumps(rule)
+            self.assertTrue(data.startswith(MAGIC), rule_str)
+            self.assertEqual(repr(loads(data)), repr(rule), rule_str)
+            self.assertEqual(dumps(loads(data)), data, rule_str)
+
+            for compiler in (IDEAFilterCompiler(), IDEAFilterCompiler(coercion = True)):
+                rule = FilterOptimizer().compile(compiler.compile(self.psr.parse(rule_str)))
+                self.assertEqual(repr(loads(dumps(rule))), repr(rule), rule_str)
+
+        rule = IPListRule([IPV6Rule(ipranges.IP6('2001:db8::1')), IPV6Rule(ipranges.IP6Net('2001:db8::/32')), IPV6Rule(ipranges.IP6Range('::1-::5'))])
+        self.assertEqual(repr(loads(dumps(rule))), "IPLIST(IPV6(IP6('2001:db8::1')), IPV6(IP6Net('2001:db8::/32')), IPV6(IP6Range('::1-::5')))")
+        self.assertTrue(ipranges.IP6('::3') in loads(dumps(rule)).values())
+
+        self.assertEqual(dumps(VariableRule('Test')), MAGIC + bytes(bytearray([VERSION])) + b'[0,"Test"]')
+        self.assertEqual(repr(loads(MAGIC + bytes(bytearray([VERSION])) + b'[14,"OP_GT",[0,"ConnCount"],[6,1]]')), "COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(1))")
+
+    def test_02_filtering(self):
+        """
+        Compare filtering results of original and loaded rule trees.
+        """
+        self.maxDiff = None
+
+        for rule_str in self.test_rules[:5]:
+            rule = IDEAFilterCompiler(coercion = True).compile(self.psr.parse(rule_str))
+            self.assertEqual(self.flt.filter_many(loads(dumps(rule)), self.test_messages), self.flt.filter_many(rule, self.test_messages), rule_str)
+
+        rule = loads(dumps(IDEAFilterCompiler(coercion = True).compile(self.psr.parse('Source.IP4 in [188.14.166.0/24] and DetectTime > 2016-06-21T12:00:00Z'))))
+        self.assertEqual(self.flt.filter_many(rule, self.test_messages), [True, True, False])
+        self.assertEqual(repr(rule), "LOGBINOP(COMPBINOP(CONVERSION(VARIABLE('Source.IP4'):coerce_ip_v4) OP_IN IPLIST(IPV4(IP4Net('188.14.166.0/24')))) OP_AND COMPBINOP(CONVERSION(VARIABLE('DetectTime'):coerce_datetime) OP_GT DATETIME(datetime.datetime(2016, 6, 21, 12, 0))))")
+
+    def test_03_errors(self):
+        """
+        Perform tests of error handling.
+        """
+        self.maxDiff = None
+
+        data = dumps(self.psr.parse('ConnCount > 1'))
+        self.assertRaises(ValueError, loads, b'')
+        self.assertRaises(ValueError, loads, b'BOGUS' + data)
+        self.assertRaises(ValueError, loads, MAGIC + bytes(bytearray([VERSION + 1])) + data[len(MAGIC) + 1:])
+        self.assertRaises(ValueError, loads, data[:-3])
+        self.assertRaises(ValueError, loads, data[:len(MAGIC) + 1] + dumps(VariableRule('Test'))[len(MAGIC) + 1:-5])
+
+        self.assertRaises(FilteringRuleException, dumps, ConversionRule(lambda x: x, VariableRule('Test')))
+        self.assertRaises(FilteringRuleException, dumps, VariableRule(object()))
+
+
+#-------------------------------------------------------------------------------
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,10 +20,14 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 
 import unittest
+import random
+
+import ipranges
 
 from pynspect.rules import IntegerRule, VariableRule, LogicalBinOpRule, UnaryOperationRule,\
     ComparisonBinOpRule, MathBinOpRule, FunctionRule
-from pynspect.traversers import PrintingTreeTraverser, HTMLTreeTraverser, BaseFilteringTreeTraverser
+from pynspect.traversers import PrintingTreeTraverser, HTMLTreeTraverser, BaseFilteringTreeTraverser,\
+    ListSet, ListIP
 
 
 #-------------------------------------------------------------------------------
@@ -286,6 +290,9 @@ class TestPynspectBaseFilteringTreeTraverser(unittest.TestCase):
 
         self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IN', 'a', ['a','b','c','d']), True)
         self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IN', 'e', ['a','b','c','d']), False)
+        self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IN', 'a', ListSet(['a','b','c','d'])), True)
+        self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IN', 'e', ListSet(['a','b','c','d'])), False)
+        self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IN', ['e', 'c'], ListSet(['a','b','c','d'])), True)
 
         self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IS', ['a','b','c','d'], ['a','b','c','d']), True)
         self.assertEqual(self.tvs.evaluate_binop_comparison('OP_IS', ['a','b','c','e'], ['a','b','c','d']), False)
@@ -362,6 +369,98 @@ class TestPynspectBaseFilteringTreeTraverser(unittest.TestCase):
         self.assertEqual(self.tvs.evaluate_binop_math('OP_MODULO', [10],   [3,4]), [1,2])
 
 
+class TestListSet(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.traversers.ListSet`.
+    """
+
+    def test_01_membership(self):
+        """
+        Test the membership checks.
+        """
+        self.maxDiff = None
+
+        lst = ListSet(['a', 'b', 1, 2.5, True])
+        self.assertTrue(lst.members is not None)
+        self.assertEqual(lst, ['a', 'b', 1, 2.5, True])
+        self.assertTrue('a' in lst)
+        self.assertTrue(1 in lst)
+        self.assertTrue(1.0 in lst)
+        self.assertTrue(2.5 in lst)
+        self.assertFalse('c' in lst)
+        self.assertFalse(3 in lst)
+        self.assertFalse(['a'] in lst)
+        self.assertFalse({'a': 1} in lst)
+        self.assertFalse(None in lst)
+
+        lst = ListSet(['a', ['b'], None])
+        self.assertTrue(lst.members is None)
+        self.assertTrue('a' in lst)
+        self.assertTrue(['b'] in lst)
+        self.assertTrue(None in lst)
+        self.assertFalse('b' in lst)
+
+        lst = ListSet()
+        self.assertEqual(lst, [])
+        self.assertFalse('a' in lst)
+
+
+class TestListIP(unittest.TestCase):
+    """
+    Unit test class for testing the :py:class:`pynspect.traversers.ListIP`.
+    """
+
+    def test_01_membership(self):
+        """
+        Test the membership checks.
+        """
+        self.maxDiff = None
+
+        lst = ListIP([ipranges.IP4Net('192.168.0.0/24'), ipranges.IP4Range('10.0.0.10-10.0.0.20'), ipranges.IP4('127.0.0.1'), ipranges.IP4Net('192.168.0.128/25')])
+        self.assertTrue(ipranges.IP4('192.168.0.1') in lst)
+        self.assertTrue(ipranges.IP4('192.168.0.255') in lst)
+        self.assertTrue(ipranges.IP4('10.0.0.10') in lst)
+        self.assertTrue(ipranges.IP4('127.0.0.1') in lst)
+        self.assertTrue(ipranges.IP4Net('192.168.0.64/26') in lst)
+        self.assertTrue(ipranges.IP4Range('10.0.0.12-10.0.0.20') in lst)
+        self.assertFalse(ipranges.IP4('192.168.1.0') in lst)
+        self.assertFalse(ipranges.IP4('10.0.0.21') in lst)
+        self.assertFalse(ipranges.IP4('127.0.0.2') in lst)
+        self.assertFalse(ipranges.IP4Range('10.0.0.5-10.0.0.15') in lst)
+        self.assertFalse(ipranges.IP4Net('192.168.0.0/23') in lst)
+        self.assertRaises(AttributeError, lst.__contains__, '192.168.0.1')
+
+        lst.append(ipranges.IP4Net('192.168.1.0/24'))
+        self.assertTrue(ipranges.IP4('192.168.1.0') in lst)
+        self.assertFalse(ipranges.IP4Range('192.168.0.200-192.168.1.10') in lst)
+        lst.pop()
+        self.assertFalse(ipranges.IP4('192.168.1.0') in lst)
+
+        lst = ListIP([ipranges.IP6Net('2001:db8::/32'), ipranges.IP6('::1')])
+        self.assertTrue(ipranges.IP6('2001:db8::1') in lst)
+        self.assertTrue(ipranges.IP6('::1') in lst)
+        self.assertFalse(ipranges.IP6('2001:db9::1') in lst)
+
+        self.assertFalse(ipranges.IP4('127.0.0.1') in ListIP())
+
+    def test_02_equivalence(self):
+        """
+        Compare interval index with linear containment checks.
+        """
+        self.maxDiff = None
+
+        rnd = random.Random(42)
+        items = []
+        for _ in range(200):
+            low = rnd.randint(0, 2 ** 16)
+            items.append(ipranges.IP4Range((low, low + rnd.randint(0, 2 ** 10))))
+        lst = ListIP(items)
+        for _ in range(2000):
+            low = rnd.randint(0, 2 ** 16 + 2 ** 10)
+            val = ipranges.IP4Range((low, low + rnd.randint(0, 2 ** 6)))
+            self.assertEqual(val in lst, any(val in item for item in items), str(val))
+
+
 #-------------------------------------------------------------------------------
 
 
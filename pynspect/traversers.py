@@ -41,6 +41,7 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>, Andrea Kropáčová <andrea
 
 
 import re
+import bisect
 import collections
 import datetime
 
@@ -53,6 +54,14 @@ class BaseRuleTreeTraverser(object):
     mandatory interface that is required for an object to be able to traverse
     through given :py:class:`pynspect.rules.Rule` tree.
     """
+
+    short_circuit = False
+    """
+    Flag indicating, that the traverser wishes to receive the unevaluated right
+    subtree of logical binary operations through :py:func:`binary_operation_logical_lazy`
+    callback instead of the result of its traversal.
+    """
+
     def ipv4(self, rule, **kwargs):
         """
         Callback method for rule tree traversing. Will be called at proper time
@@ -155,6 +164,21 @@ class BaseRuleTreeTraverser(object):
         """
         raise NotImplementedError()
 
+    def binary_operation_logical_lazy(self, rule, left, right, **kwargs):
+        """
+        Callback method for rule tree traversing. Will be called at proper time
+        from :py:class:`pynspect.rules.LogicalBinOpRule.traverse` method instead
+        of :py:func:`binary_operation_logical` for traversers with :py:attr:`short_circuit`
+        flag enabled. Default implementation simply traverses the right subtree
+        and passes the result to :py:func:`binary_operation_logical`.
+
+        :param pynspect.rules.Rule rule: Reference to rule.
+        :param left: Left operand for operation.
+        :param pynspect.rules.Rule right: Right subtree, that was not yet traversed.
+        :param dict kwargs: Optional callback arguments.
+        """
+        return self.binary_operation_logical(rule, left, right.traverse(self, **kwargs), **kwargs)
+
     def binary_operation_comparison(self, rule, left, right, **kwargs):
         """
         Callback method for rule tree traversing. Will be called at proper time
@@ -201,6 +225,19 @@ class BaseRuleTreeTraverser(object):
         """
         raise NotImplementedError()
 
+    def conversion(self, rule, result, **kwargs):  # pylint: disable=locally-disabled,unused-argument,no-self-use
+        """
+        Callback method for rule tree traversing. Will be called at proper time
+        from :py:class:`pynspect.compilers.ConversionRule.traverse` method. Default
+        implementation simply applies the conversion of given rule to the result
+        of traversing its subtree.
+
+        :param pynspect.rules.Rule rule: Reference to rule.
+        :param result: Result of traversing the wrapped rule subtree.
+        :param dict kwargs: Optional callback arguments.
+        """
+        return rule.conversion(result)
+
 
 #-------------------------------------------------------------------------------
 
@@ -522,16 +559,34 @@ def _to_numeric(val):
         return val
     return float(val)
 
+def _regex_search(value, pattern):
+    """
+    Helper function for evaluation of ``like`` comparison operation. Precompiled
+    regular expression patterns are searched directly, pattern strings are
+    handed over to :py:func:`re.search`.
+    """
+    if hasattr(pattern, 'search'):
+        return pattern.search(value)
+    return re.search(pattern, value)
+
 
 class ListIP(collections.MutableSequence):
     """
     Special list implementation designed to provide special handling of 'IN' operator.
     When item is being compared using 'IN' operator with this list, the IN operation
     is propagated down to each of the items in the list.
+
+    When all items of the list are IP address ranges (objects with ``low()`` and
+    ``high()`` methods, like those from :py:mod:`ipranges`), the list lazily
+    builds an interval index: items sorted by their lower bounds together with
+    running maximum of their upper bounds. The check whether given address or
+    range is contained within any of the items then requires only binary search.
+    The index is discarded whenever the list is modified.
     """
 
     def __init__(self, iterable = None):
         self.data = list()
+        self.bounds = None
         if iterable:
             self.extend(iterable)
 
@@ -540,21 +595,57 @@ class ListIP(collections.MutableSequence):
 
     def __delitem__(self, val):
         del self.data[val]
+        self.bounds = None
 
     def __len__(self):
         return len(self.data)
 
     def __setitem__(self, idx, val):
         self.data[idx] = val
+        self.bounds = None
 
     def insert(self, idx, val):
         self.data.insert(idx, val)
+        self.bounds = None
+
+    def _build_bounds(self):
+        """
+        Build the interval index for all items in the list. Return ``False``,
+        when the list contains items, that are not IP address ranges.
+        """
+        try:
+            intervals = sorted([(value.low(), value.high()) for value in self.data])
+        except AttributeError:
+            return False
+        lows  = []
+        highs = []
+        high_max = None
+        for low, high in intervals:
+            if high_max is None or high > high_max:
+                high_max = high
+            lows.append(low)
+            highs.append(high_max)
+        return (lows, highs)
 
     # Following definitions are not strictly necessary as MutableSequence
     # already defines them, however we can override them by calling to
     # possibly more optimized underlying implementations.
 
     def __contains__(self, val):
+        bounds = self.bounds
+        if bounds is None:
+            bounds = self.bounds = self._build_bounds()
+        if bounds:
+            try:
+                low, high = val.low(), val.high()
+            except AttributeError:
+                pass
+            else:
+                # Find the last item with lower bound not greater than the lower
+                # bound of the value. Any of the items up to this one contains
+                # the value, if its upper bound reaches the upper bound of the value.
+                idx = bisect.bisect_right(bounds[0], low)
+                return idx > 0 and bounds[1][idx - 1] >= high
         for value in self.data:
             if val in value:
                 return True
@@ -570,12 +661,14 @@ class ListIP(collections.MutableSequence):
         return iter(self.data)
 
     def reverse(self):
+        self.bounds = None
         return self.data.reverse()
 
     def __reversed__(self):
         return reversed(self.data)
 
     def pop(self, index=-1):
+        self.bounds = None
         return self.data.pop(index)
 
     def __str__(self):
@@ -585,6 +678,36 @@ class ListIP(collections.MutableSequence):
         return "%s(%s)" % (type(self).__name__, repr(self.data))
 
 
+try:
+    _SET_TYPES = (str, unicode, int, long, float, bool)  # pylint: disable=locally-disabled,undefined-variable
+except NameError:
+    _SET_TYPES = (str, int, float, bool)
+
+
+class ListSet(list):
+    """
+    Special list implementation designed to provide fast handling of 'IN' operator
+    for lists of simple constants. When all items of the list are strings or numbers,
+    the membership of values of the same simple types is checked with hash lookup
+    in internal frozenset instead of linear scan. All other values fall back to
+    the standard list semantics.
+
+    The list is meant to be created once by the compiler and must not be modified
+    afterwards.
+    """
+
+    def __init__(self, iterable = None):
+        super(ListSet, self).__init__(iterable or [])
+        self.members = None
+        if all(item.__class__ in _SET_TYPES for item in self):
+            self.members = frozenset(self)
+
+    def __contains__(self, val):
+        if self.members is not None and val.__class__ in _SET_TYPES:
+            return val in self.members
+        return super(ListSet, self).__contains__(val)
+
+
 class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=locally-disabled,abstract-method
     """
     Base class for all filtering rule tree traversers.
@@ -602,8 +725,20 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
     Definitions of all logical binary operations.
     """
 
+    binops_logical_decisive = {
+        'OP_OR':    True,
+        'OP_AND':   False,
+        'OP_OR_P':  True,
+        'OP_AND_P': False,
+    }
+    """
+    Truth values of left operand, that decide the result of logical binary operation
+    without the need to evaluate the right operand. In that case the left operand
+    is the result of the operation.
+    """
+
     binops_comparison = {
-        'OP_LIKE': lambda x, y : re.search(y, x),
+        'OP_LIKE': _regex_search,
         'OP_IN':   lambda x, y : x in y,
         'OP_IS':   lambda x, y : x == y,
         'OP_EQ':   lambda x, y : x == y,
@@ -648,6 +783,13 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
         result = self.binops_logical[operation](left, right)
         return result
 
+    def is_decided_binop_logical(self, operation, left):
+        """
+        Check, whether the result of given logical binary operation is already
+        decided by the value of its left operand.
+        """
+        return operation in self.binops_logical_decisive and bool(left) is self.binops_logical_decisive[operation]
+
     def evaluate_binop_comparison(self, operation, left, right, **kwargs):
         """
         Evaluate given comparison binary operation with given operands.
@@ -28,10 +28,9 @@ from codecs import open
 sys.path.insert(0, os.path.abspath('.'))
 import pynspect
 
-# Generate parsetab.py in advance so it can go into package.
-from pynspect.gparser import PynspectFilterParser
-parser = PynspectFilterParser()
-parser.build()
+# Regenerate lextab.py and parsetab.py in advance so they can go into package.
+from pynspect.gparser import write_tables
+write_tables()
 
 here = os.path.abspath(os.path.dirname(__file__))
 
@@ -49,13 +48,18 @@ setup(
     classifiers = [
         'Development Status :: 4 - Beta',
         'License :: OSI Approved :: MIT License',
-        'Programming Language :: Python'
+        'Programming Language :: Python',
+        'Programming Language :: Python :: 2',
+        'Programming Language :: Python :: 3'
     ],
     keywords = 'library',
     url = 'https://github.com/honzamach/pynspect',
     author = 'Jan Mach',
     author_email = 'honza.mach.ml@gmail.com',
     license = 'MIT',
+    # Module pynspect.aio requires Python 3.7 or newer, on older interpreters
+    # it is installed, but it can not be imported (byte-compilation warning
+    # about its syntax during installation is expected there).
     packages = [
         'pynspect'
     ],
@@ -68,5 +72,10 @@ setup(
         'ply',
         'six'
     ],
+    extras_require = {
+        'columnar': [
+            'numpy'
+        ]
+    },
     zip_safe = True
 )